@@ -1,12 +1,13 @@
 from django.contrib.auth.models import User
 
+from is_core.contrib.background_export.cores import BackgroundExportCoreMixin
 from is_core.main import DjangoUiRestCore
 from is_core.auth.permissions import (
     BasePermission, IsSuperuser, IsAdminUser, PermissionsSet, SelfPermission, FieldsListPermission, FieldsSetPermission
 )
 from is_core.utils.decorators import short_description
 
-from issue_tracker.models import Issue
+from issue_tracker.models import Issue, Milestone
 from issue_tracker.forms import UserForm
 from issue_tracker.elasticsearch.core import ElasticsearchCommentCore
 from issue_tracker.dynamo.core import DynamoCommentCore
@@ -33,12 +34,13 @@ class IsObjectSuperuser(BasePermission):
         return obj and obj.is_superuser
 
 
-class UserCore(DjangoUiRestCore):
+class UserCore(BackgroundExportCoreMixin, DjangoUiRestCore):
 
     model = User
     form_class = UserForm
     list_fields = ('id', 'created_issues_count', '_obj_name', 'username', 'is_superuser')
     fields = ('username', 'first_name', 'last_name', 'is_superuser')
+    rest_search_fields = ('username', 'first_name', 'last_name')
     permission = PermissionsSet(
         is_superuser=IsSuperuser(),
         create=SelfPermission('is_superuser'),
@@ -70,6 +72,10 @@ class UserCore(DjangoUiRestCore):
     ui_detail_view = UserDetailView
     rest_resource_class = UserModelResource
 
+    bulk_change_enabled = True
+    bulk_change_fields = ('first_name', 'last_name')
+    background_bulk_change = True
+
     def get_queryset(self, request):
         qs = super().get_queryset(request)
         if not request.user.is_superuser:
@@ -100,3 +106,9 @@ class IssueCore(DjangoUiRestCore):
     can_create = False
     can_delete = False
     can_update = False
+
+
+class MilestoneCore(DjangoUiRestCore):
+
+    model = Milestone
+    fields = ('id', 'name', 'description')
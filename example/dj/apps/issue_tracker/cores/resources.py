@@ -2,7 +2,8 @@ from django.contrib.auth.models import User
 
 from chamber.shortcuts import get_object_or_404
 
-from is_core.rest.resource import CoreResource, DjangoCoreResource
+from is_core.contrib.background_export.resource import CeleryDjangoCoreResource
+from is_core.rest.resource import CoreResource
 
 
 class NumberOfUserIssuesResource(CoreResource,):
@@ -15,7 +16,7 @@ class NumberOfUserIssuesResource(CoreResource,):
         }
 
 
-class UserModelResource(DjangoCoreResource):
+class UserModelResource(CeleryDjangoCoreResource):
 
     def watching_issues_count(self, obj):
         return obj.watching_issues.count()
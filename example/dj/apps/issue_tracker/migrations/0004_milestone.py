@@ -0,0 +1,26 @@
+# Generated by Django 3.2 on 2026-10-18 07:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issue_tracker', '0003_issue_parent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Milestone',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='created at')),
+                ('changed_at', models.DateTimeField(auto_now=True, db_index=True, verbose_name='changed at')),
+                ('name', models.CharField(max_length=100, verbose_name='Name')),
+                ('description', models.TextField(blank=True, verbose_name='Description')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -3,7 +3,9 @@ from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 
-from is_core.utils.decorators import relation
+from chamber.models import SmartModel
+
+from is_core.utils.decorators import relation, depends_on
 
 
 AUTH_USER_MODEL = getattr(settings, 'AUTH_USER_MODEL', 'auth.User')
@@ -31,6 +33,7 @@ class Issue(models.Model):
     is_issue = True
 
 
+    @depends_on('watched_by')
     def watched_by_string(self):
         return ', '.join(str(user) for user in self.watched_by.all())
     watched_by_string.order_by = 'watched_by'
@@ -42,3 +45,12 @@ class Issue(models.Model):
 
     def __unicode__(self):
         return 'issue: %s' % self.name
+
+
+class Milestone(SmartModel):
+
+    name = models.CharField(verbose_name='Name', max_length=100, null=False, blank=False)
+    description = models.TextField(verbose_name='Description', null=False, blank=True)
+
+    def __str__(self):
+        return self.name
@@ -1,10 +1,12 @@
 from .http_exceptions import *
 from .rest_permissions import *
 from .ui_ordering import *
+from .ui_cache import *
 from .ui_permissions import *
 from .permissions import *
 from .rest import *
 from .field_permissions import *
 from .utils import *
+from .background_export import *
 from .elasticsearch import *
 from .dynamo import *
@@ -0,0 +1,473 @@
+import gzip
+import json
+import re
+import shutil
+import tempfile
+import zipfile
+
+from datetime import timedelta
+
+from unittest.mock import patch
+
+from celery.exceptions import SoftTimeLimitExceeded
+
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from germanium.test_cases.default import GermaniumTestCase
+from germanium.tools import (
+    assert_equal, assert_false, assert_is_none, assert_is_not_none, assert_not_equal, assert_true
+)
+
+from django_celery_extensions.task import obj_to_string
+
+from pyston.utils import set_rest_context_to_request
+
+from is_core.contrib.background_export.resource import (
+    apply_background_bulk_change, apply_background_export, get_export_cache_key
+)
+from is_core.contrib.background_export.models import BulkChangeJob, ExportedFile
+from is_core.contrib.background_export.tasks import (
+    BackgroundBulkChangeProcessor, ChunkedQuerysetIterable, FileBackgroundExportGenerator, background_bulk_change,
+    background_serialization, background_serialization_merge, background_serialization_part,
+    background_serialization_split, get_part_name, get_pk_shards
+)
+from is_core.site import get_model_core
+
+from issue_tracker.models import Issue
+
+from .factories import IssueFactory, UserFactory
+
+
+__all__ =(
+    'BackgroundExportTestCase',
+    'BackgroundBulkChangeTestCase',
+)
+
+
+class BackgroundTaskTestCase(GermaniumTestCase):
+
+    def set_up(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media_root_override = override_settings(MEDIA_ROOT=media_root)
+        media_root_override.enable()
+        self.addCleanup(media_root_override.disable)
+        self.user = UserFactory(is_superuser=True)
+
+
+class BackgroundExportTestCase(BackgroundTaskTestCase):
+
+    REST_CONTEXT = {'accept': 'text/csv'}
+    FILENAME = 'issues.csv'
+
+    def apply_background_export(self, queryset, **kwargs):
+        return apply_background_export(
+            self.user, queryset, self.REST_CONTEXT, 'id', 'verbose', self.FILENAME, **kwargs
+        )
+
+    def apply_split(self, exported_file, queryset, shards_count):
+        background_serialization_split.apply(args=(
+            exported_file.pk, self.REST_CONTEXT, 'en', 'id', 'verbose', self.FILENAME, obj_to_string(queryset.query),
+            shards_count
+        ))
+        exported_file.refresh_from_db()
+
+    def apply_parts(self, exported_file, queryset, pk_shards):
+        for part_index, (pk_from, pk_to) in enumerate(pk_shards):
+            background_serialization_part.apply(args=(
+                exported_file.pk, part_index, self.REST_CONTEXT, 'en', 'id', 'verbose', self.FILENAME,
+                obj_to_string(queryset.query), pk_from, pk_to
+            ))
+        exported_file.refresh_from_db()
+
+    def apply_serialization(self, exported_file, queryset, compression=None):
+        background_serialization.apply(args=(
+            exported_file.pk, self.REST_CONTEXT, 'en', 'id', 'verbose', self.FILENAME, obj_to_string(queryset.query),
+            compression
+        ))
+        exported_file.refresh_from_db()
+
+    def apply_merge(self, exported_file, compression=None):
+        background_serialization_merge.apply(args=(
+            exported_file.pk, self.REST_CONTEXT, 'en', 'id', self.FILENAME, compression
+        ))
+        exported_file.refresh_from_db()
+
+    def get_exported_ids(self, exported_file):
+        with exported_file.file.open('rb') as exported_data:
+            return self.get_ids_from_content(exported_data.read())
+
+    def get_ids_from_content(self, content):
+        return content.decode('utf-8-sig').split()[1:]
+
+    def get_chunks(self, queryset, chunk_size):
+        chunks = []
+        objs = ChunkedQuerysetIterable(queryset, chunk_size, on_chunk=lambda chunk: chunks.append(chunk))
+        return [obj.pk for obj in objs], [[obj.pk for obj in chunk] for chunk in chunks], objs
+
+    def test_queryset_ordered_by_pk_should_be_read_with_keyset_chunks(self):
+        issues = [IssueFactory() for _ in range(7)]
+        for queryset, expected_pks in ((Issue.objects.all(), [issue.pk for issue in issues]),
+                                       (Issue.objects.order_by('-pk'), [issue.pk for issue in reversed(issues)])):
+            with CaptureQueriesContext(connection) as captured_queries:
+                pks, chunks, objs = self.get_chunks(queryset, 3)
+            assert_equal(pks, expected_pks)
+            assert_equal(chunks, [expected_pks[:3], expected_pks[3:6], expected_pks[6:]])
+            assert_equal(objs.processed_rows_count, 7)
+            assert_equal(objs.last_obj.pk, expected_pks[-1])
+            # Every chunk is read with a separate query filtered by the last primary key of the previous chunk
+            assert_equal(len(captured_queries), 3)
+            assert_true(all('LIMIT 3' in query['sql'] for query in captured_queries.captured_queries))
+
+    def test_queryset_with_other_ordering_should_be_read_with_cursor(self):
+        issues = [IssueFactory(name='issue {}'.format(7 - i)) for i in range(7)]
+        queryset = Issue.objects.order_by('name')
+        with CaptureQueriesContext(connection) as captured_queries:
+            pks, chunks, objs = self.get_chunks(queryset, 3)
+        expected_pks = [issue.pk for issue in reversed(issues)]
+        assert_equal(pks, expected_pks)
+        assert_equal(chunks, [expected_pks[:3], expected_pks[3:6], expected_pks[6:]])
+        assert_equal(objs.processed_rows_count, 7)
+        # Requested ordering is kept and the rows are read with one query
+        assert_equal(len(captured_queries), 1)
+        assert_false('LIMIT' in captured_queries[0]['sql'])
+
+    @override_settings(IS_CORE_BACKGROUND_EXPORT_CHUNK_SIZE=3)
+    def test_background_export_should_store_progress_after_every_chunk(self):
+        issues = [IssueFactory(name='issue {}'.format(7 - i)) for i in range(7)]
+        queryset = Issue.objects.order_by('name')
+        exported_file = self.apply_background_export(queryset)
+        with patch.object(ExportedFile, 'update_progress', autospec=True,
+                          side_effect=ExportedFile.update_progress) as update_progress_mock:
+            self.apply_serialization(exported_file, queryset)
+        assert_equal(
+            [call_args[0][1:] for call_args in update_progress_mock.call_args_list],
+            [(3, issues[4].pk), (3, issues[1].pk), (1, issues[0].pk)]
+        )
+        assert_equal(exported_file.processed_rows_count, 7)
+        assert_equal(exported_file.total_rows_count, 7)
+        assert_equal(exported_file.last_pk, str(issues[0].pk))
+        assert_equal(self.get_exported_ids(exported_file), ['"{}"'.format(issue.pk) for issue in reversed(issues)])
+
+    def test_gzip_compressed_export_should_contain_all_rows(self):
+        self.FILENAME = 'issues.csv.gz'
+        issues = [IssueFactory(name='issue {}'.format(7 - i)) for i in range(7)]
+        queryset = Issue.objects.order_by('name')
+        exported_file = self.apply_background_export(queryset, compression='gzip')
+        self.apply_serialization(exported_file, queryset, compression='gzip')
+        assert_true(exported_file.file.name.endswith('.csv.gz'))
+        assert_equal(exported_file.file_content_type, 'application/gzip')
+        with exported_file.file.open('rb') as exported_data:
+            assert_equal(
+                self.get_ids_from_content(gzip.decompress(exported_data.read())),
+                ['"{}"'.format(issue.pk) for issue in reversed(issues)]
+            )
+
+    def test_zip_compressed_sharded_export_should_contain_all_rows(self):
+        self.FILENAME = 'issues.csv.zip'
+        issues = [IssueFactory() for _ in range(7)]
+        queryset = Issue.objects.order_by('pk')
+        exported_file = self.apply_background_export(queryset, shards_count=3, compression='zip')
+        self.apply_split(exported_file, queryset, 3)
+        self.apply_parts(exported_file, queryset, get_pk_shards(queryset, 3))
+        self.apply_merge(exported_file, compression='zip')
+        assert_true(exported_file.file.name.endswith('.csv.zip'))
+        assert_equal(exported_file.file_content_type, 'application/zip')
+        with exported_file.file.open('rb') as exported_data:
+            with zipfile.ZipFile(exported_data) as archive:
+                assert_equal(len(archive.namelist()), 1)
+                assert_true(archive.namelist()[0].endswith('.csv'))
+                assert_equal(
+                    self.get_ids_from_content(archive.read(archive.namelist()[0])),
+                    ['"{}"'.format(issue.pk) for issue in issues]
+                )
+
+    def test_sharded_background_export_should_not_count_objects_in_request(self):
+        [IssueFactory() for _ in range(7)]
+        with CaptureQueriesContext(connection) as captured_queries:
+            exported_file = self.apply_background_export(Issue.objects.order_by('pk'), shards_count=3)
+        assert_false(any('COUNT(' in query['sql'] for query in captured_queries.captured_queries))
+        assert_is_none(exported_file.parts_count)
+
+    def test_sharded_background_export_should_be_split_and_merged_by_tasks(self):
+        issues = [IssueFactory() for _ in range(7)]
+        queryset = Issue.objects.order_by('pk')
+        exported_file = self.apply_background_export(queryset, shards_count=3)
+        self.apply_split(exported_file, queryset, 3)
+        assert_equal(exported_file.parts_count, 3)
+
+        self.apply_parts(exported_file, queryset, get_pk_shards(queryset, 3))
+        assert_equal(sorted(exported_file.generated_parts), [0, 1, 2])
+        assert_equal(exported_file.processed_rows_count, 7)
+
+        self.apply_merge(exported_file)
+        assert_equal(self.get_exported_ids(exported_file), ['"{}"'.format(issue.pk) for issue in issues])
+
+    def test_background_export_with_one_shard_should_be_generated_by_one_part_task(self):
+        issues = [IssueFactory() for _ in range(7)]
+        queryset = Issue.objects.order_by('pk')
+        assert_equal(get_pk_shards(queryset, 1), [(None, None)])
+        with patch.object(background_serialization, 'apply_async_on_commit') as serialization_apply_mock:
+            exported_file = self.apply_background_export(queryset, shards_count=1)
+        assert_false(serialization_apply_mock.called)
+
+        self.apply_split(exported_file, queryset, 1)
+        assert_equal(exported_file.parts_count, 1)
+        self.apply_parts(exported_file, queryset, [(None, None)])
+        self.apply_merge(exported_file)
+        assert_equal(self.get_exported_ids(exported_file), ['"{}"'.format(issue.pk) for issue in issues])
+
+    def test_background_export_with_other_ordering_should_be_generated_by_one_task(self):
+        with patch.object(background_serialization, 'apply_async_on_commit') as serialization_apply_mock:
+            with patch.object(background_serialization_split, 'apply_async_on_commit') as split_apply_mock:
+                self.apply_background_export(Issue.objects.order_by('name'), shards_count=1)
+        assert_true(serialization_apply_mock.called)
+        assert_false(split_apply_mock.called)
+
+    def test_interrupted_not_split_export_should_continue_from_last_stored_row(self):
+        issues = [IssueFactory() for _ in range(7)]
+        queryset = Issue.objects.order_by('pk')
+        exported_file = self.apply_background_export(queryset, shards_count=1)
+        self.apply_split(exported_file, queryset, 1)
+        self.apply_parts(exported_file, queryset, [(None, None)])
+
+        # Task was interrupted while the fourth row was written to the part file
+        storage = exported_file.file.storage
+        part_name = get_part_name(exported_file, 0)
+        with storage.open(part_name, 'rb') as part_file:
+            part_lines = part_file.readlines()
+        storage.delete(part_name)
+        storage.save(part_name, ContentFile(b''.join(part_lines[:3]) + part_lines[3][:5]))
+        ExportedFile.objects.filter(pk=exported_file.pk).update(
+            generated_parts=[], parts_processed_rows_counts={}, processed_rows_count=0
+        )
+
+        with CaptureQueriesContext(connection) as captured_queries:
+            self.apply_parts(exported_file, queryset, [(None, None)])
+        assert_true(any(
+            '"issue_tracker_issue"."id" > {}'.format(issues[2].pk) in query['sql']
+            for query in captured_queries.captured_queries
+        ))
+        assert_equal(exported_file.processed_rows_count, 7)
+
+        self.apply_merge(exported_file)
+        assert_equal(self.get_exported_ids(exported_file), ['"{}"'.format(issue.pk) for issue in issues])
+
+    def test_sharded_xlsx_export_should_be_merged_to_one_sheet(self):
+        self.REST_CONTEXT = {'accept': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'}
+        self.FILENAME = 'issues.xlsx'
+        issues = [IssueFactory() for _ in range(7)]
+        queryset = Issue.objects.order_by('pk')
+        exported_file = self.apply_background_export(queryset, shards_count=3)
+        self.apply_split(exported_file, queryset, 3)
+        self.apply_parts(exported_file, queryset, get_pk_shards(queryset, 3))
+        self.apply_merge(exported_file)
+
+        with exported_file.file.open('rb') as exported_data:
+            with zipfile.ZipFile(exported_data) as workbook:
+                shared_strings = re.findall(r'<t>([^<]*)</t>', workbook.read('xl/sharedStrings.xml').decode('utf-8'))
+        # Header is written only once, the rows of all parts follow it
+        assert_equal(shared_strings, ['ID'] + [str(issue.pk) for issue in issues])
+
+    def test_json_export_should_be_generated_by_one_task(self):
+        self.REST_CONTEXT = {'accept': 'application/json'}
+        self.FILENAME = 'issues.json'
+        issues = [IssueFactory() for _ in range(7)]
+        queryset = Issue.objects.order_by('pk')
+        with patch.object(background_serialization, 'apply_async_on_commit') as serialization_apply_mock:
+            exported_file = self.apply_background_export(queryset)
+        assert_true(serialization_apply_mock.called)
+
+        background_serialization.apply(args=(
+            exported_file.pk, self.REST_CONTEXT, 'en', 'id', 'verbose', self.FILENAME, obj_to_string(queryset.query)
+        ))
+        exported_file.refresh_from_db()
+        with exported_file.file.open('rb') as exported_data:
+            assert_equal(
+                [row['id'] for row in json.loads(exported_data.read().decode('utf-8'))],
+                [issue.pk for issue in issues]
+            )
+        assert_equal(exported_file.processed_rows_count, 7)
+
+    def test_redelivered_part_should_not_be_counted_twice(self):
+        [IssueFactory() for _ in range(7)]
+        queryset = Issue.objects.order_by('pk')
+        exported_file = self.apply_background_export(queryset, shards_count=3)
+        self.apply_split(exported_file, queryset, 3)
+        pk_shards = get_pk_shards(queryset, 3)
+        self.apply_parts(exported_file, queryset, pk_shards[:1])
+        self.apply_parts(exported_file, queryset, pk_shards[:1])
+        assert_equal(exported_file.generated_parts, [0])
+        assert_equal(exported_file.processed_rows_count, exported_file.parts_processed_rows_counts['0'])
+
+    def test_resumed_part_should_count_rows_stored_by_interrupted_task(self):
+        [IssueFactory() for _ in range(7)]
+        queryset = Issue.objects.order_by('pk')
+        exported_file = self.apply_background_export(queryset, shards_count=3)
+        self.apply_split(exported_file, queryset, 3)
+        pk_shards = get_pk_shards(queryset, 3)
+        self.apply_parts(exported_file, queryset, pk_shards[:1])
+        part_rows_count = exported_file.processed_rows_count
+
+        # Task was interrupted after the rows were stored to the part file but before the progress was updated
+        ExportedFile.objects.filter(pk=exported_file.pk).update(
+            generated_parts=[], parts_processed_rows_counts={}, processed_rows_count=0
+        )
+        self.apply_parts(exported_file, queryset, pk_shards[:1])
+        assert_equal(exported_file.processed_rows_count, part_rows_count)
+
+    def test_failed_part_should_mark_exported_file_as_failed(self):
+        [IssueFactory() for _ in range(7)]
+        queryset = Issue.objects.order_by('pk')
+        exported_file = self.apply_background_export(queryset, shards_count=3)
+        self.apply_split(exported_file, queryset, 3)
+        with patch.object(FileBackgroundExportGenerator, 'generate_part', side_effect=ValueError):
+            self.apply_parts(exported_file, queryset, get_pk_shards(queryset, 3)[:1])
+        assert_is_not_none(exported_file.failed_at)
+        assert_true(exported_file.is_failed)
+        assert_false(exported_file.is_finished)
+
+    @override_settings(IS_CORE_BACKGROUND_EXPORT_CACHE_TIMEOUT=60)
+    def test_shared_exported_file_should_not_extend_cache_freshness(self):
+        [IssueFactory() for _ in range(7)]
+        queryset = Issue.objects.order_by('pk')
+        exported_file = self.apply_background_export(queryset)
+        exported_file.file.save('issues.csv', ContentFile('"ID"'))
+
+        shared_exported_file = self.apply_background_export(queryset)
+        assert_equal(shared_exported_file.file.name, exported_file.file.name)
+        assert_is_none(shared_exported_file.cache_key)
+
+        ExportedFile.objects.filter(pk=exported_file.pk).update(created_at=timezone.now() - timedelta(seconds=120))
+        assert_not_equal(self.apply_background_export(queryset).file.name, exported_file.file.name)
+
+    def get_export_cache_key(self, queryset, user=None, fieldset='id', serialization_format='verbose'):
+        return get_export_cache_key(user or self.user, queryset, self.REST_CONTEXT, fieldset, serialization_format)
+
+    def test_export_cache_key_should_depend_on_export_content(self):
+        queryset = Issue.objects.order_by('pk')
+        cache_key = self.get_export_cache_key(queryset)
+        assert_equal(cache_key, self.get_export_cache_key(Issue.objects.order_by('pk')))
+        assert_not_equal(cache_key, self.get_export_cache_key(queryset.filter(name='issue')))
+        assert_not_equal(cache_key, self.get_export_cache_key(queryset, fieldset='id,name'))
+        assert_not_equal(cache_key, self.get_export_cache_key(queryset, serialization_format='raw'))
+        assert_not_equal(cache_key, self.get_export_cache_key(queryset, user=UserFactory()))
+
+    def test_export_cache_key_of_empty_queryset_should_be_none(self):
+        assert_is_none(self.get_export_cache_key(Issue.objects.none()))
+        assert_is_none(self.get_export_cache_key(Issue.objects.filter(pk__in=[])))
+
+    @override_settings(IS_CORE_BACKGROUND_EXPORT_CACHE_TIMEOUT=60)
+    def test_cached_exported_file_should_be_shared_without_new_task(self):
+        [IssueFactory() for _ in range(7)]
+        queryset = Issue.objects.order_by('pk')
+        exported_file = self.apply_background_export(queryset)
+        exported_file.file.save('issues.csv', ContentFile('"ID"'))
+
+        with patch.object(background_serialization, 'apply_async_on_commit') as serialization_apply_mock:
+            shared_exported_file = self.apply_background_export(queryset)
+        assert_false(serialization_apply_mock.called)
+        assert_not_equal(shared_exported_file.pk, exported_file.pk)
+        assert_equal(shared_exported_file.file.name, exported_file.file.name)
+
+    @override_settings(IS_CORE_BACKGROUND_EXPORT_CACHE_TIMEOUT=60)
+    def test_empty_queryset_export_should_not_be_cached(self):
+        with patch.object(background_serialization, 'apply_async_on_commit') as serialization_apply_mock:
+            exported_file = self.apply_background_export(Issue.objects.none())
+        assert_true(serialization_apply_mock.called)
+        assert_is_none(exported_file.cache_key)
+
+
+class BackgroundBulkChangeTestCase(BackgroundTaskTestCase):
+
+    USER_API_URL = '/api/user/'
+
+    def get_bulk_change_resource(self, data, **headers):
+        request = RequestFactory().put(self.USER_API_URL, **headers)
+        request.user = self.user
+        request.data = data
+        request.kwargs = {}
+        resource = get_model_core(User).rest_patterns['api'].get_view(request)
+        set_rest_context_to_request(request, resource._get_headers_queryset_context_mapping())
+        return resource
+
+    def apply_bulk_change(self, data):
+        bulk_change_job = apply_background_bulk_change(self.user, User.objects.all(), data)
+        background_bulk_change.apply(args=(bulk_change_job.pk, 'en'))
+        bulk_change_job.refresh_from_db()
+        return bulk_change_job
+
+    def test_bulk_change_with_header_should_be_processed_in_background(self):
+        [UserFactory() for _ in range(3)]
+        response = self.get_bulk_change_resource(
+            {'first_name': 'bulk'}, HTTP_X_BACKGROUND_BULK_CHANGE='1'
+        ).update_bulk()
+        assert_equal(response.status_code, 202)
+        bulk_change_job = BulkChangeJob.objects.get(pk=response.result['bulk_change_job'])
+        assert_equal(bulk_change_job.created_by, self.user)
+        assert_false(User.objects.filter(first_name='bulk').exists())
+
+    def test_bulk_change_without_header_should_not_be_processed_in_background(self):
+        [UserFactory() for _ in range(3)]
+        assert_equal(len(self.get_bulk_change_resource({'first_name': 'bulk'}).update_bulk()), 4)
+        assert_false(BulkChangeJob.objects.exists())
+        assert_equal(User.objects.filter(first_name='bulk').count(), 4)
+
+    def test_bulk_change_ui_resource_should_process_bulk_change_in_background(self):
+        user_core = get_model_core(User)
+        request = RequestFactory().get('/user/')
+        request.user = self.user
+        bulk_change_api_url = user_core.get_bulk_change_api_url(request)
+        assert_equal(bulk_change_api_url, '/api/user/background-bulk-change/')
+
+        self.client.force_login(self.user)
+        response = self.client.put(
+            '{}?id__in=[{}]'.format(bulk_change_api_url, self.user.pk), data=json.dumps({'first_name': 'bulk'}),
+            content_type='application/json', HTTP_ACCEPT='application/json'
+        )
+        assert_equal(response.status_code, 202)
+        bulk_change_job = BulkChangeJob.objects.get(pk=response.json()['bulk_change_job'])
+        assert_equal(bulk_change_job.created_by, self.user)
+
+    def test_bulk_change_processor_should_update_objects_in_chunks(self):
+        [UserFactory() for _ in range(4)]
+        bulk_change_job = apply_background_bulk_change(self.user, User.objects.all(), {'first_name': 'bulk'})
+        resource = self.get_bulk_change_resource({'first_name': 'bulk'})
+        errors = BackgroundBulkChangeProcessor(resource, 2).process(
+            bulk_change_job, User.objects.all(), {'first_name': 'bulk'}
+        )
+        bulk_change_job.refresh_from_db()
+        assert_equal(errors, [])
+        assert_equal(bulk_change_job.total_rows_count, 5)
+        assert_equal(bulk_change_job.processed_rows_count, 5)
+        assert_equal(User.objects.filter(first_name='bulk').count(), 5)
+
+    def test_background_bulk_change_should_finish_job(self):
+        [UserFactory() for _ in range(2)]
+        bulk_change_job = self.apply_bulk_change({'first_name': 'bulk'})
+        assert_true(bulk_change_job.is_finished)
+        assert_equal(bulk_change_job.progress(), 100)
+        assert_equal(bulk_change_job.failed_rows_count, 0)
+        assert_false(bulk_change_job.error_report)
+        assert_equal(User.objects.filter(first_name='bulk').count(), 3)
+
+    def test_background_bulk_change_should_store_error_report(self):
+        users = [self.user] + [UserFactory() for _ in range(2)]
+        bulk_change_job = self.apply_bulk_change({'first_name': 'x' * 1000})
+        assert_true(bulk_change_job.is_finished)
+        assert_equal(bulk_change_job.failed_rows_count, 3)
+        with bulk_change_job.error_report.open('rb') as error_report:
+            error_report_rows = error_report.read().decode('utf-8').splitlines()
+        assert_equal(error_report_rows[0], 'id,object,errors')
+        assert_equal([row.split(',')[0] for row in error_report_rows[1:]], [str(user.pk) for user in users])
+
+    def test_failed_background_bulk_change_should_mark_job_as_failed(self):
+        with patch.object(BackgroundBulkChangeProcessor, 'process', side_effect=SoftTimeLimitExceeded):
+            bulk_change_job = self.apply_bulk_change({'first_name': 'bulk'})
+        assert_true(bulk_change_job.is_failed)
+        assert_false(bulk_change_job.is_finished)
@@ -24,4 +24,12 @@ class IssueFactory(factory.django.DjangoModelFactory):
     leader = factory.SubFactory('issue_tracker.tests.factories.UserFactory')
 
     class Meta:
-        model = models.Issue
\ No newline at end of file
+        model = models.Issue
+
+
+class MilestoneFactory(factory.django.DjangoModelFactory):
+
+    name = factory.Sequence(lambda n: 'milestone {0}'.format(n))
+
+    class Meta:
+        model = models.Milestone
@@ -1,7 +1,21 @@
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
 from germanium.test_cases.default import GermaniumTestCase
-from germanium.tools import assert_true, assert_false, assert_equal, assert_not_equal
+from germanium.tools import (
+    assert_true, assert_false, assert_equal, assert_not_equal, assert_is_none, assert_is_not_none
+)
+
+from is_core.auth.permissions import (
+    BasePermission, PermissionsSet, SelfPermission, IsAdminUser, IsSuperuser, FieldsListPermission,
+    FieldsSetPermission, CoreReadAllowed, get_permissions_cache
+)
+from is_core.auth.views import FieldPermissionViewMixin
+from is_core.site import get_model_core
 
-from is_core.auth.permissions import BasePermission, PermissionsSet, SelfPermission
+from issue_tracker.models import Issue
+
+from .factories import UserFactory
 
 
 __all__ =(
@@ -27,6 +41,35 @@ class ObjIsStringPermission(BasePermission):
         return isinstance(obj, str)
 
 
+class CountingObjIsNonePermission(ObjIsNonePermission):
+
+    def __init__(self):
+        self.calls = 0
+
+    def has_permission(self, name, request, view, obj=None):
+        self.calls += 1
+        return super().has_permission(name, request, view, obj=obj)
+
+
+class FieldPermissionView(FieldPermissionViewMixin):
+
+    def __init__(self, request, field_permissions):
+        self.request = request
+        self.field_permissions = field_permissions
+
+
+class NotLockedCoreReadAllowed(CoreReadAllowed):
+
+    def has_permission(self, name, request, view, obj=None):
+        return not getattr(request, 'is_locked', False) and super().has_permission(name, request, view, obj)
+
+
+class CoreView:
+
+    def __init__(self, core):
+        self.core = core
+
+
 class PermissionsTestCase(GermaniumTestCase):
 
     def test_permissions_should_be_joined_with_operators(self):
@@ -60,3 +103,90 @@ class PermissionsTestCase(GermaniumTestCase):
         assert_true(permission.has_permission('string', None, None, ''))
         assert_true(permission.has_permission('self_note', None, None, None))
         assert_false(permission.has_permission('self_note', None, None, ''))
+
+    def test_permissions_cache_should_be_turned_off_by_default(self):
+        request = RequestFactory().get('')
+        request.user = UserFactory(is_staff=True)
+        assert_true(PermissionsSet(read=IsAdminUser()).has_permission('read', request, None))
+        assert_is_none(get_permissions_cache(request))
+
+    @override_settings(IS_CORE_PERMISSIONS_CACHE=True)
+    def test_cacheable_permissions_should_be_evaluated_only_once_per_request(self):
+        request = RequestFactory().get('')
+        request.user = UserFactory(is_staff=True, is_superuser=False)
+        permission = PermissionsSet(
+            read=IsAdminUser(),
+            update=IsAdminUser() & IsSuperuser(),
+            none=ObjIsNonePermission(),
+        )
+        for _ in range(3):
+            assert_true(permission.has_permission('read', request, None))
+            assert_false(permission.has_permission('update', request, None))
+            assert_true(permission.has_permission('none', request, None))
+
+        permissions_cache = get_permissions_cache(request)
+        assert_equal(permissions_cache.misses, 3)
+        assert_equal(permissions_cache.hits, 6)
+
+        request.user = UserFactory(is_staff=False)
+        assert_false(permission.has_permission('read', request, None))
+        assert_equal(permissions_cache.misses, 4)
+
+    @override_settings(IS_CORE_PERMISSIONS_CACHE=True)
+    def test_core_allowed_subclass_with_own_decision_should_not_be_cached(self):
+        request = RequestFactory().get('')
+        request.user = UserFactory(is_staff=True, is_superuser=True)
+        view = CoreView(get_model_core(Issue))
+
+        core_read_allowed = CoreReadAllowed()
+        assert_true(core_read_allowed.has_permission('read', request, view))
+        assert_is_not_none(core_read_allowed._get_cache_key('read', request, view))
+
+        not_locked_core_read_allowed = NotLockedCoreReadAllowed()
+        assert_is_none(not_locked_core_read_allowed._get_cache_key('read', request, view))
+        assert_true(PermissionsSet(read=not_locked_core_read_allowed).has_permission('read', request, view))
+        request.is_locked = True
+        assert_false(PermissionsSet(read=not_locked_core_read_allowed).has_permission('read', request, view))
+
+    @override_settings(IS_CORE_PERMISSIONS_CACHE=True)
+    def test_field_permissions_should_be_evaluated_only_once_per_request_view_and_object(self):
+        request = RequestFactory().get('')
+        request.user = UserFactory()
+        permission = CountingObjIsNonePermission()
+        view = FieldPermissionView(
+            request, FieldsSetPermission(FieldsListPermission(permission=permission, fields=('name',)))
+        )
+        obj = UserFactory()
+
+        for _ in range(3):
+            assert_equal(view._get_disallowed_fields_from_permissions(), set())
+            assert_equal(view._get_disallowed_fields_from_permissions(obj=obj), {'name'})
+        assert_equal(permission.calls, 2)
+
+        view._get_disallowed_fields_from_permissions().add('other')
+        assert_equal(view._get_disallowed_fields_from_permissions(), set())
+
+        other_view = FieldPermissionView(request, view.field_permissions)
+        assert_equal(other_view._get_disallowed_fields_from_permissions(obj=obj), {'name'})
+        assert_equal(permission.calls, 3)
+
+    @override_settings(IS_CORE_PERMISSIONS_CACHE=True)
+    def test_field_permissions_of_object_should_be_invalidated_with_object_change(self):
+        request = RequestFactory().get('')
+        request.user = UserFactory()
+        permission = CountingObjIsNonePermission()
+        view = FieldPermissionView(
+            request, FieldsSetPermission(FieldsListPermission(permission=permission, fields=('name',)))
+        )
+        obj, other_obj = UserFactory(), UserFactory()
+        view._get_disallowed_fields_from_permissions()
+        view._get_disallowed_fields_from_permissions(obj=obj)
+        view._get_disallowed_fields_from_permissions(obj=other_obj)
+        assert_equal(permission.calls, 3)
+
+        FieldPermissionView(request, view.field_permissions)._invalidate_field_permissions_cache(obj)
+        view._get_disallowed_fields_from_permissions()
+        view._get_disallowed_fields_from_permissions(obj=other_obj)
+        assert_equal(permission.calls, 3)
+        view._get_disallowed_fields_from_permissions(obj=obj)
+        assert_equal(permission.calls, 4)
@@ -1,12 +1,35 @@
+from datetime import timedelta
+
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models import F
+from django.db.models.signals import post_save
+from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
 from germanium.decorators import login
 from germanium.test_cases.rest import RestTestCase
-from germanium.tools import assert_equal
+from germanium.tools import assert_equal, assert_false, assert_true
 from germanium.tools.rest import assert_valid_JSON_response
 
-from .factories import IssueFactory
+from pyston.response import RestErrorsResponse
+from pyston.utils import set_rest_context_to_request
+
+from is_core.auth.permissions import (
+    AllowAny, BasePermission, FieldsListPermission, FieldsSetPermission, PermissionsSet
+)
+from is_core.rest import paginators
+from is_core.rest.paginators import DjangoCursorBasedPaginator, DjangoOffsetBasedPaginator
+from is_core.site import get_model_core
+from is_core.utils.field_api import get_preload_lookups, get_only_fields
+
+from .factories import IssueFactory, MilestoneFactory, UserFactory
 from .test_case import HelperTestCase, AsSuperuserTestCase
 
-from issue_tracker.models import Issue
+from issue_tracker.models import Issue, Milestone
 
 
 __all__ =(
@@ -14,6 +37,12 @@ __all__ =(
 )
 
 
+class IsNotStaffObjectPermission(BasePermission):
+
+    def has_permission(self, name, request, view, obj=None):
+        return obj is None or not obj.is_staff
+
+
 class RestTestCase(AsSuperuserTestCase, HelperTestCase, RestTestCase):
 
     USER_API_URL = '/api/user/'
@@ -25,3 +54,341 @@ class RestTestCase(AsSuperuserTestCase, HelperTestCase, RestTestCase):
         resp = self.get('{}{}/?_fields=created_issues_count'.format(self.USER_API_URL, user.pk))
         assert_valid_JSON_response(resp)
         assert_equal(resp.json()['created_issues_count'], 1)
+
+    @login(is_superuser=True)
+    def test_batch_links_should_be_the_same_as_links_generated_per_object(self):
+        issues = [IssueFactory(created_by=self.get_user_obj()) for _ in range(5)]
+        resp = self.get('/api/issue/?_fields=id,_rest_links,_web_links')
+        assert_valid_JSON_response(resp)
+
+        issue_core = get_model_core(Issue)
+        request = resp.wsgi_request
+        assert_equal(set(request._preloaded_rest_extra_fields[issue_core]), {'_rest_links', '_web_links'})
+        request.kwargs = {}
+        rest_links = {}
+        web_links = {}
+        for issue in issues:
+            rest_links[issue.pk] = {}
+            for pattern in issue_core.rest_patterns.values():
+                allowed_methods = pattern.get_allowed_methods(request, issue)
+                if allowed_methods:
+                    rest_links[issue.pk][pattern.name] = {
+                        'url': pattern.get_url_string(request, obj=issue),
+                        'methods': [method.upper() for method in allowed_methods]
+                    }
+            web_links[issue.pk] = {
+                pattern.name: pattern.get_url_string(request, obj=issue)
+                for pattern in issue_core.web_link_patterns(request) if pattern.has_permission('get', request, obj=issue)
+            }
+
+        assert_equal(len(resp.json()), 5)
+        for data in resp.json():
+            assert_equal(data['_rest_links'], rest_links[data['id']])
+            assert_equal(data['_web_links'], web_links[data['id']])
+            assert_equal(data['_rest_links']['api-resource-issue']['url'], '/api/issue/{}/'.format(data['id']))
+
+    @login(is_superuser=True)
+    def test_total_count_should_be_returned_according_to_count_strategy(self):
+        [IssueFactory(created_by=self.get_user_obj()) for _ in range(5)]
+        resp = self.get('/api/issue/', headers={'HTTP_X_REQUEST_COUNT': '1'})
+        assert_equal(resp['X-Total'], '5')
+        assert_equal(resp['X-Total-Strategy'], 'exact')
+
+        with override_settings(IS_CORE_REST_PAGINATOR_COUNT_STRATEGY='capped', IS_CORE_REST_PAGINATOR_MAX_TOTAL=3):
+            resp = self.get('/api/issue/', headers={'HTTP_X_REQUEST_COUNT': '1'})
+            assert_equal(resp['X-Total'], '3')
+            assert_equal(resp['X-Total-Strategy'], 'capped')
+
+            resp = self.get('/api/issue/')
+            assert_false(resp.has_header('X-Total'))
+            assert_false(resp.has_header('X-Total-Strategy'))
+
+        with override_settings(IS_CORE_REST_PAGINATOR_COUNT_STRATEGY='estimate'):
+            resp = self.get('/api/issue/', headers={'HTTP_X_REQUEST_COUNT': '1'})
+            assert_equal(resp['X-Total'], '5')
+            assert_equal(resp['X-Total-Strategy'], 'exact')
+
+    def test_cursor_based_paginator_should_return_pages_in_both_directions(self):
+        user = self.get_user_obj()
+        parents = [IssueFactory(created_by=user, name='parent') for _ in range(2)]
+        for i in range(10):
+            IssueFactory(created_by=user, name='issue {}'.format(i % 3), parent=parents[i % 3] if i % 3 < 2 else None)
+
+        qs = Issue.objects.order_by('-parent', 'name')
+        expected_pks = list(
+            qs.order_by(F('parent').desc(nulls_last=True), F('name').asc(nulls_first=True), 'pk').values_list(
+                'pk', flat=True
+            )
+        )
+        paginator = DjangoCursorBasedPaginator()
+
+        def get_page(cursor=None):
+            request = RequestFactory().get('/')
+            request._rest_context = {'base': '5', 'cursor': cursor}
+            response = paginator.get_response(qs, request)
+            return [obj.pk for obj in response.result.iterable], response.http_headers
+
+        pages = []
+        page, headers = get_page()
+        assert_false('X-Prev-Cursor' in headers)
+        pages.append(page)
+        while 'X-Next-Cursor' in headers:
+            page, headers = get_page(headers['X-Next-Cursor'])
+            pages.append(page)
+        assert_equal([pk for page in pages for pk in page], expected_pks)
+        assert_equal(len(pages), 3)
+
+        for expected_page in reversed(pages[:-1]):
+            page, headers = get_page(headers['X-Prev-Cursor'])
+            assert_equal(page, expected_page)
+        assert_false('X-Prev-Cursor' in headers)
+
+    def test_cached_total_count_should_be_invalidated_after_model_change(self):
+        user = self.get_user_obj()
+        issues = [IssueFactory(created_by=user) for _ in range(3)]
+        paginator = DjangoOffsetBasedPaginator(count_cache_timeout=60)
+        paginator.connect_count_cache_invalidation(Issue)
+        self.addCleanup(paginator.disconnect_count_cache_invalidation, Issue)
+
+        def get_total(offset):
+            request = RequestFactory().get('/')
+            request.user = user
+            request._rest_context = {'request_count': '1', 'offset': str(offset)}
+            return paginator.get_response(Issue.objects.all(), request).http_headers['X-Total']
+
+        assert_equal(get_total(0), 3)
+        IssueFactory(created_by=user)
+        leader = UserFactory()
+        # Cache was invalidated with the post_save signal
+        assert_equal(get_total(1), 4)
+
+        Issue.objects.bulk_create([Issue(created_by=user, leader=leader, name='bulk')])
+        assert_equal(get_total(1), 4)
+        # The first page always computes a fresh count
+        assert_equal(get_total(0), 5)
+
+        issues[0].delete()
+        assert_equal(get_total(1), 4)
+
+    def test_cached_total_count_should_be_invalidated_after_related_model_change(self):
+        user = self.get_user_obj()
+        issue = IssueFactory(created_by=user)
+        paginator = DjangoOffsetBasedPaginator(count_cache_timeout=60)
+        paginator.connect_count_cache_invalidation(Issue)
+        self.addCleanup(paginator.disconnect_count_cache_invalidation, Issue)
+
+        def get_total(offset):
+            request = RequestFactory().get('/')
+            request.user = user
+            request._rest_context = {'request_count': '1', 'offset': str(offset)}
+            return paginator.get_response(
+                Issue.objects.filter(leader__email='leader@test.cz'), request
+            ).http_headers['X-Total']
+
+        assert_equal(get_total(0), 0)
+        issue.leader.email = 'leader@test.cz'
+        issue.leader.save()
+        assert_equal(get_total(1), 1)
+
+    def test_cached_total_count_of_empty_queryset_should_be_zero(self):
+        user = self.get_user_obj()
+        IssueFactory(created_by=user)
+        paginator = DjangoOffsetBasedPaginator(count_cache_timeout=60)
+
+        request = RequestFactory().get('/')
+        request.user = user
+        request._rest_context = {'request_count': '1'}
+        with patch.object(paginators, 'get_count_cache') as get_count_cache_mock:
+            http_headers = paginator.get_response(Issue.objects.filter(pk__in=[]), request).http_headers
+        assert_false(get_count_cache_mock.called)
+        assert_equal(http_headers['X-Total'], 0)
+        assert_equal(http_headers['X-Total-Strategy'], 'exact')
+
+    def test_preload_lookups_should_be_generated_from_field_paths(self):
+        assert_equal(
+            get_preload_lookups(
+                Issue, ('id', 'name', 'leader__email', 'created_by_id', 'leader__solving_issue__name',
+                        'watched_by__username', 'parent__subissues__created_by', 'related_object', 'watched_by_string')
+            ),
+            (
+                ['leader', 'leader__solving_issue', 'parent'],
+                ['parent__subissues__created_by', 'related_object', 'watched_by']
+            )
+        )
+
+    @login(is_superuser=True)
+    def test_issue_list_queries_should_not_depend_on_number_of_rows(self):
+        def get_number_of_queries():
+            with CaptureQueriesContext(connection) as queries:
+                resp = self.get('/api/issue/?_fields=id,leader__email,leader__last_name')
+                assert_valid_JSON_response(resp)
+            return len(queries)
+
+        IssueFactory()
+        number_of_queries = get_number_of_queries()
+        for _ in range(5):
+            IssueFactory()
+        assert_equal(get_number_of_queries(), number_of_queries)
+
+        with override_settings(IS_CORE_REST_AUTO_PRELOAD=False):
+            assert_equal(get_number_of_queries(), number_of_queries + 6)
+
+    def test_preload_lookups_should_be_generated_from_method_dependencies(self):
+        assert_equal(
+            get_preload_lookups(Issue, ('id', 'watched_by_string', 'leader__leading_issue__watched_by_string')),
+            (['leader__leading_issue'], ['leader__leading_issue__watched_by', 'watched_by'])
+        )
+        assert_equal(get_preload_lookups(Issue, ('watched_by_method',)), ([], []))
+
+    @login(is_superuser=True)
+    def test_issue_list_method_field_queries_should_not_depend_on_number_of_rows(self):
+        def get_number_of_queries():
+            with CaptureQueriesContext(connection) as queries:
+                resp = self.get('/api/issue/?_fields=id,watched_by_string')
+                assert_valid_JSON_response(resp)
+            return len(queries)
+
+        IssueFactory().watched_by.add(UserFactory())
+        number_of_queries = get_number_of_queries()
+        for _ in range(5):
+            IssueFactory().watched_by.add(UserFactory())
+        assert_equal(get_number_of_queries(), number_of_queries)
+
+    @login(is_superuser=True)
+    def test_users_should_be_searched_with_search_parameter(self):
+        searched_user = UserFactory(first_name='Searched', last_name='Person')
+        UserFactory(first_name='Searched', last_name='Nobody')
+        resp = self.get('{}?_search=searched%20pers&_fields=id'.format(self.USER_API_URL))
+        assert_valid_JSON_response(resp)
+        assert_equal(self.deserialize(resp), [{'id': searched_user.pk}])
+
+    def test_users_should_not_be_searched_by_fields_disallowed_by_permissions(self):
+        UserFactory(username='hidden', first_name='Visible', last_name='Person')
+        request = RequestFactory().get(self.USER_API_URL)
+        request.user = User.objects.create_superuser('search_superuser', 'search@test.cz', 'super secret password')
+        request.kwargs = {}
+        resource = get_model_core(User).rest_patterns['api'].get_view(request)
+        resource.field_permissions = FieldsSetPermission(
+            FieldsListPermission(permission=PermissionsSet(), fields=('username',))
+        )
+
+        request._rest_context = {'search': 'hidden'}
+        assert_false(resource._filter_queryset(User.objects.all()).exists())
+        request._rest_context = {'search': 'visible'}
+        assert_equal(resource._filter_queryset(User.objects.all()).count(), 1)
+
+    def test_only_fields_should_be_generated_from_field_paths(self):
+        assert_equal(
+            get_only_fields(Issue, ('id', 'name', 'leader__email', 'watched_by', 'related_object', '_obj_name')),
+            ['id', 'leader', 'name', 'related_object_ct', 'related_object_id']
+        )
+        assert_equal(get_only_fields(Issue, ('id', 'watched_by_string')), ['id'])
+        assert_equal(get_only_fields(Issue, ('id', 'watched_by_method')), None)
+
+    @login(is_superuser=True)
+    @override_settings(IS_CORE_REST_AUTO_DEFER=True)
+    def test_issue_list_should_load_only_columns_of_serialized_fields(self):
+        issue = IssueFactory()
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.get('/api/issue/?_fields=id,_obj_name,leader__email')
+            assert_valid_JSON_response(resp)
+        issue_queries = [query['sql'] for query in queries if 'issue_tracker_issue' in query['sql']]
+        assert_equal(len(issue_queries), 1)
+        assert_false('"issue_tracker_issue"."name"' in issue_queries[0])
+        assert_equal(
+            self.deserialize(resp),
+            [{'id': issue.pk, '_obj_name': str(issue), 'leader': {'email': issue.leader.email}}]
+        )
+
+    def get_bulk_update_resource(self, data, model=User):
+        request = RequestFactory().patch('/api/')
+        request.user = User.objects.create_superuser('bulk_superuser', 'bulk@test.cz', 'super secret password')
+        request.data = data
+        request.kwargs = {}
+        resource = get_model_core(model).rest_patterns['api'].get_view(request)
+        set_rest_context_to_request(request, resource._get_headers_queryset_context_mapping())
+        return resource
+
+    @override_settings(IS_CORE_REST_FAST_BULK_UPDATE=True, IS_CORE_REST_FAST_BULK_UPDATE_CHUNK_SIZE=2)
+    def test_milestones_should_be_updated_with_fast_bulk_update(self):
+        [MilestoneFactory() for _ in range(5)]
+        resource = self.get_bulk_update_resource({'name': 'bulk'}, model=Milestone)
+        with CaptureQueriesContext(connection) as queries:
+            milestones = resource.update_bulk()
+        # Savepoint, milestones count, pks, form object, 3 update queries, 3 selects of the updated milestones and
+        # savepoint release
+        assert_equal(len(queries), 11)
+        assert_equal(len(milestones), 5)
+        assert_equal(set(Milestone.objects.values_list('name', flat=True)), {'bulk'})
+        assert_true(all(milestone.name == 'bulk' for milestone in milestones))
+
+    @override_settings(IS_CORE_REST_FAST_BULK_UPDATE=True)
+    def test_fast_bulk_update_should_set_auto_now_fields(self):
+        milestones = [MilestoneFactory() for _ in range(2)]
+        changed_at = timezone.now() - timedelta(days=1)
+        Milestone.objects.update(changed_at=changed_at)
+        updated_milestones = self.get_bulk_update_resource({'name': 'bulk'}, model=Milestone).update_bulk()
+        assert_true(all(milestone.changed_at > changed_at for milestone in updated_milestones))
+        for milestone in milestones:
+            milestone.refresh_from_db()
+            assert_equal(milestone.name, 'bulk')
+            assert_true(milestone.changed_at > changed_at)
+
+    @override_settings(IS_CORE_REST_FAST_BULK_UPDATE=True)
+    def test_fast_bulk_update_should_not_be_used_with_model_save_hooks(self):
+        [UserFactory() for _ in range(2)]
+        resource = self.get_bulk_update_resource({'first_name': 'bulk'})
+        # User model overrides the save method
+        with patch.object(User, 'save', autospec=True, side_effect=User.save) as save_mock:
+            assert_equal(len(resource.update_bulk()), 3)
+        assert_equal(save_mock.call_count, 3)
+        assert_equal(User.objects.filter(first_name='bulk').count(), 3)
+
+    @override_settings(IS_CORE_REST_FAST_BULK_UPDATE=True)
+    def test_fast_bulk_update_should_not_be_used_with_model_save_signal_receivers(self):
+        [MilestoneFactory() for _ in range(2)]
+        saved_milestones = []
+
+        def save_receiver(sender, instance, **kwargs):
+            saved_milestones.append(instance)
+
+        post_save.connect(save_receiver, sender=Milestone)
+        self.addCleanup(post_save.disconnect, save_receiver, sender=Milestone)
+        assert_equal(len(self.get_bulk_update_resource({'name': 'bulk'}, model=Milestone).update_bulk()), 2)
+        assert_equal(len(saved_milestones), 2)
+
+    @override_settings(IS_CORE_REST_FAST_BULK_UPDATE=True)
+    def test_invalid_fast_bulk_update_should_return_errors_of_every_object(self):
+        [UserFactory() for _ in range(2)]
+        resource = self.get_bulk_update_resource({'first_name': 'x' * 1000})
+        response = resource.update_bulk()
+        assert_true(isinstance(response, RestErrorsResponse))
+        assert_equal(len(response.result['messages']['errors']), 3)
+        assert_false(User.objects.filter(first_name='x' * 1000).exists())
+
+    @override_settings(IS_CORE_REST_FAST_BULK_UPDATE=True)
+    def test_fast_bulk_update_should_not_change_fields_readonly_for_some_objects(self):
+        staff_user, user = UserFactory(is_staff=True), UserFactory(is_staff=False)
+        resource = self.get_bulk_update_resource({'first_name': 'bulk'})
+        resource.field_permissions = FieldsSetPermission(FieldsListPermission(
+            permission=PermissionsSet(read=AllowAny(), edit=IsNotStaffObjectPermission()),
+            fields=('first_name',)
+        ))
+        resource.update_bulk()
+        staff_user.refresh_from_db()
+        user.refresh_from_db()
+        assert_false(staff_user.first_name == 'bulk')
+        assert_equal(user.first_name, 'bulk')
+
+    @override_settings(IS_CORE_REST_FAST_BULK_UPDATE=True)
+    def test_fast_bulk_update_should_not_be_used_with_save_hooks(self):
+        [UserFactory() for _ in range(2)]
+        resource = self.get_bulk_update_resource({'first_name': 'bulk'})
+        form_instances = []
+        with patch.object(
+                type(resource.core), 'pre_save_model',
+                lambda core, request, obj, form, change: form_instances.append((obj, form.instance))):
+            assert_equal(len(resource.update_bulk()), 3)
+        assert_equal(len(form_instances), 3)
+        assert_true(all(obj is form_instance for obj, form_instance in form_instances))
+
@@ -0,0 +1,86 @@
+import re
+
+from unittest.mock import patch
+
+from django.contrib.auth.models import Permission, User
+from django.contrib.contenttypes.models import ContentType
+from django.test.utils import override_settings
+
+from germanium.decorators import login
+from germanium.test_cases.client import ClientTestCase
+from germanium.tools import assert_equal, assert_false, assert_true
+
+from is_core.generic_views.table_views import (
+    DjangoTableView, connect_table_header_cache_invalidation, get_table_header_cache, get_table_header_cache_models
+)
+from is_core.main import UiCore
+from is_core.menu import get_menu_cache, invalidate_menu_cache
+
+from issue_tracker.models import Issue
+
+from .factories import UserFactory
+from .test_case import HelperTestCase, AsSuperuserTestCase
+
+
+__all__ =(
+    'UICacheTestCase',
+)
+
+
+class UICacheTestCase(AsSuperuserTestCase, HelperTestCase, ClientTestCase):
+    ISSUE_UI_URL = '/issue/'
+    USER_UI_URL = '/user/'
+
+    def get_active_menu_item_urls(self, resp):
+        return re.findall(r'<li class="menu-item [^"]*active">\s*<a href="([^"]+)"', resp.content.decode('utf-8'))
+
+    @login(is_superuser=True)
+    @override_settings(IS_CORE_TABLE_HEADER_CACHE_TIMEOUT=60)
+    def test_table_headers_should_be_cached_until_related_model_is_changed(self):
+        connect_table_header_cache_invalidation(Issue)
+        get_table_header_cache().clear()
+
+        with patch.object(DjangoTableView, '_get_header', autospec=True,
+                          side_effect=DjangoTableView._get_header) as get_header_mock:
+            resp = self.get(self.ISSUE_UI_URL)
+            headers_count = get_header_mock.call_count
+            assert_true(headers_count > 0)
+
+            assert_equal(self.get(self.ISSUE_UI_URL).content, resp.content)
+            assert_equal(get_header_mock.call_count, headers_count)
+
+            UserFactory()
+            self.get(self.ISSUE_UI_URL)
+            assert_equal(get_header_mock.call_count, 2 * headers_count)
+
+    def test_table_header_cache_models_should_contain_models_along_field_paths(self):
+        user_models = get_table_header_cache_models(User)
+        assert_true(Permission in user_models)
+        assert_false(ContentType in user_models)
+        assert_equal(
+            get_table_header_cache_models(User, ('user_permissions__content_type__model',)) - user_models,
+            {ContentType}
+        )
+        assert_equal(
+            get_table_header_cache_models(User, ('username', 'created_issues_count', 'invalid__path')), user_models
+        )
+
+    @login(is_superuser=True)
+    @override_settings(IS_CORE_MENU_CACHE_TIMEOUT=60)
+    def test_menu_items_should_be_cached_with_active_item_set_per_request(self):
+        get_menu_cache().clear()
+
+        with patch.object(UiCore, 'get_menu_item', autospec=True,
+                          side_effect=UiCore.get_menu_item) as get_menu_item_mock:
+            resp = self.get(self.ISSUE_UI_URL)
+            menu_items_count = get_menu_item_mock.call_count
+            assert_true(menu_items_count > 0)
+            assert_equal(self.get_active_menu_item_urls(resp), [self.ISSUE_UI_URL])
+
+            resp = self.get(self.USER_UI_URL)
+            assert_equal(get_menu_item_mock.call_count, menu_items_count)
+            assert_equal(self.get_active_menu_item_urls(resp), [self.USER_UI_URL])
+
+            invalidate_menu_cache()
+            self.get(self.USER_UI_URL)
+            assert_equal(get_menu_item_mock.call_count, 2 * menu_items_count)
@@ -1,21 +1,31 @@
+from types import MappingProxyType
+from unittest.mock import patch
+
 from django.contrib.auth.models import User
+from django.db import connection
 from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse, set_script_prefix, get_script_prefix, get_resolver, NoReverseMatch
 
 from germanium.test_cases.default import GermaniumTestCase
-from germanium.tools import assert_equal, assert_raises, assert_is_none
+from germanium.tools import assert_equal, assert_raises, assert_is_none, assert_false, assert_true
 
 from is_core.utils import (
     get_field_label_from_path, get_field_from_model_or_none, get_field_widget_from_path,
-    get_readonly_field_value_from_path
+    get_readonly_field_value_from_path, display_object_data, display_objects_data
 )
+from is_core.forms.models import ModelChoiceField, form_class_cache
+from is_core.main import DjangoUiRestCore, ModelRestCore
 from is_core.forms.utils import ReadonlyValue
+from is_core.patterns import LazyViewDispatch, UiPattern, patterns
+from is_core.site import get_model_core, site
 from is_core.utils.field_api import (
     GetFieldDescriptorException, get_field_value_from_path, GetFieldDescriptorValueError,
-    get_field_descriptors_from_path
+    get_field_descriptors_from_path, field_descriptors_cache, clear_field_descriptors_cache
 )
 from is_core.forms.widgets import (
     ReadonlyWidget, ManyToManyReadonlyWidget, ModelObjectReadonlyWidget, ModelMultipleReadonlyWidget,
-    ModelChoiceReadonlyWidget
+    ModelChoiceReadonlyWidget, get_selectbox_cache
 )
 
 from issue_tracker.cores.views import UserDetailView
@@ -46,6 +56,49 @@ class UtilsTestCase(GermaniumTestCase):
         assert_equal(issue_solver_watching_issues_count_descriptors[0].field_name, 'solver')
         assert_equal(issue_solver_watching_issues_count_descriptors[1].field_name, 'watching_issues_count')
 
+    def test_get_field_descriptors_from_path_should_be_cached(self):
+        clear_field_descriptors_cache()
+        issue_solver_descriptors = get_field_descriptors_from_path(Issue, 'solver__watching_issues_count')
+        assert_equal(len(field_descriptors_cache), 2)
+        assert_equal(
+            [descriptor.field_name for descriptor in get_field_descriptors_from_path(
+                Issue, 'solver__watching_issues_count'
+            )],
+            [descriptor.field_name for descriptor in issue_solver_descriptors]
+        )
+        assert_equal(len(field_descriptors_cache), 2)
+
+    def test_cached_view_method_descriptor_should_be_bound_to_the_view_instance(self):
+        first_view, second_view = UserDetailView(), UserDetailView()
+        assert_equal(get_field_descriptors_from_path(User, 'leading_issue_name', view=first_view)[0].view, first_view)
+        assert_equal(
+            get_field_descriptors_from_path(User, 'leading_issue_name', view=second_view)[0].view, second_view
+        )
+        assert_is_none(field_descriptors_cache[(User, 'leading_issue_name', UserDetailView)][0][0].view)
+
+    def test_compiled_url_template_should_return_the_same_url_as_reverse(self):
+        issue = IssueFactory()
+        request = self.factory.get('/')
+        detail_pattern = get_model_core(Issue).ui_patterns['detail']
+        assert_equal(
+            detail_pattern.get_url_string(request, obj=issue),
+            reverse(detail_pattern.pattern, kwargs={'pk': issue.pk})
+        )
+        assert_equal(
+            {url_template[0] for url_template in detail_pattern._url_templates.values() if url_template is not None},
+            {'/issue/{pk}/'}
+        )
+
+        script_prefix = get_script_prefix()
+        try:
+            set_script_prefix('/prefix/')
+            assert_equal(detail_pattern.get_url_string(request, obj=issue), '/prefix/issue/{}/'.format(issue.pk))
+        finally:
+            set_script_prefix(script_prefix)
+
+        # Invalid value is not substituted to the template and reverse is used
+        assert_raises(NoReverseMatch, detail_pattern.get_url_string, request, view_kwargs={'pk': 'a/b'})
+
     def test_get_field_label_from_path_should_return_right_field_label(self):
         assert_equal(get_field_label_from_path(Issue, 'name'), 'Name')
         assert_equal(get_field_label_from_path(Issue, 'name', field_labels={'name': 'another name'}), 'another name')
@@ -160,3 +213,160 @@ class UtilsTestCase(GermaniumTestCase):
             [solver.first_name, leader.first_name]
         )
         assert_equal(get_readonly_field_value_from_path(issue, 'related_object'), solver, None)
+
+    def test_display_objects_data_should_return_the_same_values_as_display_object_data(self):
+        created_by = UserFactory()
+        issues = [IssueFactory(created_by=created_by, related_object=created_by) for _ in range(3)]
+        request = self.factory.get('')
+        request.user = UserFactory(is_superuser=True)
+        request.kwargs = {}
+        for field_name in ('name', 'created_by', 'related_object', 'leader__date_joined', 'watched_by'):
+            assert_equal(
+                display_objects_data(issues, field_name, request),
+                [display_object_data(issue, field_name, request) for issue in issues]
+            )
+
+    @override_settings(IS_CORE_FOREIGN_KEY_SELECTBOX_CACHE_TIMEOUT=60)
+    def test_restricted_select_decision_should_be_cached(self):
+        get_selectbox_cache().clear()
+        UserFactory()
+        with CaptureQueriesContext(connection) as queries:
+            assert_false(ModelChoiceField(queryset=User.objects.all()).widget.is_restricted)
+        assert_equal(len(queries), 1)
+        with CaptureQueriesContext(connection) as queries:
+            assert_false(ModelChoiceField(queryset=User.objects.all()).widget.is_restricted)
+        assert_equal(len(queries), 0)
+
+    def test_remote_select_should_render_only_selected_choice(self):
+        selected_user, other_user = UserFactory(), UserFactory()
+        widget = ModelChoiceField(queryset=User.objects.all()).widget
+        widget.remote_url = '/api/user/'
+        html = widget.render('user', selected_user.pk, attrs={})
+        assert_false(widget.is_restricted)
+        assert_true('data-resource="/api/user/"' in html)
+        assert_true('<option value="{}" selected>'.format(selected_user.pk) in html)
+        assert_false('value="{}"'.format(other_user.pk) in html)
+
+    @override_settings(IS_CORE_LAZY_PATTERNS=True)
+    def test_lazy_pattern_should_create_view_class_with_the_first_dispatch(self):
+        user_core = get_model_core(User)
+        pattern = UiPattern('lazy-detail-user', 'IS', r'^lazy/(?P<pk>\d+)/$', UserDetailView, user_core)
+        try:
+            assert_is_none(pattern._view_class)
+            view_dispatch = pattern.get_view_dispatch()
+            assert_true(isinstance(view_dispatch, LazyViewDispatch))
+            assert_is_none(pattern._view_class)
+
+            assert_equal(view_dispatch.view_class, pattern.view_class)
+            assert_true(issubclass(pattern.view_class, UserDetailView))
+            assert_equal(pattern.view_class.core, user_core)
+            assert_equal(pattern.view_class.pattern, pattern)
+        finally:
+            patterns.pop(pattern.name)
+
+    def test_site_should_report_startup_timings_of_cores(self):
+        get_resolver().url_patterns
+        startup_report = site.get_startup_report()
+        assert_equal(len(startup_report), len(site._registry))
+        assert_true(all('init' in line and 'urls' in line for line in startup_report))
+
+    def test_rest_field_registry_should_be_precomputed_with_site_initialization(self):
+        issue_core = get_model_core(Issue)
+        assert_true(isinstance(issue_core.rest_field_registry, MappingProxyType))
+        extra_fields = issue_core.rest_field_registry['extra_fields']
+        assert_true(isinstance(extra_fields, tuple))
+        assert_true('watched_by_string' in extra_fields)
+        assert_equal(len(extra_fields), len(set(extra_fields)))
+        assert_equal(issue_core.get_registered_rest_fields('extra_fields', None), list(extra_fields))
+
+    def test_rest_field_registry_should_not_contain_fields_with_overridden_getters(self):
+        class RequestDependentIssueCore(DjangoUiRestCore):
+            abstract = True
+            model = Issue
+
+            def get_list_fields(self, request):
+                return ['id'] if request is None else ['id', 'name']
+
+        core = RequestDependentIssueCore('IS', [])
+        core.init_rest_field_registry()
+        assert_true('default_fields' in core.rest_field_registry)
+        assert_false('extra_fields' in core.rest_field_registry)
+
+    def test_rest_field_registry_should_report_invalid_field_names(self):
+        class InvalidIssueCore(DjangoUiRestCore):
+            abstract = True
+            model = Issue
+            rest_extra_fields = ('name', 'invalid_field')
+
+        with self.assertLogs('is-core', level='WARNING') as logs:
+            InvalidIssueCore('IS', []).init_rest_field_registry()
+        assert_true('invalid_field' in logs.output[0])
+        assert_false('name,' in logs.output[0])
+
+    def test_rest_field_registry_should_not_contain_fields_with_getters_overridden_by_is_core_methods(self):
+        class OverriddenIssueCore(DjangoUiRestCore):
+            abstract = True
+            model = Issue
+            get_rest_extra_fields = ModelRestCore.get_rest_extra_fields
+
+        core = OverriddenIssueCore('IS', [])
+        core.init_rest_field_registry()
+        assert_false('extra_fields' in core.rest_field_registry)
+        assert_true('default_fields' in core.rest_field_registry)
+
+    def get_issue_detail_view(self, issue, user=None):
+        request = self.factory.get('/')
+        request.user = (
+            User.objects.get_or_create(username='form_class_cache_superuser', is_superuser=True)[0] if user is None
+            else user
+        )
+        return get_model_core(Issue).ui_patterns['detail'].get_view(request, kwargs={'pk': issue.pk})
+
+    @override_settings(IS_CORE_FORM_CLASS_CACHE_SIZE=1)
+    def test_generated_form_class_should_be_cached_and_bound_to_request(self):
+        form_class_cache.clear()
+        issue = IssueFactory()
+        first_view, second_view = self.get_issue_detail_view(issue), self.get_issue_detail_view(issue)
+        first_form_class, second_form_class = first_view.get_form_class(), second_view.get_form_class()
+        assert_equal(first_form_class.__bases__, second_form_class.__bases__)
+        assert_equal(first_form_class._request, first_view.request)
+        assert_equal(second_form_class._request, second_view.request)
+
+        # Readonly fields generated by the view callback are generated again with the view of the second request
+        form = second_form_class(instance=issue)
+        assert_true(second_form_class.base_callback_readonly_fields)
+        for field_name in second_form_class.base_callback_readonly_fields:
+            assert_true(
+                form.fields[field_name]._get_val_label_and_widget_fun
+                is not second_form_class.base_fields[field_name]._get_val_label_and_widget_fun
+            )
+
+        first_view.generate_form_class(fields=('name',))
+        assert_false(second_view.get_form_class().__bases__ == second_form_class.__bases__)
+
+    @override_settings(IS_CORE_FORM_CLASS_CACHE_SIZE=10)
+    def test_form_class_with_overridden_formfield_callback_should_not_be_cached(self):
+        form_class_cache.clear()
+        issue = IssueFactory()
+
+        def formfield_for_dbfield(view, db_field, **kwargs):
+            if db_field.name == 'leader':
+                kwargs['queryset'] = User.objects.filter(pk=view.request.user.pk)
+            return db_field.formfield(**kwargs)
+
+        first_user = UserFactory(is_superuser=True)
+        second_user = UserFactory(is_superuser=True)
+        first_view = self.get_issue_detail_view(issue, first_user)
+        second_view = self.get_issue_detail_view(issue, second_user)
+        first_resource = get_model_core(Issue).rest_patterns['api'].get_view(first_view.request)
+        second_resource = get_model_core(Issue).rest_patterns['api'].get_view(second_view.request)
+        with patch.object(type(first_view), 'formfield_for_dbfield', formfield_for_dbfield), \
+                patch.object(type(first_resource), 'formfield_for_dbfield', formfield_for_dbfield):
+            first_form_class, second_form_class = first_view.get_form_class(), second_view.get_form_class()
+            first_rest_form_class = first_resource._generate_form_class(issue)
+            second_rest_form_class = second_resource._generate_form_class(issue)
+
+        assert_equal(list(first_form_class.base_fields['leader'].queryset), [first_user])
+        assert_equal(list(second_form_class.base_fields['leader'].queryset), [second_user])
+        assert_equal(list(first_rest_form_class.base_fields['leader'].queryset), [first_user])
+        assert_equal(list(second_rest_form_class.base_fields['leader'].queryset), [second_user])
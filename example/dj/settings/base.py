@@ -140,7 +140,9 @@ INSTALLED_APPS = (
 
     # IS
     'is_core',
+    'is_core.contrib.background_export',
     'block_snippets',
+    'security',
 )
 
 # A sample logging configuration. The only tangible logging
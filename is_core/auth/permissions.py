@@ -1,11 +1,84 @@
 from django.core.exceptions import ImproperlyConfigured
 
+from is_core.config import settings
+
+
+class PermissionsCache:
+    """
+    Request scoped storage of the permission decisions. Cache is related with the request user, if user is changed
+    (for example in the login view) all stored decisions are removed.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.hits = 0
+        self.misses = 0
+        self._decisions = {}
+
+    def get_or_compute(self, user, key, compute):
+        if self.user is not user:
+            self.user = user
+            self._decisions.clear()
+
+        try:
+            decision = self._decisions[key]
+            self.hits += 1
+        except KeyError:
+            decision = self._decisions[key] = compute()
+            self.misses += 1
+        return decision
+
+    def clear(self):
+        self._decisions.clear()
+
+    def remove_if(self, condition):
+        for key in [key for key in self._decisions if condition(key)]:
+            del self._decisions[key]
+
+    def __len__(self):
+        return len(self._decisions)
+
+
+def get_permissions_cache(request):
+    """
+    Returns permissions cache of the request or None if cache is turned off (setting IS_CORE_PERMISSIONS_CACHE).
+    """
+    if request is None or not settings.PERMISSIONS_CACHE:
+        return None
+
+    permissions_cache = getattr(request, '_permissions_cache', None)
+    if permissions_cache is None:
+        permissions_cache = PermissionsCache(getattr(request, 'user', None))
+        request._permissions_cache = permissions_cache
+    return permissions_cache
+
+
+def has_permission_with_cache(permission, name, request, view, obj=None, parent=None):
+    """
+    Checks permission and stores the decision to the request permissions cache if the permission can be cached.
+    """
+    permissions_cache = get_permissions_cache(request)
+    cache_key = (
+        permission._get_cache_key(name, request, view, obj=obj) if permissions_cache is not None else None
+    )
+    if cache_key is None:
+        return permission._has_permission_in_permission_set(name, request, view, obj=obj, parent=parent)
+    else:
+        return permissions_cache.get_or_compute(
+            getattr(request, 'user', None),
+            cache_key,
+            lambda: permission._has_permission_in_permission_set(name, request, view, obj=obj, parent=parent)
+        )
+
 
 class BasePermission:
     """
     Base IS core permission object which has only one method has_permission which must be implemented in descendant.
     """
 
+    # Result of the permission depends only on the request user and can be stored in the request permissions cache
+    cacheable = False
+
     def has_permission(self, name, request, view, obj=None):
         """
         Checks if request has permission to the given action.
@@ -24,6 +97,19 @@ class BasePermission:
     def _has_permission_in_permission_set(self, name, request, view, obj=None, parent=None):
         return self.has_permission(name, request, view, obj=obj)
 
+    def _get_cache_key(self, name, request, view, obj=None):
+        """
+        Returns key of the permission decision in the request permissions cache or None if decision cannot be cached.
+        """
+        return (self,) if self.cacheable else None
+
+    def _is_obj_independent(self, name, request, view, parent=None):
+        """
+        Returns True if the permission decision is the same for all objects and can be evaluated only once for the
+        whole set of objects (for example one page of the list).
+        """
+        return self.cacheable
+
     def __and__(self, other):
         assert isinstance(other, BasePermission), 'Only permission instances can be joined'
 
@@ -48,15 +134,20 @@ class OperatorPermission(BasePermission):
 
     def has_permission(self, name, request, view, obj=None):
         return self.operator_function(
-            permission.has_permission(name, request, view, obj=obj) for permission in self._permissions
+            has_permission_with_cache(permission, name, request, view, obj=obj) for permission in self._permissions
         )
 
     def _has_permission_in_permission_set(self, name, request, view, obj=None, parent=None):
         return self.operator_function(
-            permission._has_permission_in_permission_set(name, request, view, obj=obj, parent=parent)
+            has_permission_with_cache(permission, name, request, view, obj=obj, parent=parent)
             for permission in self._permissions
         )
 
+    def _is_obj_independent(self, name, request, view, parent=None):
+        return all(
+            permission._is_obj_independent(name, request, view, parent=parent) for permission in self._permissions
+        )
+
     def add(self, permission):
         assert isinstance(permission, BasePermission), 'Only permission instance can be added to the operator'
 
@@ -106,10 +197,13 @@ class NotPermission(BasePermission):
         self._permission = permission
 
     def has_permission(self, name, request, view, obj=None):
-        return not self._permission.has_permission(name, request, view, obj=obj)
+        return not has_permission_with_cache(self._permission, name, request, view, obj=obj)
 
     def _has_permission_in_permission_set(self, name, request, view, obj=None, parent=None):
-        return not self._permission._has_permission_in_permission_set(name, request, view, obj=obj, parent=parent)
+        return not has_permission_with_cache(self._permission, name, request, view, obj=obj, parent=parent)
+
+    def _is_obj_independent(self, name, request, view, parent=None):
+        return self._permission._is_obj_independent(name, request, view, parent=parent)
 
 
 DEFAULT_PERMISSION = '__default__'
@@ -144,9 +238,13 @@ class PermissionsSet(BasePermission):
         permission = self._permissions.get(name, self._permissions.get(DEFAULT_PERMISSION, None))
         return (
             permission is not None
-            and permission._has_permission_in_permission_set(name, request, view, obj=obj, parent=self)
+            and has_permission_with_cache(permission, name, request, view, obj=obj, parent=self)
         )
 
+    def _is_obj_independent(self, name, request, view, parent=None):
+        permission = self._permissions.get(name, self._permissions.get(DEFAULT_PERMISSION, None))
+        return permission is None or permission._is_obj_independent(name, request, view, parent=self)
+
     def __iter__(self):
         for permission in self._permissions.values():
             yield permission
@@ -157,6 +255,8 @@ class IsAuthenticated(BasePermission):
     Grant permission if user is authenticated and is active
     """
 
+    cacheable = True
+
     def has_permission(self, name, request, view, obj=None):
         return request.user.is_authenticated and request.user.is_active
 
@@ -166,6 +266,8 @@ class IsSuperuser(BasePermission):
     Grant permission if user is superuser
     """
 
+    cacheable = True
+
     def has_permission(self, name, request, view, obj=None):
         return request.user.is_superuser
 
@@ -175,6 +277,8 @@ class IsAdminUser(BasePermission):
     Grant permission if user is staff
     """
 
+    cacheable = True
+
     def has_permission(self, name, request, view, obj=None):
         return request.user.is_staff
 
@@ -187,6 +291,9 @@ class AllowAny(BasePermission):
     def has_permission(self, name, request, view, obj=None):
         return True
 
+    def _is_obj_independent(self, name, request, view, parent=None):
+        return True
+
 
 class CoreAllowed(BasePermission):
     """
@@ -200,6 +307,19 @@ class CoreAllowed(BasePermission):
         if name:
             self.name = name
 
+    def _has_core_permission_decision(self):
+        # Subclass with own has_permission can depend on anything else than the core permission
+        return type(self).has_permission is CoreAllowed.has_permission
+
+    def _get_cache_key(self, name, request, view, obj=None):
+        # Decision without object depends only on the core permission and the request user
+        return (self, self.name or name, view.core) if obj is None and self._has_core_permission_decision() else None
+
+    def _is_obj_independent(self, name, request, view, parent=None):
+        if not self._has_core_permission_decision():
+            return super()._is_obj_independent(name, request, view, parent=parent)
+        return view.core.permission._is_obj_independent(self.name or name, request, view)
+
     def has_permission(self, name, request, view, obj=None):
         return view.core.permission.has_permission(self.name or name, request, view, obj)
 
@@ -245,6 +365,12 @@ class SelfPermission(CoreAllowed):
         super().__init__()
         self.name = name
 
+    def _get_cache_key(self, name, request, view, obj=None):
+        return None
+
+    def _is_obj_independent(self, name, request, view, parent=None):
+        return parent is not None and parent._is_obj_independent(self.name, request, view)
+
     def _has_permission_in_permission_set(self, name, request, view, obj=None, parent=None):
         if not parent:
             raise ImproperlyConfigured('SelfPermission can be used only inside PermissionSet')
@@ -263,6 +389,12 @@ class FieldsPermission:
     def get_readonly_fields(self, view):
         raise NotImplementedError
 
+    def _is_obj_independent(self, request, view):
+        """
+        Returns True if disallowed and readonly fields are the same for all objects.
+        """
+        return False
+
 
 class FieldsListPermission(FieldsPermission):
 
@@ -271,7 +403,7 @@ class FieldsListPermission(FieldsPermission):
         self.fields = fields
 
     def _has_permission(self, name, request, view, obj=None):
-        return self.permission.has_permission(name, request, view, obj=obj)
+        return has_permission_with_cache(self.permission, name, request, view, obj=obj)
 
     def get_disallowed_fields(self, request, view, obj=None):
         return set(self.fields) if not self._has_permission('read', request, view, obj) else set()
@@ -279,6 +411,12 @@ class FieldsListPermission(FieldsPermission):
     def get_readonly_fields(self, request, view, obj=None):
         return set(self.fields) if not self._has_permission('edit', request, view, obj) else set()
 
+    def _is_obj_independent(self, request, view):
+        return (
+            self.permission._is_obj_independent('read', request, view)
+            and self.permission._is_obj_independent('edit', request, view)
+        )
+
 
 class FieldsSetPermission(FieldsPermission):
 
@@ -296,3 +434,8 @@ class FieldsSetPermission(FieldsPermission):
         for fields_permission in self.fields_permissions:
             readonly_fields |= fields_permission.get_readonly_fields(request, view, obj)
         return readonly_fields
+
+    def _is_obj_independent(self, request, view):
+        return all(
+            fields_permission._is_obj_independent(request, view) for fields_permission in self.fields_permissions
+        )
@@ -1,3 +1,6 @@
+from .permissions import get_permissions_cache
+
+
 class FieldPermissionViewMixin:
 
     field_permissions = None
@@ -5,8 +8,54 @@ class FieldPermissionViewMixin:
     def _get_field_permissions(self):
         return self.field_permissions if self.field_permissions is not None else self.core.field_permissions
 
+    def _is_field_permissions_obj_independent(self):
+        return self._get_field_permissions()._is_obj_independent(self.request, self)
+
+    def _get_field_permissions_cache_key(self, name, obj=None):
+        """
+        Returns key of the field permissions result in the request permissions cache or None if the result cannot be
+        cached (object without primary key).
+        """
+        if obj is None:
+            return ('field_permissions', name, self, None)
+        pk = getattr(obj, 'pk', None)
+        return None if pk is None else ('field_permissions', name, self, (obj.__class__, pk))
+
+    def _invalidate_field_permissions_cache(self, obj):
+        """
+        Removes field permissions results of the object from the request permissions cache (of all views), because
+        they can depend on the object state which is changed.
+        """
+        permissions_cache = get_permissions_cache(getattr(self, 'request', None))
+        pk = getattr(obj, 'pk', None)
+        if permissions_cache is not None and pk is not None:
+            obj_key = (obj.__class__, pk)
+            permissions_cache.remove_if(
+                lambda key: isinstance(key, tuple) and len(key) == 4 and key[0] == 'field_permissions'
+                and key[3] == obj_key
+            )
+
+    def _get_fields_from_permissions(self, name, obj, compute):
+        permissions_cache = get_permissions_cache(getattr(self, 'request', None))
+        cache_key = (
+            self._get_field_permissions_cache_key(name, obj=obj) if permissions_cache is not None else None
+        )
+        if cache_key is None:
+            return set(compute())
+        else:
+            # Result is stored as frozenset, the caller gets its own copy which can be changed
+            return set(permissions_cache.get_or_compute(
+                getattr(self.request, 'user', None), cache_key, lambda: frozenset(compute())
+            ))
+
     def _get_disallowed_fields_from_permissions(self, obj=None):
-        return self._get_field_permissions().get_disallowed_fields(self.request, self, obj=obj)
+        return self._get_fields_from_permissions(
+            'disallowed', obj,
+            lambda: self._get_field_permissions().get_disallowed_fields(self.request, self, obj=obj)
+        )
 
     def _get_readonly_fields_from_permissions(self, obj=None):
-        return self._get_field_permissions().get_readonly_fields(self.request, self, obj=obj)
+        return self._get_fields_from_permissions(
+            'readonly', obj,
+            lambda: self._get_field_permissions().get_readonly_fields(self.request, self, obj=obj)
+        )
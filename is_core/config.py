@@ -33,6 +33,9 @@ DEFAULTS = {
     'HOME_CORE': 'is_core.main.HomeUiCore',
     'HOME_VIEW': 'is_core.generic_views.base.HomeView',
     'MENU_GENERATOR': 'is_core.menu.MenuGenerator',
+    'MENU_CACHE_TIMEOUT': None,
+    'MENU_CACHE_ALIAS': 'default',
+    'MENU_CACHE_PERMISSIONS_FINGERPRINT_FUNCTION': None,
     'USERNAME': 'username',
     'PASSWORD': 'password',
     'LOGIN_URL': '/login/',
@@ -40,8 +43,24 @@ DEFAULTS = {
     'LOGIN_API_URL': lambda s: '/api{}'.format(s.LOGIN_URL),
     'EXPORT_TYPES': '',
     'FOREIGN_KEY_MAX_SELECTBOX_ENTRIES': 500,
+    'FOREIGN_KEY_SELECTBOX_CACHE_TIMEOUT': None,
+    'FOREIGN_KEY_SELECTBOX_CACHE_ALIAS': 'default',
+    'FOREIGN_KEY_REMOTE_SELECT': False,
+    'FOREIGN_KEY_REMOTE_SELECT_LIMIT': 20,
+    'FOREIGN_KEY_REMOTE_SELECT_MIN_LENGTH': 2,
     'LIST_PER_PAGE': 20,
     'REST_PAGINATOR_MAX_TOTAL': 10000,
+    'REST_PAGINATOR_COUNT_STRATEGY': 'exact',
+    'REST_AUTO_PRELOAD': True,
+    'REST_AUTO_DEFER': False,
+    'REST_FAST_BULK_UPDATE': False,
+    'REST_FAST_BULK_UPDATE_CHUNK_SIZE': 1000,
+    'REST_PAGINATOR_COUNT_CACHE_TIMEOUT': None,
+    'REST_PAGINATOR_COUNT_CACHE_ALIAS': 'default',
+    'REST_PAGINATOR_COUNT_CACHE_PERMISSIONS_FINGERPRINT_FUNCTION': None,
+    'TABLE_HEADER_CACHE_TIMEOUT': None,
+    'TABLE_HEADER_CACHE_ALIAS': 'default',
+    'TABLE_HEADER_CACHE_PERMISSIONS_FINGERPRINT_FUNCTION': None,
     'RESPONSE_EXCEPTION_FACTORY': 'is_core.exceptions.response.ui_rest_response_exception_factory',
     'DEFAULT_FIELDSET_TEMPLATE': 'is_core/forms/default_fieldset.html',
     'HEADER_IMAGE': None,
@@ -53,7 +72,20 @@ DEFAULTS = {
     'BACKGROUND_EXPORT_SERIALIZATION_LIMIT': 2000,
     'BACKGROUND_EXPORT_STORAGE_CLASS': 'django.core.files.storage.DefaultStorage',
     'BACKGROUND_EXPORT_EXPIRATION_DAYS': 30,
+    'BACKGROUND_EXPORT_CHUNK_SIZE': 1000,
+    'BACKGROUND_EXPORT_SHARDS_COUNT': 1,
+    'BACKGROUND_EXPORT_CACHE_TIMEOUT': None,
+    'BACKGROUND_EXPORT_CACHE_PERMISSIONS_FINGERPRINT_FUNCTION': None,
+    'BACKGROUND_EXPORT_COMPRESSION': None,
+    'BACKGROUND_EXPORT_COMPRESSION_LEVEL': 6,
+    'BACKGROUND_BULK_CHANGE': False,
+    'BACKGROUND_BULK_CHANGE_CHUNK_SIZE': 1000,
     'COLUMN_MANAGER': True,
+    'PERMISSIONS_CACHE': False,
+    'FORM_CLASS_CACHE_SIZE': None,
+    'COMPILED_URL_TEMPLATES': True,
+    'COMPILED_URL_TEMPLATES_VERIFY': False,
+    'LAZY_PATTERNS': False,
 }
 
 
@@ -1,8 +1,10 @@
 from is_core.auth.permissions import PermissionsSet, SelfPermission, IsSuperuser
+from is_core.config import settings
 from is_core.main import DjangoUiRestCore
+from is_core.utils import PK_PATTERN
 
-from .models import ExportedFile
-from .resource import CeleryDjangoCoreResource
+from .models import BulkChangeJob, ExportedFile
+from .resource import CeleryDjangoCoreResource, BulkChangeJobProgressResource, ExportedFileProgressResource
 
 
 class BackgroundExportCoreMixin:
@@ -10,9 +12,57 @@ class BackgroundExportCoreMixin:
     export_permission = IsSuperuser()
     rest_resource_class = CeleryDjangoCoreResource
 
+    background_export_compression = None
+    background_export_compression_level = None
+    background_bulk_change = None
+
     def _get_export_permission(self):
         return self.export_permission
 
+    def get_background_export_compression(self, request):
+        return (
+            settings.BACKGROUND_EXPORT_COMPRESSION if self.background_export_compression is None
+            else self.background_export_compression
+        )
+
+    def get_background_export_compression_level(self, request):
+        return (
+            settings.BACKGROUND_EXPORT_COMPRESSION_LEVEL if self.background_export_compression_level is None
+            else self.background_export_compression_level
+        )
+
+    def is_background_bulk_change_enabled(self, request):
+        return (
+            settings.BACKGROUND_BULK_CHANGE if self.background_bulk_change is None
+            else self.background_bulk_change
+        )
+
+    def get_background_bulk_change_rest_class(self, rest_class):
+        # Model resource is registered only once, serializers use the default rest class of the core
+        return type(
+            'BackgroundBulkChange{}'.format(rest_class.__name__), (rest_class,),
+            {'force_background_bulk_change': True, 'register': False}
+        )
+
+    def get_rest_patterns(self):
+        rest_patterns = super().get_rest_patterns()
+        if 'api' in rest_patterns and hasattr(self, 'is_bulk_change_enabled') and self.is_bulk_change_enabled():
+            # Bulk change UI sends the changes to the resource URL with the objects filter only, therefore the
+            # background bulk change has its own URL (it must precede the object resource URL)
+            rest_patterns['api-background-bulk-change'] = self.default_rest_pattern_class(
+                'api-background-bulk-change-{}'.format(self.get_menu_group_pattern_name()), self.site_name,
+                r'^background-bulk-change/$',
+                self.get_background_bulk_change_rest_class(rest_patterns['api'].resource_class), self
+            )
+            rest_patterns.move_to_end('api-background-bulk-change', last=False)
+        return rest_patterns
+
+    def get_bulk_change_api_url(self, request):
+        return (
+            self.rest_patterns['api-background-bulk-change'].get_url_string(request)
+            if self.is_background_bulk_change_enabled(request) else super().get_bulk_change_api_url(request)
+        )
+
     def _init_permission(self, permission):
         permission = super()._init_permission(permission)
         permission.set('export', self._get_export_permission())
@@ -35,13 +85,67 @@ class BaseExportedFileCore(DjangoBackgroundExportUiRestCore):
     read_all_permission = IsSuperuser()
 
     all_list_fields = (
-        'changed_at', 'created_at', 'created_by', 'downloaded_by', 'expiration', 'download_link'
+        'changed_at', 'created_at', 'created_by', 'downloaded_by', 'expiration', 'progress', 'download_link'
     )
     own_list_fields = (
-        'changed_at', 'created_at', 'expiration', 'download_link'
+        'changed_at', 'created_at', 'expiration', 'progress', 'download_link'
     )
     form_fields = (
-        'changed_at', 'created_at', 'created_by', 'downloaded_by', 'content_type', 'download_link', 'expiration'
+        'changed_at', 'created_at', 'created_by', 'downloaded_by', 'content_type', 'progress', 'failed_at',
+        'download_link', 'expiration'
+    )
+
+    rest_classes = (
+        ('api-progress', r'^{}/progress/$'.format(PK_PATTERN), ExportedFileProgressResource),
+    )
+
+    def _init_permission(self, permission):
+        return PermissionsSet(
+            read=SelfPermission('read_own') | SelfPermission('read_all'),
+            read_own=self.read_own_permission,
+            read_all=self.read_all_permission,
+        )
+
+    def get_list_fields(self, request):
+        return (
+            list(self.all_list_fields) if self.permission.has_permission('read_all', request, self)
+            else list(self.own_list_fields)
+        )
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        if self.permission.has_permission('read_all', request, self):
+            return qs
+        elif self.permission.has_permission('read_own', request, self):
+            return qs.filter(created_by=request.user)
+        else:
+            return qs.none()
+
+
+class BaseBulkChangeJobCore(DjangoUiRestCore):
+
+    abstract = True
+    model = BulkChangeJob
+
+    can_create = can_update = can_delete = False
+
+    read_own_permission = IsSuperuser()
+    read_all_permission = IsSuperuser()
+
+    all_list_fields = (
+        'changed_at', 'created_at', 'created_by', 'content_type', 'progress', 'failed_rows_count',
+        'error_report_download_link'
+    )
+    own_list_fields = (
+        'changed_at', 'created_at', 'content_type', 'progress', 'failed_rows_count', 'error_report_download_link'
+    )
+    form_fields = (
+        'changed_at', 'created_at', 'created_by', 'content_type', 'progress', 'processed_rows_count',
+        'failed_rows_count', 'total_rows_count', 'finished_at', 'failed_at', 'error_report_download_link'
+    )
+
+    rest_classes = (
+        ('api-progress', r'^{}/progress/$'.format(PK_PATTERN), BulkChangeJobProgressResource),
     )
 
     def _init_permission(self, permission):
@@ -12,5 +12,12 @@ class Command(BaseCommand):
         if not count_expired_exported_files:
             self.stdout.write('No expired exported files were found.')
         else:
-            [exported_file.file.delete() for exported_file in ExportedFile.objects.filter_expired()]
+            for exported_file in ExportedFile.objects.filter_expired():
+                if ExportedFile.objects.filter_active(file=exported_file.file.name).exclude(
+                        pk__in=expired_exported_files_qs.values('pk')).exists():
+                    # File is shared with the not expired exported file (export cache)
+                    exported_file.file = ''
+                    exported_file.save(update_only_changed_fields=True)
+                else:
+                    exported_file.file.delete()
             self.stdout.write('{} expired exported files was removed.'.format(count_expired_exported_files))
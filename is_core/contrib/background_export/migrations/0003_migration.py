@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('background_export', '0002_migration'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exportedfile',
+            name='parts_count',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='parts count'),
+        ),
+        migrations.AddField(
+            model_name='exportedfile',
+            name='generated_parts_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='generated parts count'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('background_export', '0003_migration'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exportedfile',
+            name='processed_rows_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='processed rows count'),
+        ),
+        migrations.AddField(
+            model_name='exportedfile',
+            name='total_rows_count',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='total rows count'),
+        ),
+        migrations.AddField(
+            model_name='exportedfile',
+            name='last_pk',
+            field=models.CharField(blank=True, editable=False, max_length=250, null=True,
+                                   verbose_name='last exported primary key'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('background_export', '0004_migration'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exportedfile',
+            name='cache_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64, null=True,
+                                   verbose_name='cache key'),
+        ),
+    ]
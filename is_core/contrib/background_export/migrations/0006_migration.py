@@ -0,0 +1,56 @@
+import import_string
+
+import chamber.models.fields
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import is_core.contrib.background_export.models
+from is_core.config import settings as is_core_settings
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('background_export', '0005_migration'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BulkChangeJob',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='created at')),
+                ('changed_at', models.DateTimeField(auto_now=True, db_index=True, verbose_name='changed at')),
+                ('slug', models.SlugField(default=is_core.contrib.background_export.models.generate_slug,
+                                          max_length=32, primary_key=True, serialize=False, verbose_name='slug')),
+                ('query', models.TextField(editable=False, verbose_name='query')),
+                ('data', models.TextField(editable=False, verbose_name='data')),
+                ('processed_rows_count', models.PositiveIntegerField(default=0, editable=False,
+                                                                     verbose_name='processed rows count')),
+                ('failed_rows_count', models.PositiveIntegerField(default=0, editable=False,
+                                                                  verbose_name='failed rows count')),
+                ('total_rows_count', models.PositiveIntegerField(blank=True, editable=False, null=True,
+                                                                 verbose_name='total rows count')),
+                ('error_report', chamber.models.fields.FileField(
+                    blank=True, null=True,
+                    upload_to=is_core.contrib.background_export.models.generate_error_report_filename,
+                    verbose_name='error report',
+                    storage=import_string(is_core_settings.BACKGROUND_EXPORT_STORAGE_CLASS)()
+                )),
+                ('finished_at', models.DateTimeField(blank=True, editable=False, null=True,
+                                                     verbose_name='finished at')),
+                ('content_type',
+                 models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='contenttypes.ContentType')),
+                ('created_by',
+                 models.ForeignKey(on_delete=django.db.models.deletion.PROTECT,
+                                   related_name='created_bulk_change_jobs', to=settings.AUTH_USER_MODEL,
+                                   verbose_name='created by')),
+            ],
+            options={
+                'verbose_name': 'bulk change job',
+                'verbose_name_plural': 'bulk change jobs',
+                'ordering': ('-created_at',),
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('background_export', '0006_migration'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='exportedfile',
+            name='generated_parts_count',
+        ),
+        migrations.AddField(
+            model_name='exportedfile',
+            name='generated_parts',
+            field=models.JSONField(blank=True, default=list, editable=False, verbose_name='generated parts'),
+        ),
+        migrations.AddField(
+            model_name='exportedfile',
+            name='parts_processed_rows_counts',
+            field=models.JSONField(blank=True, default=dict, editable=False,
+                                   verbose_name='processed rows counts of the parts'),
+        ),
+        migrations.AddField(
+            model_name='exportedfile',
+            name='failed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='failed at'),
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('background_export', '0007_migration'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bulkchangejob',
+            name='failed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='failed at'),
+        ),
+    ]
@@ -1,3 +1,4 @@
+import mimetypes
 import os
 from datetime import timedelta
 from uuid import uuid4 as uuid
@@ -8,8 +9,12 @@ from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
+from django.db.models import F
+from django.db.transaction import atomic
+from django.dispatch import receiver
 from django.shortcuts import resolve_url
 from django.utils import timezone
+from django.utils.encoding import force_text
 from django.utils.html import format_html
 from django.utils.translation import ugettext_lazy as _
 
@@ -19,6 +24,8 @@ from is_core.utils.decorators import short_description
 from chamber.models import SmartModel
 from chamber.models.fields import FileField
 
+from .signals import invalidate_export_cache
+
 
 if 'security' not in settings.INSTALLED_APPS:
     raise ImproperlyConfigured('Missing library security, please install it.')
@@ -28,6 +35,10 @@ def generate_filename(instance, filename):
     return os.path.join('exports', instance.slug, filename)
 
 
+def generate_error_report_filename(instance, filename):
+    return os.path.join('bulk-changes', instance.slug, filename)
+
+
 class ExportedFileManager(models.QuerySet):
 
     def filter_expired(self):
@@ -38,6 +49,11 @@ class ExportedFileManager(models.QuerySet):
     def filter_active(self, *args, **kwargs):
         return self.exclude(file='').filter(*args, **kwargs)
 
+    def invalidate_cache(self, model):
+        return self.filter(
+            content_type=ContentType.objects.get_for_model(model), cache_key__isnull=False
+        ).update(cache_key=None)
+
 
 storage = import_string(is_core_settings.BACKGROUND_EXPORT_STORAGE_CLASS)()
 
@@ -86,6 +102,60 @@ class ExportedFile(SmartModel):
         blank=False,
         on_delete=models.PROTECT,
     )
+    parts_count = models.PositiveIntegerField(
+        verbose_name=_('parts count'),
+        null=True,
+        blank=True,
+        editable=False
+    )
+    generated_parts = models.JSONField(
+        verbose_name=_('generated parts'),
+        null=False,
+        blank=True,
+        default=list,
+        editable=False
+    )
+    parts_processed_rows_counts = models.JSONField(
+        verbose_name=_('processed rows counts of the parts'),
+        null=False,
+        blank=True,
+        default=dict,
+        editable=False
+    )
+    processed_rows_count = models.PositiveIntegerField(
+        verbose_name=_('processed rows count'),
+        null=False,
+        blank=False,
+        default=0,
+        editable=False
+    )
+    total_rows_count = models.PositiveIntegerField(
+        verbose_name=_('total rows count'),
+        null=True,
+        blank=True,
+        editable=False
+    )
+    cache_key = models.CharField(
+        verbose_name=_('cache key'),
+        null=True,
+        blank=True,
+        max_length=64,
+        db_index=True,
+        editable=False
+    )
+    last_pk = models.CharField(
+        verbose_name=_('last exported primary key'),
+        null=True,
+        blank=True,
+        max_length=250,
+        editable=False
+    )
+    failed_at = models.DateTimeField(
+        verbose_name=_('failed at'),
+        null=True,
+        blank=True,
+        editable=False
+    )
 
     @property
     def download_url(self):
@@ -97,8 +167,76 @@ class ExportedFile(SmartModel):
     @short_description(_('download'))
     def download_link(self):
         return (
-            format_html('<a href="{}">{}</a>', self.download_url, os.path.basename(self.file.name))
-            if self.download_url else ''
+            format_html(
+                '<a href="{}" type="{}">{}</a>', self.download_url, self.file_content_type,
+                os.path.basename(self.file.name)
+            ) if self.download_url else ''
+        )
+
+    @property
+    def file_content_type(self):
+        if not self.file:
+            return None
+        content_type, encoding = mimetypes.guess_type(self.file.name)
+        if encoding == 'gzip':
+            return 'application/gzip'
+        else:
+            return content_type or 'application/octet-stream'
+
+    @property
+    def is_finished(self):
+        return bool(self.file)
+
+    @property
+    def is_failed(self):
+        return self.failed_at is not None
+
+    @short_description(_('progress'))
+    def progress(self):
+        if self.is_finished:
+            return 100
+        elif not self.total_rows_count:
+            return None
+        else:
+            return min(100 * self.processed_rows_count // self.total_rows_count, 99)
+
+    def update_progress(self, processed_rows_count, last_pk):
+        # Progress is updated directly in the database because it must be visible during the export
+        ExportedFile.objects.filter(pk=self.pk).update(
+            processed_rows_count=F('processed_rows_count') + processed_rows_count,
+            last_pk=force_text(last_pk),
+            changed_at=timezone.now()
+        )
+
+    def update_part_progress(self, part_index, processed_rows_count, last_pk):
+        """
+        Stores the number of rows generated by the part. The count is set (not incremented), therefore rows
+        generated by the interrupted part task are not lost or counted twice after the part is resumed.
+        """
+        with atomic():
+            exported_file = ExportedFile.objects.select_for_update().get(pk=self.pk)
+            parts_processed_rows_counts = dict(exported_file.parts_processed_rows_counts)
+            parts_processed_rows_counts[str(part_index)] = processed_rows_count
+            ExportedFile.objects.filter(pk=self.pk).update(
+                parts_processed_rows_counts=parts_processed_rows_counts,
+                processed_rows_count=sum(parts_processed_rows_counts.values()),
+                last_pk=force_text(last_pk),
+                changed_at=timezone.now()
+            )
+
+    def start_progress(self, total_rows_count):
+        # Progress is reset because the export can be generated again by the redelivered task
+        ExportedFile.objects.filter(pk=self.pk).update(
+            total_rows_count=total_rows_count,
+            processed_rows_count=0,
+            last_pk=None,
+            changed_at=timezone.now()
+        )
+
+    def mark_failed(self):
+        ExportedFile.objects.filter(pk=self.pk).update(
+            failed_at=timezone.now(),
+            changed_at=timezone.now()
         )
 
     def generate_slug(self):
@@ -122,3 +260,147 @@ class ExportedFile(SmartModel):
         verbose_name = _('exported file')
         verbose_name_plural = _('exported files')
         ordering = ('-created_at',)
+
+
+class BulkChangeJob(SmartModel):
+
+    slug = models.SlugField(
+        verbose_name=_('slug'),
+        null=False,
+        blank=False,
+        primary_key=True,
+        max_length=32,
+        default=generate_slug
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        verbose_name=_('created by'),
+        null=False,
+        blank=False,
+        related_name='created_bulk_change_jobs',
+        on_delete=models.PROTECT,
+    )
+    content_type = models.ForeignKey(
+        ContentType,
+        null=False,
+        blank=False,
+        on_delete=models.PROTECT,
+    )
+    query = models.TextField(
+        verbose_name=_('query'),
+        null=False,
+        blank=False,
+        editable=False
+    )
+    data = models.TextField(
+        verbose_name=_('data'),
+        null=False,
+        blank=False,
+        editable=False
+    )
+    processed_rows_count = models.PositiveIntegerField(
+        verbose_name=_('processed rows count'),
+        null=False,
+        blank=False,
+        default=0,
+        editable=False
+    )
+    failed_rows_count = models.PositiveIntegerField(
+        verbose_name=_('failed rows count'),
+        null=False,
+        blank=False,
+        default=0,
+        editable=False
+    )
+    total_rows_count = models.PositiveIntegerField(
+        verbose_name=_('total rows count'),
+        null=True,
+        blank=True,
+        editable=False
+    )
+    error_report = FileField(
+        verbose_name=_('error report'),
+        null=True,
+        blank=True,
+        upload_to=generate_error_report_filename,
+        max_upload_size=100,
+        storage=storage
+    )
+    finished_at = models.DateTimeField(
+        verbose_name=_('finished at'),
+        null=True,
+        blank=True,
+        editable=False
+    )
+    failed_at = models.DateTimeField(
+        verbose_name=_('failed at'),
+        null=True,
+        blank=True,
+        editable=False
+    )
+
+    @property
+    def error_report_download_url(self):
+        return (
+            resolve_url('pyston-download-bulk-change-error-report', slug=self.slug)
+            if self.error_report else ''
+        )
+
+    @short_description(_('error report'))
+    def error_report_download_link(self):
+        return (
+            format_html(
+                '<a href="{}" type="text/csv">{}</a>', self.error_report_download_url,
+                os.path.basename(self.error_report.name)
+            ) if self.error_report_download_url else ''
+        )
+
+    @property
+    def is_finished(self):
+        return self.finished_at is not None
+
+    @property
+    def is_failed(self):
+        return self.failed_at is not None
+
+    @short_description(_('progress'))
+    def progress(self):
+        if self.is_finished:
+            return 100
+        elif not self.total_rows_count:
+            return None
+        else:
+            return min(100 * self.processed_rows_count // self.total_rows_count, 99)
+
+    def update_progress(self, processed_rows_count, failed_rows_count):
+        # Progress is updated directly in the database because it must be visible during the bulk change
+        BulkChangeJob.objects.filter(pk=self.pk).update(
+            processed_rows_count=F('processed_rows_count') + processed_rows_count,
+            failed_rows_count=F('failed_rows_count') + failed_rows_count,
+            changed_at=timezone.now()
+        )
+
+    def update_total_rows_count(self, total_rows_count):
+        BulkChangeJob.objects.filter(pk=self.pk).update(
+            total_rows_count=total_rows_count,
+            changed_at=timezone.now()
+        )
+
+    def mark_failed(self):
+        BulkChangeJob.objects.filter(pk=self.pk).update(
+            failed_at=timezone.now(),
+            changed_at=timezone.now()
+        )
+
+    def __str__(self):
+        return '#{}'.format(self.pk)
+
+    class Meta:
+        verbose_name = _('bulk change job')
+        verbose_name_plural = _('bulk change jobs')
+        ordering = ('-created_at',)
+
+
+@receiver(invalidate_export_cache)
+def invalidate_export_cache_receiver(sender, **kwargs):
+    ExportedFile.objects.invalidate_cache(sender)
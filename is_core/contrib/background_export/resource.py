@@ -1,15 +1,37 @@
+import hashlib
+import json
+
+from datetime import timedelta
+
+import import_string
+
 from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import EmptyResultSet
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http.response import Http404
 from django.shortcuts import render
-from django.utils import translation
+from django.utils import timezone, translation
 from django.utils.encoding import force_text
 from django.utils.translation import ugettext
 
+from is_core.auth.permissions import PermissionsSet, CoreReadAllowed
 from is_core.rest.resource import CoreResource, DjangoCoreResource
 
+from pyston.converters import GeneratorConverter
+from pyston.response import NoFieldsetResponse
+
+from chamber.shortcuts import get_object_or_none
+
 from django_celery_extensions.task import obj_to_string
 
-from .models import ExportedFile
-from .tasks import background_serialization
+from is_core.config import settings
+
+from .models import BulkChangeJob, ExportedFile
+from .signals import export_success
+from .tasks import (
+    background_bulk_change, background_serialization, background_serialization_split, is_shardable,
+    COMPRESSION_EXTENSIONS
+)
 
 
 class ErrorResponseData(dict):
@@ -19,28 +41,121 @@ class ErrorResponseData(dict):
         self['messages'] = {'error': force_text(msg)}
 
 
-def apply_background_export(user, queryset, rest_context, fieldset, serialization_format, filename):
+def get_permissions_fingerprint(user):
+    if settings.BACKGROUND_EXPORT_CACHE_PERMISSIONS_FINGERPRINT_FUNCTION:
+        return import_string(settings.BACKGROUND_EXPORT_CACHE_PERMISSIONS_FINGERPRINT_FUNCTION)(user)
+    else:
+        # Exported data can depend on any user permission, by default export is shared only with the same user
+        return user.pk
+
+
+def get_export_cache_key(user, queryset, rest_context, fieldset, serialization_format, compression=None):
+    """
+    Returns hash of the export content. Exports with the same query, fieldset, format, language and user
+    permissions fingerprint have the same content. Empty querysets have no SQL, None is returned and the export
+    is not cached.
+    """
+    try:
+        sql, params = queryset.query.get_compiler(using=queryset.db).as_sql()
+    except EmptyResultSet:
+        return None
+    return hashlib.sha256(
+        json.dumps(
+            [
+                queryset.model._meta.label, sql, [force_text(param) for param in params], fieldset,
+                serialization_format, rest_context.get('accept'), translation.get_language(),
+                get_permissions_fingerprint(user), compression
+            ],
+            cls=DjangoJSONEncoder
+        ).encode('utf-8')
+    ).hexdigest()
+
+
+def get_cached_exported_file(cache_key):
+    return ExportedFile.objects.filter_active(
+        cache_key=cache_key,
+        created_at__gte=timezone.now() - timedelta(seconds=settings.BACKGROUND_EXPORT_CACHE_TIMEOUT)
+    ).order_by('-created_at').first()
+
+
+def apply_background_export(user, queryset, rest_context, fieldset, serialization_format, filename,
+                            shards_count=None, compression=None, compression_level=None):
+    cache_key = (
+        get_export_cache_key(user, queryset, rest_context, fieldset, serialization_format, compression)
+        if settings.BACKGROUND_EXPORT_CACHE_TIMEOUT else None
+    )
+    cached_exported_file = get_cached_exported_file(cache_key) if cache_key else None
+    if cached_exported_file:
+        # File with the same content is shared, new exported file is created only for the user. The copy has no
+        # cache key, therefore the freshness window is always counted from the generation of the original export
+        exported_file = ExportedFile(
+            created_by=user,
+            content_type=cached_exported_file.content_type,
+            file=cached_exported_file.file.name,
+            processed_rows_count=cached_exported_file.processed_rows_count,
+            total_rows_count=cached_exported_file.total_rows_count,
+            last_pk=cached_exported_file.last_pk
+        )
+        # Generated file is not validated, upload size restriction is related only with the uploaded files
+        exported_file.save(is_cleaned_pre_save=False)
+        export_success.send(sender=ExportedFile, exported_file=exported_file)
+        return exported_file
+
     exported_file = ExportedFile.objects.create(
         created_by=user,
-        content_type=ContentType.objects.get_for_model(queryset.model)
+        content_type=ContentType.objects.get_for_model(queryset.model),
+        cache_key=cache_key
     )
 
-    background_serialization.apply_async_on_commit(
-        args=(
-            exported_file.pk,
-            rest_context,
-            translation.get_language(),
-            fieldset,
-            serialization_format,
-            filename,
-            obj_to_string(queryset.query),
-        ),
-        related_objects=[exported_file]
-    )
+    if is_shardable(queryset, shards_count):
+        # Shards are computed by the task, parts count is stored to the exported file with the started part tasks.
+        # Not split export is generated by one part task too, interrupted part continues from the last stored row
+        background_serialization_split.apply_async_on_commit(
+            args=(
+                exported_file.pk,
+                rest_context,
+                translation.get_language(),
+                fieldset,
+                serialization_format,
+                filename,
+                obj_to_string(queryset.query),
+                shards_count,
+                compression,
+                compression_level,
+            ),
+            related_objects=[exported_file]
+        )
+    else:
+        background_serialization.apply_async_on_commit(
+            args=(
+                exported_file.pk,
+                rest_context,
+                translation.get_language(),
+                fieldset,
+                serialization_format,
+                filename,
+                obj_to_string(queryset.query),
+                compression,
+                compression_level,
+            ),
+            related_objects=[exported_file]
+        )
+    return exported_file
 
 
 class CeleryResourceMixin:
 
+    background_export_shards_count = None
+
+    def _get_background_export_shards_count(self):
+        # Only the flat file formats (CSV, XLSX, ...) can be generated in parts and merged together
+        if not isinstance(self._get_converter(), GeneratorConverter):
+            return None
+        return (
+            settings.BACKGROUND_EXPORT_SHARDS_COUNT if self.background_export_shards_count is None
+            else self.background_export_shards_count
+        )
+
     def _get_error_response_data(self, message):
         return {
             'messages': {'error': force_text(message)}
@@ -59,14 +174,22 @@ class CeleryResourceMixin:
             force_text(self._get_requested_fieldset(result)),
             self._get_serialization_format(),
             self._get_filename(),
+            shards_count=self._get_background_export_shards_count(),
+            compression=self.core.get_background_export_compression(self.request),
+            compression_level=self.core.get_background_export_compression_level(self.request),
         )
 
     def _get_filename(self):
         parts = super()._get_filename().rsplit(sep='.', maxsplit=1)
-        return (
+        filename = (
             '{}{}.{}'.format(parts[0], '_DUVERNE', parts[1]) if len(parts) == 2
             else '{}{}'.format(super()._get_filename(), '_DUVERNE')
         )
+        compression = (
+            self.core.get_background_export_compression(self.request)
+            if 'background_serialization' in self.request._rest_context else None
+        )
+        return '{}.{}'.format(filename, COMPRESSION_EXTENSIONS[compression]) if compression else filename
 
     def _get_background_serialization_response_data(self, result, http_headers):
         if not self.permission.has_permission('export', self.request, self):
@@ -97,9 +220,115 @@ class CeleryResourceMixin:
         return force_text(obj).replace(' ', '-') if obj else super()._get_name()
 
 
-class CeleryDjangoCoreResource(CeleryResourceMixin, DjangoCoreResource):
+def apply_background_bulk_change(user, queryset, data):
+    bulk_change_job = BulkChangeJob.objects.create(
+        created_by=user,
+        content_type=ContentType.objects.get_for_model(queryset.model),
+        query=obj_to_string(queryset.query),
+        data=json.dumps(data, cls=DjangoJSONEncoder)
+    )
+    background_bulk_change.apply_async_on_commit(
+        args=(bulk_change_job.pk, translation.get_language()),
+        related_objects=[bulk_change_job]
+    )
+    return bulk_change_job
+
+
+class BackgroundBulkChangeResourceMixin:
+
+    # Bulk changes of the resource are always processed in background (if it is enabled by the core)
+    force_background_bulk_change = False
+
+    def _is_background_bulk_change(self):
+        return (
+            (self.force_background_bulk_change or 'background_bulk_change' in self.request._rest_context)
+            and self.core.is_background_bulk_change_enabled(self.request)
+        )
+
+    def _update_bulk_in_background(self):
+        # Objects are changed in chunks by the celery task, therefore the bulk change limit is not applied
+        bulk_change_job = apply_background_bulk_change(
+            self.request.user, self._filter_queryset(self._get_queryset()), self.get_dict_data()
+        )
+        return NoFieldsetResponse(
+            {
+                'messages': {'success': ugettext('Bulk change will be processed in background')},
+                'bulk_change_job': bulk_change_job.pk,
+            },
+            code=202
+        )
+
+    def update_bulk(self):
+        if self._is_background_bulk_change():
+            return self._update_bulk_in_background()
+        else:
+            return super().update_bulk()
+
+    def _get_headers_queryset_context_mapping(self):
+        context_mapping = super()._get_headers_queryset_context_mapping()
+        context_mapping['background_bulk_change'] = ('HTTP_X_BACKGROUND_BULK_CHANGE', '_background_bulk_change')
+        return context_mapping
+
+
+class CeleryDjangoCoreResource(BackgroundBulkChangeResourceMixin, CeleryResourceMixin, DjangoCoreResource):
     pass
 
 
 class CeleryCoreResource(CeleryResourceMixin, CoreResource):
     pass
+
+
+class ExportedFileProgressResource(CoreResource):
+
+    allowed_methods = ('get', 'head', 'options')
+    permission = PermissionsSet(
+        get=CoreReadAllowed(),
+        head=CoreReadAllowed(),
+        options=CoreReadAllowed(),
+    )
+
+    def _get_exported_file(self):
+        exported_file = get_object_or_none(self.core.get_queryset(self.request), pk=self.kwargs.get('pk'))
+        if not exported_file:
+            raise Http404
+        return exported_file
+
+    def get(self):
+        exported_file = self._get_exported_file()
+        return {
+            'processed_rows_count': exported_file.processed_rows_count,
+            'total_rows_count': exported_file.total_rows_count,
+            'last_pk': exported_file.last_pk,
+            'progress': exported_file.progress(),
+            'is_finished': exported_file.is_finished,
+            'is_failed': exported_file.is_failed,
+            'download_url': exported_file.download_url,
+        }
+
+
+class BulkChangeJobProgressResource(CoreResource):
+
+    allowed_methods = ('get', 'head', 'options')
+    permission = PermissionsSet(
+        get=CoreReadAllowed(),
+        head=CoreReadAllowed(),
+        options=CoreReadAllowed(),
+    )
+
+    def _get_bulk_change_job(self):
+        bulk_change_job = get_object_or_none(self.core.get_queryset(self.request), pk=self.kwargs.get('pk'))
+        if not bulk_change_job:
+            raise Http404
+        return bulk_change_job
+
+    def get(self):
+        bulk_change_job = self._get_bulk_change_job()
+        return {
+            'processed_rows_count': bulk_change_job.processed_rows_count,
+            'failed_rows_count': bulk_change_job.failed_rows_count,
+            'total_rows_count': bulk_change_job.total_rows_count,
+            'progress': bulk_change_job.progress(),
+            'is_finished': bulk_change_job.is_finished,
+            'is_failed': bulk_change_job.is_failed,
+            'error_report_download_url': bulk_change_job.error_report_download_url,
+        }
@@ -2,3 +2,6 @@ import django.dispatch
 
 
 export_success = django.dispatch.Signal(providing_args=['exported_file'])
+
+# Cached exports of the model (sender) are not reused after the signal is sent
+invalidate_export_cache = django.dispatch.Signal()
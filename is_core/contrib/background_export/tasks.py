@@ -1,14 +1,26 @@
+import csv
+import gzip
+import io
+import json
+import os
+import zipfile
+
+from contextlib import contextmanager
+
 import import_string
 
 from django.conf import settings as django_settings
 from django.core.files.base import ContentFile
+from django.core.serializers.json import DjangoJSONEncoder
 from django.http.request import HttpRequest
-from django.utils import translation
+from django.utils import timezone, translation
+from django.utils.encoding import force_text
 from django.db.transaction import atomic
 
 from pyston.converters import get_converter_from_request
 from pyston.serializer import get_serializer, get_resource_or_none
 from pyston.utils import RFS
+from pyston.utils.datastructures import FieldsetGenerator
 from pyston.utils.helpers import ModelIterableIteratorHelper
 
 from is_core.config import settings
@@ -18,8 +30,9 @@ from django_celery_extensions.task import string_to_obj
 from security.task import LoggedTask
 
 from celery import shared_task
+from celery.exceptions import SoftTimeLimitExceeded
 
-from .models import ExportedFile
+from .models import BulkChangeJob, ExportedFile
 
 from .signals import export_success
 
@@ -32,67 +45,570 @@ def get_rest_request(user, rest_context):
     return request
 
 
+def get_pk_ordering(queryset):
+    """
+    Returns 'pk' or '-pk' if queryset can be read in the primary key order without changing the result ordering,
+    otherwise None is returned.
+    """
+    ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+    pk_name = queryset.model._meta.pk.name
+    if not queryset.query.can_filter():
+        # Sliced queryset cannot be filtered by the primary key
+        return None
+    elif not ordering:
+        return 'pk'
+    elif len(ordering) == 1 and ordering[0] in {'pk', pk_name, '-pk', '-{}'.format(pk_name)}:
+        return '-pk' if ordering[0].startswith('-') else 'pk'
+    else:
+        return None
+
+
+def is_shardable(queryset, shards_count):
+    return bool(shards_count and get_pk_ordering(queryset))
+
+
+def get_pk_shards(queryset, shards_count, count=None):
+    """
+    Splits queryset to the primary key ranges with the similar number of objects. Ranges are returned in the order
+    of the queryset, range lower bound is inclusive and upper bound is exclusive (None means unbounded). Queryset
+    with less rows than the number of shards is not split (one unbounded range is returned). None is returned if
+    queryset cannot be split without the change of the ordering.
+    """
+    if not is_shardable(queryset, shards_count):
+        return None
+    elif shards_count == 1:
+        return [(None, None)]
+
+    pk_ordering = get_pk_ordering(queryset)
+    pk_queryset = queryset.order_by('pk').values_list('pk', flat=True)
+    count = pk_queryset.count() if count is None else count
+    if count < shards_count:
+        return [(None, None)]
+
+    boundaries = [None] + [pk_queryset[count * i // shards_count] for i in range(1, shards_count)] + [None]
+    pk_shards = list(zip(boundaries[:-1], boundaries[1:]))
+    return pk_shards[::-1] if pk_ordering == '-pk' else pk_shards
+
+
+COMPRESSION_EXTENSIONS = {
+    'gzip': 'gz',
+    'zip': 'zip',
+}
+
+
+@contextmanager
+def compressed_output_stream(output_stream, compression, compression_level, filename):
+    """
+    Wraps output stream of the exported file with the streaming compression. Zip archive contains one entry with
+    the filename without zip extension.
+    """
+    if compression_level is None:
+        compression_level = settings.BACKGROUND_EXPORT_COMPRESSION_LEVEL
+    if compression == 'gzip':
+        with gzip.GzipFile(
+                filename=os.path.basename(filename)[:-len('.gz')], mode='wb', fileobj=output_stream,
+                compresslevel=compression_level) as compressed_stream:
+            yield compressed_stream
+    elif compression == 'zip':
+        with zipfile.ZipFile(
+                output_stream, mode='w', compression=zipfile.ZIP_DEFLATED, compresslevel=compression_level) as archive:
+            entry_name = os.path.basename(filename)[:-len('.zip')]
+            with archive.open(entry_name, mode='w', force_zip64=True) as compressed_stream:
+                yield compressed_stream
+    elif compression is None:
+        yield output_stream
+    else:
+        raise ValueError('Invalid background export compression "{}"'.format(compression))
+
+
+def get_part_name(exported_file, part_index):
+    return os.path.join('exports', exported_file.slug, 'parts', '{}.jsonl'.format(part_index))
+
+
+class ChunkedQuerysetIterable:
+    """
+    Iterates queryset in chunks to keep memory bounded. Querysets ordered by primary key (or without ordering) are
+    read with keyset batches (every chunk is a separate short query filtered by the last primary key). Other
+    querysets keep the requested ordering and are read with server-side cursor.
+    """
+
+    def __init__(self, queryset, chunk_size, on_chunk=None):
+        self.queryset = queryset
+        self.chunk_size = chunk_size
+        self.on_chunk = on_chunk
+        self.last_obj = None
+        self.processed_rows_count = 0
+
+    def _iter_keyset_chunks(self, pk_ordering):
+        last_pk = None
+        while True:
+            chunk_queryset = self.queryset.order_by(pk_ordering)
+            if last_pk is not None:
+                chunk_queryset = chunk_queryset.filter(
+                    **{'pk__lt' if pk_ordering == '-pk' else 'pk__gt': last_pk}
+                )
+            chunk = list(chunk_queryset[:self.chunk_size])
+            if chunk:
+                last_pk = chunk[-1].pk
+                yield chunk
+            if len(chunk) < self.chunk_size:
+                break
+
+    def _iter_cursor_chunks(self):
+        chunk = []
+        for obj in self.queryset.iterator(chunk_size=self.chunk_size):
+            chunk.append(obj)
+            if len(chunk) == self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _iter_chunks(self):
+        pk_ordering = get_pk_ordering(self.queryset)
+        return self._iter_keyset_chunks(pk_ordering) if pk_ordering else self._iter_cursor_chunks()
+
+    def __iter__(self):
+        for chunk in self._iter_chunks():
+            for obj in chunk:
+                self.last_obj = obj
+                yield obj
+            self.processed_rows_count += len(chunk)
+            if self.on_chunk:
+                self.on_chunk(chunk)
+
+
 class FileBackgroundExportGenerator:
 
-    def __init__(self, model):
+    def __init__(self, model, compression=None, compression_level=None):
         self.model = model
+        self.compression = compression
+        self.compression_level = compression_level
 
-    def generate(self, exported_file, request, queryset, requested_fieldset, serialization_format):
-        converter = get_converter_from_request(request)
-        converted_dict = get_serializer(queryset, request=request).serialize(
-            ModelIterableIteratorHelper(queryset, queryset.model),
-            serialization_format, requested_fieldset=requested_fieldset,
+    def _open_output_stream(self, exported_file):
+        django_file = exported_file.file
+        django_file.open('wb')
+        return compressed_output_stream(
+            django_file.file, self.compression, self.compression_level, django_file.name
+        )
+
+    def _get_chunk_size(self):
+        return settings.BACKGROUND_EXPORT_CHUNK_SIZE
+
+    def _on_chunk(self, exported_file, output_stream, chunk):
+        # Serialized rows are flushed to the storage file after every chunk and the progress is stored
+        output_stream.flush()
+        exported_file.update_progress(len(chunk), chunk[-1].pk)
+
+    def _on_part_chunk(self, exported_file, part_index, part_file, part_rows_count, chunk):
+        part_file.flush()
+        exported_file.update_part_progress(part_index, part_rows_count, chunk[-1].pk)
+
+    def _get_objs(self, exported_file, output_stream, queryset):
+        return ChunkedQuerysetIterable(
+            queryset, self._get_chunk_size(),
+            on_chunk=lambda chunk: self._on_chunk(exported_file, output_stream, chunk)
+        )
+
+    def _get_part_objs(self, exported_file, part_index, part_file, queryset, stored_rows_count):
+        objs = ChunkedQuerysetIterable(
+            queryset, self._get_chunk_size(),
+            on_chunk=lambda chunk: self._on_part_chunk(
+                exported_file, part_index, part_file, stored_rows_count + objs.processed_rows_count, chunk
+            )
+        )
+        return objs
+
+    def _serialize(self, converter, request, objs, requested_fieldset, serialization_format):
+        objs_helper = ModelIterableIteratorHelper(objs, self.model)
+        return get_serializer(objs_helper, request=request).serialize(
+            objs_helper, serialization_format, requested_fieldset=requested_fieldset,
             lazy=True, allow_tags=converter.allow_tags
         )
-        django_file = exported_file.file
+
+    def _get_fieldset(self, request, requested_fieldset):
+        return FieldsetGenerator(
+            get_resource_or_none(request, self.model), force_text(requested_fieldset), direct_serialization=False
+        ).generate()
+
+    def generate(self, exported_file, request, queryset, requested_fieldset, serialization_format):
+        converter = get_converter_from_request(request)
+        exported_file.start_progress(queryset.count())
         try:
-            django_file.open('wb')
-            converter.encode_to_stream(
-                django_file.file, converted_dict, resource=get_resource_or_none(request, queryset.model),
-                request=request, requested_fields=requested_fieldset
+            with self._open_output_stream(exported_file) as output_stream:
+                converted_dict = self._serialize(
+                    converter, request, self._get_objs(exported_file, output_stream, queryset), requested_fieldset,
+                    serialization_format
+                )
+                converter.encode_to_stream(
+                    output_stream, converted_dict, resource=get_resource_or_none(request, queryset.model),
+                    request=request, requested_fields=requested_fieldset
+                )
+        finally:
+            exported_file.file.close()
+
+    def _get_part_checkpoint(self, storage, part_name):
+        """
+        Returns primary key of the last stored row, size of the part content with the complete rows and number of
+        the complete rows or None if part was not generated yet.
+        """
+        if not storage.exists(part_name):
+            return None
+
+        last_pk, position, rows_count = None, 0, 0
+        with storage.open(part_name, 'rb') as part_file:
+            for line in part_file:
+                if not line.endswith(b'\n'):
+                    # Incomplete line of the interrupted task
+                    break
+                last_pk = json.loads(line.decode('utf-8'))[0]
+                position += len(line)
+                rows_count += 1
+        return last_pk, position, rows_count
+
+    def generate_part(self, exported_file, part_index, request, queryset, requested_fieldset, serialization_format):
+        """
+        Generates part of the export. Part contains rendered rows (JSON list with primary key and row values per
+        line) without header, the rows are converted to the output format in the merge step. If part was partially
+        generated by the interrupted task, generation continues from the last stored row.
+        """
+        converter = get_converter_from_request(request)
+        storage = exported_file.file.storage
+        part_name = get_part_name(exported_file, part_index)
+        checkpoint = self._get_part_checkpoint(storage, part_name)
+        if checkpoint is None:
+            storage.save(part_name, ContentFile(''))
+            last_pk, position, rows_count = None, 0, 0
+        else:
+            last_pk, position, rows_count = checkpoint
+            if last_pk is not None:
+                queryset = queryset.filter(
+                    **{'pk__lt' if get_pk_ordering(queryset) == '-pk' else 'pk__gt': last_pk}
+                )
+
+        with storage.open(part_name, 'r+b') as part_file:
+            part_file.seek(position)
+            part_file.truncate()
+            objs = self._get_part_objs(exported_file, part_index, part_file, queryset, rows_count)
+            converted_data = self._serialize(converter, request, objs, requested_fieldset, serialization_format)
+            for row in converter._render_content(self._get_fieldset(request, requested_fieldset), converted_data):
+                part_file.write(
+                    json.dumps([objs.last_obj.pk, list(row)], cls=DjangoJSONEncoder).encode('utf-8') + b'\n'
+                )
+            # Final progress contains the rows stored by the interrupted task after its last progress update
+            part_file.flush()
+            exported_file.update_part_progress(
+                part_index, rows_count + objs.processed_rows_count, objs.last_obj.pk if objs.last_obj else last_pk
             )
+
+    def _iter_part_rows(self, storage, part_names):
+        for part_name in part_names:
+            with storage.open(part_name, 'rb') as part_file:
+                for line in part_file:
+                    yield json.loads(line.decode('utf-8'))[1]
+
+    def merge(self, exported_file, request, requested_fieldset):
+        """
+        Joins generated parts to the exported file. Header is written only once and the rows are converted to the
+        output format (CSV, XLSX, ...) with the converter file generator. Parts and merge use the GeneratorConverter
+        internals (headers and rows rendering), therefore pyston minor version is pinned in setup.py.
+        """
+        converter = get_converter_from_request(request)
+        storage = exported_file.file.storage
+        part_names = [get_part_name(exported_file, part_index) for part_index in range(exported_file.parts_count)]
+        try:
+            with self._open_output_stream(exported_file) as output_stream:
+                converter.generator_class().generate(
+                    converter._render_headers(self._get_fieldset(request, requested_fieldset)),
+                    self._iter_part_rows(storage, part_names),
+                    converter._get_output_stream(output_stream)
+                )
         finally:
-            django_file.close()
+            exported_file.file.close()
 
+    def delete_parts(self, exported_file):
+        storage = exported_file.file.storage
+        for part_index in range(exported_file.parts_count):
+            part_name = get_part_name(exported_file, part_index)
+            if storage.exists(part_name):
+                storage.delete(part_name)
 
-class BackgroundSerializationTask(LoggedTask):
+
+class BaseBackgroundSerializationTask(LoggedTask):
+    """
+    Export tasks are acknowledged after the task is finished, therefore the task interrupted by the worker crash is
+    delivered again. If the task fails and it is not retried anymore, the export is marked as failed.
+    """
 
     abstract = True
+    acks_late = True
+    reject_on_worker_lost = True
 
     def get_exported_file(self, pk):
         return ExportedFile.objects.get(pk=pk)
 
+    def on_task_failure(self, task_id, args, kwargs, exc, einfo):
+        super().on_task_failure(task_id, args, kwargs, exc, einfo)
+        self.get_exported_file(args[0]).mark_failed()
+
+
+class BackgroundSerializationTask(BaseBackgroundSerializationTask):
+
+    abstract = True
+
     def on_task_success(self, task_id, args, kwargs, retval):
         super().on_task_success(task_id, args, kwargs, retval)
         exported_file = self.get_exported_file(args[0])
         export_success.send(sender=self.__class__, exported_file=exported_file)
 
 
+@contextmanager
+def background_serialization_context(language):
+    # Must be here, because handlers is not registered
+    import_string(django_settings.ROOT_URLCONF)
+
+    prev_language = translation.get_language()
+    translation.activate(language)
+    try:
+        yield
+    finally:
+        translation.activate(prev_language)
+
+
+def get_background_serialization_request(exported_file, rest_context):
+    request = get_rest_request(exported_file.created_by, rest_context)
+    if settings.BACKGROUND_EXPORT_TASK_UPDATE_REQUEST_FUNCTION:
+        request = import_string(settings.BACKGROUND_EXPORT_TASK_UPDATE_REQUEST_FUNCTION)(request)
+    return request
+
+
+def get_background_serialization_queryset(query):
+    query = string_to_obj(query)
+    queryset = query.model.objects.all()
+    queryset.query = query
+    return queryset
+
+
 @shared_task(base=BackgroundSerializationTask,
              name='background_export.serializer.serialization',
              queue=settings.BACKGROUND_EXPORT_TASK_QUEUE,
              time_limit=settings.BACKGROUND_EXPORT_TASK_TIME_LIMIT,
              soft_time_limit=settings.BACKGROUND_EXPORT_TASK_SOFT_TIME_LIMIT,
              bind=True)
-@atomic
 def background_serialization(self, exported_file_pk, rest_context, language, requested_fieldset, serialization_format,
-                             filename, query):
-    # Must be here, because handlers is not registered
-    import_string(django_settings.ROOT_URLCONF)
-
-    prev_language = translation.get_language()
-    translation.activate(language)
-    try:
+                             filename, query, compression=None, compression_level=None):
+    with background_serialization_context(language):
         exported_file = self.get_exported_file(exported_file_pk)
-        exported_file.file.save(filename, ContentFile(''))
-        request = get_rest_request(exported_file.created_by, rest_context)
-        if settings.BACKGROUND_EXPORT_TASK_UPDATE_REQUEST_FUNCTION:
-            request = import_string(settings.BACKGROUND_EXPORT_TASK_UPDATE_REQUEST_FUNCTION)(request)
-        query = string_to_obj(query)
-        queryset = query.model.objects.all()
-        queryset.query = query
-        FileBackgroundExportGenerator(query.model).generate(
+        # The export is not stored in one long transaction, therefore file is saved to the database (and visible
+        # for the users) only after the whole content is generated
+        exported_file.file.save(filename, ContentFile(''), save=False)
+        request = get_background_serialization_request(exported_file, rest_context)
+        queryset = get_background_serialization_queryset(query)
+        FileBackgroundExportGenerator(queryset.model, compression, compression_level).generate(
             exported_file, request, queryset, RFS.create_from_string(requested_fieldset), serialization_format
         )
-    finally:
-        translation.activate(prev_language)
+        # Generated file is not validated, upload size restriction is related only with the uploaded files
+        exported_file.save(update_only_changed_fields=True, is_cleaned_pre_save=False)
+
+
+class BackgroundSerializationPartTask(BaseBackgroundSerializationTask):
+
+    abstract = True
+
+
+@shared_task(base=BackgroundSerializationPartTask,
+             name='background_export.serializer.serialization_split',
+             queue=settings.BACKGROUND_EXPORT_TASK_QUEUE,
+             time_limit=settings.BACKGROUND_EXPORT_TASK_TIME_LIMIT,
+             soft_time_limit=settings.BACKGROUND_EXPORT_TASK_SOFT_TIME_LIMIT,
+             bind=True)
+def background_serialization_split(self, exported_file_pk, rest_context, language, requested_fieldset,
+                                   serialization_format, filename, query, shards_count, compression=None,
+                                   compression_level=None):
+    """
+    Splits the exported queryset to the primary key shards and starts the part tasks. Shard boundaries require
+    count and offset queries, therefore they are not computed in the HTTP request. If the queryset is smaller than
+    the number of shards, export is generated by one part task.
+    """
+    exported_file = self.get_exported_file(exported_file_pk)
+    if exported_file.parts_count is not None:
+        # Redelivered task, parts were already started
+        return
+
+    queryset = get_background_serialization_queryset(query)
+    total_rows_count = queryset.count()
+    pk_shards = get_pk_shards(queryset, shards_count, count=total_rows_count)
+    with atomic():
+        exported_file.start_progress(total_rows_count)
+        exported_file.change_and_save(parts_count=len(pk_shards), update_only_changed_fields=True)
+        for part_index, (pk_from, pk_to) in enumerate(pk_shards):
+            background_serialization_part.apply_async_on_commit(
+                args=(exported_file_pk, part_index, rest_context, language, requested_fieldset, serialization_format,
+                      filename, query, pk_from, pk_to, compression, compression_level),
+                related_objects=[exported_file]
+            )
+
+
+@shared_task(base=BackgroundSerializationPartTask,
+             name='background_export.serializer.serialization_part',
+             queue=settings.BACKGROUND_EXPORT_TASK_QUEUE,
+             time_limit=settings.BACKGROUND_EXPORT_TASK_TIME_LIMIT,
+             soft_time_limit=settings.BACKGROUND_EXPORT_TASK_SOFT_TIME_LIMIT,
+             bind=True)
+def background_serialization_part(self, exported_file_pk, part_index, rest_context, language, requested_fieldset,
+                                  serialization_format, filename, query, pk_from, pk_to, compression=None,
+                                  compression_level=None):
+    exported_file = self.get_exported_file(exported_file_pk)
+    if part_index in exported_file.generated_parts:
+        # Redelivered task of the generated part, part file can be already merged and removed
+        return
+
+    with background_serialization_context(language):
+        request = get_background_serialization_request(exported_file, rest_context)
+        queryset = get_background_serialization_queryset(query)
+        if pk_from is not None:
+            queryset = queryset.filter(pk__gte=pk_from)
+        if pk_to is not None:
+            queryset = queryset.filter(pk__lt=pk_to)
+        try:
+            FileBackgroundExportGenerator(queryset.model).generate_part(
+                exported_file, part_index, request, queryset, RFS.create_from_string(requested_fieldset),
+                serialization_format
+            )
+        except SoftTimeLimitExceeded:
+            # Task is retried and the part generation continues from the last stored row
+            raise self.retry(countdown=0)
+
+    with atomic():
+        exported_file = ExportedFile.objects.select_for_update().get(pk=exported_file_pk)
+        if part_index not in exported_file.generated_parts:
+            # Generated parts are stored by the index, therefore the redelivered part is not counted twice
+            exported_file.change_and_save(
+                generated_parts=exported_file.generated_parts + [part_index], update_only_changed_fields=True
+            )
+            if len(exported_file.generated_parts) == exported_file.parts_count:
+                # The last generated part starts the merge step
+                background_serialization_merge.apply_async_on_commit(
+                    args=(exported_file_pk, rest_context, language, requested_fieldset, filename, compression,
+                          compression_level),
+                    related_objects=[exported_file]
+                )
+
+
+@shared_task(base=BackgroundSerializationTask,
+             name='background_export.serializer.serialization_merge',
+             queue=settings.BACKGROUND_EXPORT_TASK_QUEUE,
+             time_limit=settings.BACKGROUND_EXPORT_TASK_TIME_LIMIT,
+             soft_time_limit=settings.BACKGROUND_EXPORT_TASK_SOFT_TIME_LIMIT,
+             bind=True)
+def background_serialization_merge(self, exported_file_pk, rest_context, language, requested_fieldset, filename,
+                                   compression=None, compression_level=None):
+    with background_serialization_context(language):
+        exported_file = self.get_exported_file(exported_file_pk)
+        generator = FileBackgroundExportGenerator(
+            exported_file.content_type.model_class(), compression, compression_level
+        )
+        if not exported_file.is_finished:
+            exported_file.file.save(filename, ContentFile(''), save=False)
+            request = get_background_serialization_request(exported_file, rest_context)
+            generator.merge(exported_file, request, RFS.create_from_string(requested_fieldset))
+            exported_file.save(update_only_changed_fields=True, is_cleaned_pre_save=False)
+        # Parts are removed only after the exported file is stored, the redelivered task will not merge them again
+        generator.delete_parts(exported_file)
+
+
+class BackgroundBulkChangeProcessor:
+    """
+    Updates objects of the bulk change job with the core REST resource. Objects are updated in primary key chunks,
+    every chunk is updated in its own transaction and the progress is stored after every chunk.
+    """
+
+    def __init__(self, resource, chunk_size):
+        self.resource = resource
+        self.chunk_size = chunk_size
+
+    def _iter_pk_chunks(self, queryset):
+        pk_queryset = queryset.order_by('pk').values_list('pk', flat=True)
+        last_pk = None
+        while True:
+            chunk_pk_queryset = pk_queryset if last_pk is None else pk_queryset.filter(pk__gt=last_pk)
+            pks = list(chunk_pk_queryset[:self.chunk_size])
+            if pks:
+                last_pk = pks[-1]
+                yield pks
+            if len(pks) < self.chunk_size:
+                break
+
+    def _update_chunk(self, pks, data):
+        with atomic():
+            _, errors = self.resource._update_bulk_queryset(
+                self.resource._get_queryset().filter(pk__in=pks).order_by('pk'), data
+            )
+        return errors
+
+    def process(self, bulk_change_job, queryset, data):
+        """
+        Updates all objects of the queryset and returns errors of the objects which cannot be updated.
+        """
+        bulk_change_job.update_total_rows_count(queryset.count())
+        errors = []
+        for pks in self._iter_pk_chunks(queryset):
+            chunk_errors = self._update_chunk(pks, data)
+            bulk_change_job.update_progress(len(pks), len(chunk_errors))
+            errors += chunk_errors
+        return errors
+
+
+def get_bulk_change_error_report_content(errors):
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(('id', 'object', 'errors'))
+    for error in errors:
+        writer.writerow((
+            error['id'],
+            error['_obj_name'],
+            '; '.join('{}: {}'.format(field_name, message) for field_name, message in error['errors'].items())
+        ))
+    return ContentFile(output.getvalue().encode('utf-8'))
+
+
+class BackgroundBulkChangeTask(LoggedTask):
+
+    abstract = True
+
+    def get_bulk_change_job(self, pk):
+        return BulkChangeJob.objects.get(pk=pk)
+
+    def on_task_failure(self, task_id, args, kwargs, exc, einfo):
+        super().on_task_failure(task_id, args, kwargs, exc, einfo)
+        # Objects changed before the failure (soft time limit or any other exception) stay changed, the job
+        # progress contains the number of the processed objects
+        self.get_bulk_change_job(args[0]).mark_failed()
+
+
+@shared_task(base=BackgroundBulkChangeTask,
+             name='background_export.bulk_change',
+             queue=settings.BACKGROUND_EXPORT_TASK_QUEUE,
+             time_limit=settings.BACKGROUND_EXPORT_TASK_TIME_LIMIT,
+             soft_time_limit=settings.BACKGROUND_EXPORT_TASK_SOFT_TIME_LIMIT,
+             bind=True)
+def background_bulk_change(self, bulk_change_job_pk, language):
+    # Site is imported with the task run because it initializes cores which import this module
+    from is_core.site import get_model_core
+
+    with background_serialization_context(language):
+        bulk_change_job = self.get_bulk_change_job(bulk_change_job_pk)
+        request = get_background_serialization_request(bulk_change_job, {})
+        request.data = json.loads(bulk_change_job.data)
+        queryset = get_background_serialization_queryset(bulk_change_job.query)
+        resource = get_model_core(queryset.model).rest_patterns['api'].get_view(request)
+        errors = BackgroundBulkChangeProcessor(resource, settings.BACKGROUND_BULK_CHANGE_CHUNK_SIZE).process(
+            bulk_change_job, queryset, request.data
+        )
+        if errors:
+            bulk_change_job.error_report.save(
+                'errors.csv', get_bulk_change_error_report_content(errors), save=False
+            )
+        bulk_change_job.finished_at = timezone.now()
+        # Generated file is not validated, upload size restriction is related only with the uploaded files
+        bulk_change_job.save(update_only_changed_fields=True, is_cleaned_pre_save=False)
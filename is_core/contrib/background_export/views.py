@@ -8,7 +8,7 @@ from chamber.shortcuts import get_object_or_404
 from is_core.exceptions import HttpForbiddenResponseException
 from is_core.site import get_model_core
 
-from .models import ExportedFile
+from .models import BulkChangeJob, ExportedFile
 
 
 class DownloadExportedDataView(RedirectView):
@@ -28,11 +28,34 @@ class DownloadExportedDataView(RedirectView):
             raise HttpForbiddenResponseException
 
 
+class DownloadBulkChangeErrorReportView(RedirectView):
+
+    def get_redirect_url(self, *args, **kwargs):
+        bulk_change_job = get_object_or_404(
+            BulkChangeJob.objects.exclude(error_report=''), slug=kwargs.get('slug')
+        )
+        core = get_model_core(BulkChangeJob)
+
+        if (core.permission.has_permission('read_all', self.request, self, obj=bulk_change_job)
+                or (core.permission.has_permission('read_own', self.request, self, obj=bulk_change_job)
+                    and bulk_change_job.created_by.pk == self.request.user.pk)):
+            return bulk_change_job.error_report.url
+        else:
+            raise HttpForbiddenResponseException
+
+
 def static_pyston():
     return [
         url(
             r'^{}/(?P<slug>.+)?/'.format(getattr(settings, 'PYSTON_DOWNLOAD_EXPORT_URL', 'export')),
             login_required(DownloadExportedDataView.as_view()),
             name='pyston-download-export'
-        )
+        ),
+        url(
+            r'^{}/(?P<slug>.+)?/'.format(
+                getattr(settings, 'PYSTON_DOWNLOAD_BULK_CHANGE_ERROR_REPORT_URL', 'bulk-change-error-report')
+            ),
+            login_required(DownloadBulkChangeErrorReportView.as_view()),
+            name='pyston-download-bulk-change-error-report'
+        ),
     ]
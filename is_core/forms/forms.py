@@ -15,6 +15,7 @@ class SmartFormMetaclass(DeclarativeFieldsMetaclass):
 
         base_readonly_fields = set(getattr(new_class, 'base_readonly_fields', ()))
         base_required_fields = set(getattr(new_class, 'base_required_fields', ()))
+        base_callback_readonly_fields = set(getattr(new_class, 'base_callback_readonly_fields', ()))
 
         opts = getattr(new_class, 'Meta', None)
         if opts:
@@ -38,16 +39,22 @@ class SmartFormMetaclass(DeclarativeFieldsMetaclass):
                         attrs['formreadonlyfield_callback'] is not None):
                     new_class.base_fields[field_name] = attrs['formreadonlyfield_callback'](field_name)
                     base_readonly_fields.add(field_name)
+                    base_callback_readonly_fields.add(field_name)
 
         new_class.base_readonly_fields = base_readonly_fields
         new_class.base_required_fields = base_required_fields
+        new_class.base_callback_readonly_fields = base_callback_readonly_fields
         return new_class
 
 
 class SmartFormMixin:
 
+    regenerate_callback_readonly_fields = False
+
     def __init__(self, *args, **kwargs):
         super(SmartFormMixin, self).__init__(*args, **kwargs)
+        if self.regenerate_callback_readonly_fields:
+            self._regenerate_callback_readonly_fields()
         self.readonly_fields = set(self.base_readonly_fields)
         self._pre_init_fields()
         for field_name, field in self.fields.items():
@@ -55,6 +62,12 @@ class SmartFormMixin:
                 getattr(self, '_init_{}'.format(field_name))(field)
         self._init_fields()
 
+    def _regenerate_callback_readonly_fields(self):
+        # Readonly fields of the cached form class are generated again with the callback of the current request
+        for field_name in self.base_callback_readonly_fields:
+            if field_name in self.fields:
+                self.fields[field_name] = self.formreadonlyfield_callback(field_name)
+
     def _pre_init_fields(self):
         for required_field_name in self.base_required_fields:
             if required_field_name in self.fields:
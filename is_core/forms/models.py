@@ -1,14 +1,20 @@
 import warnings
 import itertools
 
+from collections import OrderedDict
+from threading import Lock
+from types import MethodType
+
 from django import forms
 from django.core.exceptions import ImproperlyConfigured
 from django.forms import models
 from django.forms.fields import ChoiceField
 from django.forms.models import ModelForm, _get_foreign_key, BaseModelFormSet
+from django.utils.functional import Promise
 
 from pyston.forms import RestModelForm, RestFormMetaclass
 
+from is_core.config import settings
 from is_core.forms import widgets
 from is_core.utils.models import get_model_field_value
 from is_core.forms.formsets import BaseFormSetMixin, smartformset_factory
@@ -132,6 +138,7 @@ class SmartModelFormMetaclass(RestFormMetaclass):
 
         base_readonly_fields = set(getattr(new_class, 'base_readonly_fields', ()))
         base_required_fields = set(getattr(new_class, 'base_required_fields', ()))
+        base_callback_readonly_fields = set(getattr(new_class, 'base_callback_readonly_fields', ()))
 
         opts = getattr(new_class, 'Meta', None)
         if opts:
@@ -162,9 +169,11 @@ class SmartModelFormMetaclass(RestFormMetaclass):
                         attrs['formreadonlyfield_callback'] is not None):
                     new_class.base_fields[field_name] = attrs['formreadonlyfield_callback'](field_name)
                     base_readonly_fields.add(field_name)
+                    base_callback_readonly_fields.add(field_name)
 
         new_class.base_readonly_fields = base_readonly_fields
         new_class.base_required_fields = base_required_fields
+        new_class.base_callback_readonly_fields = base_callback_readonly_fields
         return new_class
 
 
@@ -283,6 +292,98 @@ def smartmodelform_factory(model, request, form=SmartModelForm, fields=None, rea
     return type(form)(class_name, (form,), form_class_attrs)
 
 
+class FormClassCache:
+    """
+    Bounded LRU cache of the generated form classes. Classes are stored in the process memory because they cannot
+    be stored in the django cache.
+    """
+
+    def __init__(self):
+        self._form_classes = OrderedDict()
+        self._lock = Lock()
+
+    def _get_max_size(self):
+        return settings.FORM_CLASS_CACHE_SIZE
+
+    def get_or_create(self, key, create_form_class):
+        max_size = self._get_max_size()
+        if not max_size or key is None:
+            return create_form_class()
+
+        with self._lock:
+            form_class = self._form_classes.get(key)
+            if form_class is not None:
+                self._form_classes.move_to_end(key)
+                return form_class
+
+        form_class = create_form_class()
+        with self._lock:
+            self._form_classes[key] = form_class
+            while len(self._form_classes) > max_size:
+                self._form_classes.popitem(last=False)
+        return form_class
+
+    def clear(self):
+        with self._lock:
+            self._form_classes.clear()
+
+
+form_class_cache = FormClassCache()
+
+
+def _get_form_class_cache_key_value(value):
+    if isinstance(value, MethodType):
+        # Callbacks are methods of the view or resource which is created for every request
+        return type(value.__self__), value.__func__
+    elif isinstance(value, Promise):
+        return str(value)
+    elif isinstance(value, dict):
+        return frozenset((key, _get_form_class_cache_key_value(val)) for key, val in value.items())
+    elif isinstance(value, (set, frozenset)):
+        return frozenset(_get_form_class_cache_key_value(val) for val in value)
+    elif isinstance(value, (list, tuple)):
+        return tuple(_get_form_class_cache_key_value(val) for val in value)
+    else:
+        return value
+
+
+def get_form_class_cache_key(*args):
+    """
+    Returns form class cache key from the form factory arguments or None if some argument cannot be used as a key.
+    """
+    key = _get_form_class_cache_key_value(args)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def bind_form_class_to_request(form_class, request, formreadonlyfield_callback=None):
+    """
+    Returns subclass of the cached form class with the request specific attributes. Metaclass is not called
+    because the fields were already generated by the cached form class.
+    """
+    return type.__new__(type(form_class), form_class.__name__, (form_class,), {
+        '__module__': form_class.__module__,
+        '_request': request,
+        'formreadonlyfield_callback': staticmethod(formreadonlyfield_callback),
+        'regenerate_callback_readonly_fields': formreadonlyfield_callback is not None,
+    })
+
+
+def get_cached_form_class(cache_key, create_form_class, request, formreadonlyfield_callback=None):
+    """
+    Returns form class from the form class cache. Class is created with function create_form_class if it is not
+    cached or the cache is turned off.
+    """
+    if not settings.FORM_CLASS_CACHE_SIZE or cache_key is None:
+        return create_form_class()
+    return bind_form_class_to_request(
+        form_class_cache.get_or_create(cache_key, create_form_class), request, formreadonlyfield_callback
+    )
+
+
 def smartmodelformset_factory(model, request, form=ModelForm, formfield_callback=None,
                               formset=BaseModelFormSet, extra=1, can_delete=False,
                               can_order=False, max_num=None, fields=None, exclude=None,
@@ -1,6 +1,9 @@
+import hashlib
 import os
 
 from django import forms
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet, ValidationError
 from django.core.validators import EMPTY_VALUES
 from django.db.models.base import Model
 from django.db.models.fields.files import FieldFile
@@ -348,27 +351,111 @@ class DateTimeRangeFilterWidget(FilterDateRangeWidgetMixin, DateTimeRangeWidget)
     pass
 
 
+def get_selectbox_cache():
+    return caches[settings.FOREIGN_KEY_SELECTBOX_CACHE_ALIAS]
+
+
+def _get_selectbox_cache_key(queryset):
+    try:
+        query_string = str(queryset.query)
+    except EmptyResultSet:
+        return None
+    return 'is_core:selectbox_restricted:{}:{}'.format(
+        queryset.model._meta.label_lower,
+        hashlib.md5(
+            '{}:{}'.format(settings.FOREIGN_KEY_MAX_SELECTBOX_ENTRIES, query_string).encode('utf-8')
+        ).hexdigest()
+    )
+
+
+def is_selectbox_queryset_restricted(queryset):
+    """
+    Returns True if queryset contains more objects than can be rendered in the select box. The decision is stored in
+    the cache per related model and query for FOREIGN_KEY_SELECTBOX_CACHE_TIMEOUT seconds.
+    """
+    cache_timeout = settings.FOREIGN_KEY_SELECTBOX_CACHE_TIMEOUT
+    cache_key = _get_selectbox_cache_key(queryset) if cache_timeout else None
+    if cache_key:
+        is_restricted = get_selectbox_cache().get(cache_key)
+        if is_restricted is not None:
+            return is_restricted
+
+    is_restricted = (
+        queryset.values('pk')[:settings.FOREIGN_KEY_MAX_SELECTBOX_ENTRIES + 1].count()
+        > settings.FOREIGN_KEY_MAX_SELECTBOX_ENTRIES
+    )
+    if cache_key:
+        get_selectbox_cache().set(cache_key, is_restricted, cache_timeout)
+    return is_restricted
+
+
 class RestrictedSelectWidgetMixin:
 
     select_class_name = None
     select_placeholder = None
     input_placeholder = None
+    remote_select_class_name = 'remote-select'
+
+    # REST API URL of the related core, choices are loaded with AJAX if it is set
+    remote_url = None
+
+    @property
+    def is_remote(self):
+        return self.remote_url is not None and hasattr(self.choices, 'queryset')
 
     @cached_property
     def is_restricted(self):
         """
         Returns True or False according to number of objects in queryset.
         If queryset contains too much objects the widget will be restricted and won't be used select box with choices.
+        Remote select box is never restricted.
         """
         return (
             not hasattr(self.choices, 'queryset') or
             settings.FOREIGN_KEY_MAX_SELECTBOX_ENTRIES == 0 or
-            self.choices.queryset.values('pk')[:settings.FOREIGN_KEY_MAX_SELECTBOX_ENTRIES + 1].count()
-            > settings.FOREIGN_KEY_MAX_SELECTBOX_ENTRIES
+            (not self.is_remote and is_selectbox_queryset_restricted(self.choices.queryset))
         )
 
+    def _get_remote_choices(self, value):
+        choices = self.choices.get_static_choices() if hasattr(self.choices, 'get_static_choices') else [('', '')]
+        static_values = {str(k) for k, _ in choices}
+        values = [
+            v for v in (value if isinstance(value, (list, tuple)) else [value])
+            if v not in EMPTY_VALUES and str(v) not in static_values
+        ]
+        if values:
+            try:
+                choices += [self.choices.choice(obj) for obj in self.choices.queryset.filter(pk__in=values)]
+            except (ValueError, ValidationError):
+                pass
+        return choices
+
+    def _render_remote(self, name, value, attrs=None, renderer=None):
+        """
+        Only selected choices are rendered, other choices are searched in the related core REST resource.
+        """
+        attrs = add_class_name(dict(attrs or {}), self.remote_select_class_name)
+        attrs.update({
+            'data-resource': self.remote_url,
+            'data-token-name': '_search',
+            'data-limit': settings.FOREIGN_KEY_REMOTE_SELECT_LIMIT,
+            'data-token-min-length': settings.FOREIGN_KEY_REMOTE_SELECT_MIN_LENGTH,
+        })
+        choices = self.choices
+        self.choices = self._get_remote_choices(value)
+        try:
+            return format_html(
+                '<input type="text" class="{}-search" placeholder="{}" />{}',
+                self.remote_select_class_name, self.select_placeholder or '',
+                super().render(name, value, attrs, renderer)
+            )
+        finally:
+            self.choices = choices
+
     def render(self, name, value, attrs=None, renderer=None):
-        if self.is_restricted:
+        if self.is_remote:
+            return self._render_remote(name, value, attrs, renderer)
+        elif self.is_restricted:
             if value is None:
                 value = ''
             final_attrs = self.build_attrs(self.attrs, attrs, type='text', name=name)
@@ -60,6 +60,13 @@ class PermissionsViewMixin:
     def _has_permission(self, name, obj=None):
         return self.permission.has_permission(name, self.request, self, obj)
 
+    def is_permission_obj_independent(self, name):
+        """
+        Returns True if the permission with the given name is not related with the object and can be evaluated only
+        once for more objects.
+        """
+        return self.permission._is_obj_independent(name, self.request, self)
+
     def _check_permission(self, name, obj=None):
         """
         If customer is not authorized he should not get information that object is exists.
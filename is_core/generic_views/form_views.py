@@ -21,7 +21,7 @@ from is_core.utils import (
 from is_core.generic_views.mixins import ListParentMixin
 from is_core.generic_views.inlines.inline_form_views import InlineFormView
 from is_core.response import JsonHttpResponse
-from is_core.forms.models import smartmodelform_factory
+from is_core.forms.models import smartmodelform_factory, get_cached_form_class, get_form_class_cache_key
 from is_core.forms.fields import SmartReadonlyField
 from is_core.forms import SmartModelForm
 
@@ -283,6 +283,7 @@ class DjangoBaseFormView(FieldPermissionViewMixin, BaseFormView):
     inline_views = None
     form_template = 'is_core/forms/model_default_form.html'
     show_buttons = True
+    cache_form_class = True
 
     def _get_field_labels(self):
         return self.field_labels
@@ -365,17 +366,35 @@ class DjangoBaseFormView(FieldPermissionViewMixin, BaseFormView):
     def get_is_bulk(self):
         return False
 
+    def _is_form_class_cacheable(self):
+        # Overridden formfield_for_dbfield can generate the form fields by the request (for example the queryset
+        # restricted by the user), therefore its form classes cannot be shared
+        return (
+            self.cache_form_class and type(self).formfield_for_dbfield is DjangoBaseFormView.formfield_for_dbfield
+        )
+
     def generate_form_class(self, fields=None, readonly_fields=()):
         form_class = self.get_form_class_base()
         exclude = list(self.get_exclude())
         if hasattr(form_class, '_meta') and form_class._meta.exclude:
             exclude.extend(form_class._meta.exclude)
-        return smartmodelform_factory(self.model, self.request, form=form_class, exclude=exclude, fields=fields,
-                                      formfield_callback=self.formfield_for_dbfield,
-                                      readonly_fields=readonly_fields,
-                                      formreadonlyfield_callback=self.formfield_for_readonlyfield,
-                                      readonly=self.is_readonly(),
-                                      labels=self._get_field_labels(), is_bulk=self.get_is_bulk())
+        readonly = self.is_readonly()
+        labels = self._get_field_labels()
+        is_bulk = self.get_is_bulk()
+        cache_key = get_form_class_cache_key(
+            self.model, form_class, exclude, fields, readonly_fields, readonly, labels, is_bulk,
+            self.formfield_for_dbfield, self.formfield_for_readonlyfield
+        ) if self._is_form_class_cacheable() else None
+        return get_cached_form_class(
+            cache_key,
+            lambda: smartmodelform_factory(self.model, self.request, form=form_class, exclude=exclude, fields=fields,
+                                           formfield_callback=self.formfield_for_dbfield,
+                                           readonly_fields=readonly_fields,
+                                           formreadonlyfield_callback=self.formfield_for_readonlyfield,
+                                           readonly=readonly, labels=labels, is_bulk=is_bulk),
+            self.request,
+            formreadonlyfield_callback=self.formfield_for_readonlyfield
+        )
 
     def update_form_initial(self, form):
         # Only new instance can get data from request queryset
@@ -483,6 +502,7 @@ class DjangoBaseFormView(FieldPermissionViewMixin, BaseFormView):
         obj = form.save(commit=False)
         change = obj.pk is not None
 
+        self._invalidate_field_permissions_cache(obj)
         self.pre_save_obj(obj, form, change)
 
         for inline_form_view in pre_save_inline_form_views:
@@ -495,6 +515,7 @@ class DjangoBaseFormView(FieldPermissionViewMixin, BaseFormView):
         for inline_form_view in post_save_inline_form_views:
             inline_form_view.form_valid(self.request)
 
+        self._invalidate_field_permissions_cache(obj)
         self.post_save_obj(obj, form, change)
         return obj
 
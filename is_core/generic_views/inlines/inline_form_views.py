@@ -99,7 +99,8 @@ class InlineFormView(GetMethodFieldMixin, RelatedInlineView):
                 list(self.get_form_class().base_fields.keys())
                 + list(self.get_formset_factory().form.base_fields.keys())
             )
-        return [field for field in fields if field not in self._get_disallowed_fields_from_permissions()]
+        disallowed_fields = self._get_disallowed_fields_from_permissions()
+        return [field for field in fields if field not in disallowed_fields]
 
     def get_fields(self):
         return self.fields
@@ -2,7 +2,9 @@ from django.db.models import Model
 from django.views.generic.base import TemplateView
 from django.utils.translation import gettext_lazy as _
 
-from is_core.utils import display_object_data, display_for_value, GetMethodFieldMixin
+from is_core.utils import (
+    display_object_data, display_objects_data, display_for_value, display_for_values, GetMethodFieldMixin
+)
 from is_core.generic_views.base import DefaultCoreViewMixin
 
 
@@ -43,17 +45,33 @@ class ObjectsViewMixin(GetMethodFieldMixin):
         raise NotImplementedError
 
     def get_data_list(self, fields, objects):
-        out = []
-        for obj in objects:
-            normalized_obj = self.parse_object(obj)
-            out.append(DataRow([(field_name, self.get_data_object(field_name, normalized_obj))
-                                for field_name, _ in self.get_fields()],
-                               self.get_obj_class_names(obj)))
-        return out
+        objects = list(objects)
+        normalized_objects = [self.parse_object(obj) for obj in objects]
+        field_names = [field_name for field_name, _ in self.get_fields()]
+        columns = [self.get_column_data(field_name, normalized_objects) for field_name in field_names]
+        rows_values = list(zip(*columns)) if columns else [()] * len(objects)
+        return [
+            DataRow(list(zip(field_names, row_values)), self.get_obj_class_names(obj))
+            for obj, row_values in zip(objects, rows_values)
+        ]
 
     def get_obj_class_names(self, obj):
         return list(self.obj_class_names)
 
+    def get_column_data(self, field_name, objects):
+        """
+        Returns displayed values of one column. Values of model objects and dictionaries are rendered together.
+        """
+        if type(self).get_data_object is not ObjectsViewMixin.get_data_object:
+            # Custom object rendering must be used for every object
+            return [self.get_data_object(field_name, obj) for obj in objects]
+        elif all(isinstance(obj, Model) for obj in objects):
+            return display_objects_data(objects, field_name, request=self.request, view=self)
+        elif all(isinstance(obj, dict) for obj in objects):
+            return display_for_values([obj.get(field_name) for obj in objects], request=self.request)
+        else:
+            return [self.get_data_object(field_name, obj) for obj in objects]
+
     def get_data_object(self, field_name, obj):
         if isinstance(obj, Model):
             return display_object_data(obj, field_name, request=self.request, view=self)
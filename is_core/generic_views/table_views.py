@@ -1,6 +1,18 @@
+import hashlib
+import json
+
+from uuid import uuid4
+
+import import_string
+
 from django import forms
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models.signals import post_delete, post_save
 from django.views.generic.base import TemplateView
 from django.urls import reverse
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
 
 from is_core.auth.views import FieldPermissionViewMixin
 from is_core.config import settings
@@ -10,6 +22,7 @@ from is_core.rest.datastructures import ModelFlatRestFields, ModelRestFieldset
 from is_core.utils import (
     pretty_class_name, get_export_types_with_content_type, LOOKUP_SEP, get_field_label_from_path
 )
+from is_core.utils.field_api import GetFieldDescriptorException, get_field_descriptors_from_path
 
 from chamber.utils.http import query_string_from_dict
 
@@ -20,6 +33,70 @@ from pyston.order.exceptions import OrderIdentifierError
 from pyston.serializer import get_resource_or_none
 
 
+def get_table_header_cache():
+    return caches[settings.TABLE_HEADER_CACHE_ALIAS]
+
+
+def get_table_header_cache_version_key(model):
+    return 'is_core:table_header_version:{}'.format(model._meta.label_lower)
+
+
+def invalidate_table_header_cache(sender, **kwargs):
+    """
+    Cached table headers which render choices of the model are invalidated with the change of the model version.
+    """
+    get_table_header_cache().set(get_table_header_cache_version_key(sender), uuid4().hex, None)
+
+
+def get_table_header_cache_permissions_fingerprint(user):
+    if settings.TABLE_HEADER_CACHE_PERMISSIONS_FINGERPRINT_FUNCTION:
+        return import_string(settings.TABLE_HEADER_CACHE_PERMISSIONS_FINGERPRINT_FUNCTION)(user)
+    else:
+        # Fields and filters can depend on any user permission, by default headers are shared only with the same user
+        return user.pk if user is not None else None
+
+
+def get_table_header_cache_path_models(model, field_path):
+    """
+    Returns the related models along the field path (for example "leader__solving_issue__name").
+    """
+    try:
+        field_descriptors = get_field_descriptors_from_path(model, field_path)
+    except GetFieldDescriptorException:
+        return set()
+    return {
+        field_descriptor.model_field_or_method.related_model for field_descriptor in field_descriptors
+        if getattr(field_descriptor.model_field_or_method, 'related_model', None) is not None
+    }
+
+
+def get_table_header_cache_models(model, field_paths=()):
+    """
+    Returns the model, its related models and the related models along the field paths which choices can be rendered
+    in the table filters.
+    """
+    header_cache_models = {model} | {
+        field.related_model for field in model._meta.get_fields()
+        if field.is_relation and field.related_model is not None
+    }
+    for field_path in field_paths:
+        header_cache_models |= get_table_header_cache_path_models(model, field_path)
+    return header_cache_models
+
+
+def connect_table_header_cache_invalidation(model, field_paths=()):
+    """
+    Cached table headers are invalidated after every save or delete of the model, its related models or the related
+    models along the field paths. Function is called with the core initialization (with the core list fields) to
+    connect signals in every process.
+    """
+    if settings.TABLE_HEADER_CACHE_TIMEOUT:
+        for header_cache_model in get_table_header_cache_models(model, field_paths):
+            dispatch_uid = 'is_core_table_header_cache_{}'.format(header_cache_model._meta.label_lower)
+            post_save.connect(invalidate_table_header_cache, sender=header_cache_model, dispatch_uid=dispatch_uid)
+            post_delete.connect(invalidate_table_header_cache, sender=header_cache_model, dispatch_uid=dispatch_uid)
+
+
 class Header:
 
     def __init__(self, field_name, text, order_by, filter_html=''):
@@ -48,6 +125,7 @@ class BaseModelTableViewMixin(FieldPermissionViewMixin):
     render_actions = True
     enable_column_manager = settings.COLUMN_MANAGER
     field_labels = None
+    header_cache_timeout = None
 
     title = None
     list_verbose_name = None
@@ -68,19 +146,16 @@ class BaseModelTableViewMixin(FieldPermissionViewMixin):
         return self.model_name
 
     def _get_allowed_fields(self):
-        return [
-            field for field in self._get_fields() if field not in self._get_disallowed_fields_from_permissions()
-        ]
+        disallowed_fields = self._get_disallowed_fields_from_permissions()
+        return [field for field in self._get_fields() if field not in disallowed_fields]
 
     def _get_allowed_extra_fields(self):
-        return [
-            field for field in self._get_extra_fields() if field not in self._get_disallowed_fields_from_permissions()
-        ]
+        disallowed_fields = self._get_disallowed_fields_from_permissions()
+        return [field for field in self._get_extra_fields() if field not in disallowed_fields]
 
     def _get_allowed_export_fields(self):
-        return [
-            field for field in self._get_export_fields() if field not in self._get_disallowed_fields_from_permissions()
-        ]
+        disallowed_fields = self._get_disallowed_fields_from_permissions()
+        return [field for field in self._get_export_fields() if field not in disallowed_fields]
 
     def _get_field_filter_widget(self, filter_obj, full_field_name, field):
         return forms.TextInput()
@@ -185,13 +260,59 @@ class BaseModelTableViewMixin(FieldPermissionViewMixin):
             self.model
         )
 
+    def _get_header_field_names(self):
+        return [
+            field[0] if isinstance(field, (tuple, list)) else field for field in self._get_allowed_fields()
+        ]
+
+    def _get_header_cache_timeout(self):
+        return (
+            settings.TABLE_HEADER_CACHE_TIMEOUT if self.header_cache_timeout is None else self.header_cache_timeout
+        )
+
+    def _get_header_cache_key(self, field_names):
+        header_cache_models = get_table_header_cache_models(self.model, field_names)
+        # Fields of the view can differ from the core list fields, signals are connected only once for every model
+        connect_table_header_cache_invalidation(self.model, field_names)
+        version_keys = sorted(get_table_header_cache_version_key(model) for model in header_cache_models)
+        versions = get_table_header_cache().get_many(version_keys)
+        return 'is_core:table_header:{}'.format(
+            hashlib.md5(json.dumps(
+                (
+                    '{}.{}'.format(self.__class__.__module__, self.__class__.__qualname__),
+                    get_language(),
+                    get_table_header_cache_permissions_fingerprint(getattr(self.request, 'user', None)),
+                    field_names,
+                    [versions.get(version_key) for version_key in version_keys],
+                ),
+                cls=DjangoJSONEncoder
+            ).encode('utf-8')).hexdigest()
+        )
+
     def _get_headers(self):
-        headers = []
-        for field in self._get_allowed_fields():
-            if isinstance(field, (tuple, list)):
-                headers.append(self._get_header(field[0]))
-            else:
-                headers.append(self._get_header(field))
+        """
+        Rendered headers (labels, ordering and filters) are stored in the cache for header_cache_timeout seconds.
+        """
+        field_names = self._get_header_field_names()
+        header_cache_timeout = self._get_header_cache_timeout()
+        if not header_cache_timeout:
+            return [self._get_header(field_name) for field_name in field_names]
+
+        cache = get_table_header_cache()
+        cache_key = self._get_header_cache_key(field_names)
+        cached_headers = cache.get(cache_key)
+        if cached_headers is not None:
+            return [
+                Header(field_name, text, order_by, mark_safe(filter_html))
+                for field_name, text, order_by, filter_html in cached_headers
+            ]
+
+        headers = [self._get_header(field_name) for field_name in field_names]
+        cache.set(
+            cache_key,
+            [(header.field_name, str(header.text), header.order_by, str(header.filter)) for header in headers],
+            header_cache_timeout
+        )
         return headers
 
     def _get_api_url(self):
@@ -354,6 +475,7 @@ class BaseModelTableView(DefaultModelCoreViewMixin, BaseModelTableViewMixin, Tem
             'enable_bulk_change': self.is_bulk_change_enabled(),
             'bulk_change_snippet_name': self.get_bulk_change_snippet_name(),
             'bulk_change_form_url': self.get_bulk_change_form_url(),
+            'bulk_change_api_url': self.get_bulk_change_api_url(),
         })
         if self._get_export_types() and self._get_allowed_export_fields():
             context_data.update({
@@ -371,6 +493,9 @@ class BaseModelTableView(DefaultModelCoreViewMixin, BaseModelTableViewMixin, Tem
             if self.is_bulk_change_enabled() else None
         )
 
+    def get_bulk_change_api_url(self):
+        return self.core.get_bulk_change_api_url(self.request) if self.is_bulk_change_enabled() else None
+
     def _get_menu_group_pattern_name(self):
         return self.core.get_menu_group_pattern_name()
 
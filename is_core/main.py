@@ -2,25 +2,30 @@
 Core of django-is-core.
 Contains controller added between model and UI/REST.
 """
+import logging
 import sys
 
 from copy import deepcopy
 
 from collections import OrderedDict
+from types import MappingProxyType
 
+from django.core.exceptions import FieldDoesNotExist
 from django.utils.translation import ugettext_lazy as _
 from django.utils.functional import cached_property
 from django.urls import reverse
 
 import import_string
 
+from pyston.utils import rfs
+
 from is_core.auth.permissions import FieldsSetPermission
 from is_core.config import settings
 from is_core.actions import WebAction, ConfirmRestAction
 from is_core.generic_views.form_views import BulkChangeFormView
 from is_core.generic_views.detail_views import DjangoDetailFormView
 from is_core.generic_views.add_views import DjangoAddFormView
-from is_core.generic_views.table_views import DjangoTableView
+from is_core.generic_views.table_views import DjangoTableView, connect_table_header_cache_invalidation
 from is_core.rest.resource import DjangoCoreResource
 from is_core.rest.paginators import DjangoOffsetBasedPaginator
 from is_core.patterns import UiPattern, RestPattern, DoubleRestPattern
@@ -29,11 +34,14 @@ from is_core.menu import LinkMenuItem
 from is_core.loading import register_core
 from is_core.rest.factory import modelrest_factory
 from is_core.forms.models import SmartModelForm
-from is_core.utils.decorators import short_description
+from is_core.utils.decorators import short_description, depends_on
 
 from .auth.permissions import PermissionsSet, IsAdminUser
 
 
+logger = logging.getLogger('is-core')
+
+
 class CoreBase(type):
     """Metaclass for IS core classes. Its main purpose is automatic registration cores to your application."""
 
@@ -480,6 +488,7 @@ class ModelUiCore(ModelCore, UiCore):
         return self.ui_patterns.get('add').get_url_string(request) if 'add' in self.ui_patterns else None
 
     @short_description(_('object name'))
+    @depends_on('__str__')
     def _obj_name(self, obj):
         return str(obj)
 
@@ -493,6 +502,12 @@ class DjangoUiCore(DjangoCore, ModelUiCore):
     ui_detail_view = DjangoDetailFormView
     ui_list_view = DjangoTableView
 
+    def __init__(self, site_name, menu_parent_groups):
+        super().__init__(site_name, menu_parent_groups)
+        connect_table_header_cache_invalidation(self.model, [
+            field[0] if isinstance(field, (tuple, list)) else field for field in self.list_fields or ()
+        ])
+
 
 class ModelRestCore(RestCore, ModelCore):
     """
@@ -523,6 +538,72 @@ class ModelRestCore(RestCore, ModelCore):
     rest_field_labels = None
     rest_paginator = None
 
+    # REST fields which are precomputed to the registry if their getters are not overridden
+    rest_field_registry_names = (
+        'fields', 'extra_fields', 'detailed_fields', 'general_fields', 'guest_fields', 'default_fields',
+        'filter_fields', 'extra_filter_fields', 'order_fields', 'extra_order_fields'
+    )
+    # Other core methods used by the REST fields getters (the getter "get_rest_<name>" is used always)
+    rest_field_registry_dependencies = {}
+    # REST fields which paths are validated with the registry initialization
+    rest_field_registry_validated_names = (
+        'fields', 'extra_fields', 'detailed_fields', 'general_fields', 'guest_fields', 'default_fields'
+    )
+    rest_field_registry = None
+
+    def _is_default_core_method(self, method_name):
+        # Method is default if it is not overridden in the core class hierarchy above the nearest is_core core class
+        default_core_class = next(
+            core_class for core_class in type(self).__mro__ if core_class in DEFAULT_CORE_CLASSES
+        )
+        return getattr(type(self), method_name) is getattr(default_core_class, method_name)
+
+    def _is_rest_field_getter_static(self, name):
+        return all(
+            self._is_default_core_method(method_name)
+            for method_name in ['get_rest_{}'.format(name)] + list(self.rest_field_registry_dependencies.get(name, ()))
+        )
+
+    def _freeze_rest_fields(self, fields):
+        return tuple(OrderedDict.fromkeys(fields)) if isinstance(fields, (list, tuple)) else fields
+
+    def _is_valid_rest_field_name(self, field_name):
+        return True
+
+    def _validate_rest_field_registry(self, rest_field_registry):
+        invalid_field_names = set()
+        for name in self.rest_field_registry_validated_names:
+            fields = rest_field_registry.get(name)
+            if fields:
+                invalid_field_names |= {
+                    field_name for field_name in rfs(fields).flat() if not self._is_valid_rest_field_name(field_name)
+                }
+        if invalid_field_names:
+            # Fields can be resolved by the views or the serializers, therefore unknown fields are only reported
+            logger.warning('Core "%s" contains unknown REST fields: %s',
+                           self.__class__.__name__, ', '.join(sorted(invalid_field_names)))
+
+    def init_rest_field_registry(self):
+        """
+        Precomputes the REST fields which do not depend on the request (their getters are not overridden) and
+        validates their names. Request-time code only subtracts the fields disallowed by the permissions.
+        """
+        rest_field_registry = {
+            name: self._freeze_rest_fields(getattr(self, 'get_rest_{}'.format(name))(None))
+            for name in self.rest_field_registry_names if self._is_rest_field_getter_static(name)
+        }
+        self._validate_rest_field_registry(rest_field_registry)
+        self.rest_field_registry = MappingProxyType(rest_field_registry)
+
+    def get_registered_rest_fields(self, name, request, **kwargs):
+        """
+        Returns REST fields from the registry or from the getter "get_rest_<name>" if fields are not registered.
+        """
+        if self.rest_field_registry is not None and name in self.rest_field_registry:
+            fields = self.rest_field_registry[name]
+            return list(fields) if isinstance(fields, tuple) else fields
+        return getattr(self, 'get_rest_{}'.format(name))(request, **kwargs)
+
     def get_rest_allowed_methods(self):
         rest_allowed_methods = ['options']
         if self.can_read:
@@ -614,22 +695,54 @@ class ModelRestCore(RestCore, ModelCore):
                                                   class_name='delete', success_text=_('Record "%s" was deleted') % obj))
         return list_actions
 
-    # Resource extra fields
-
-    def _rest_links(self, obj, request):
-        rest_links = {}
+    def get_rest_links_for_objs(self, request, objs):
+        rest_links = {obj.pk: {} for obj in objs}
         for pattern in self.rest_patterns.values():
             if pattern.send_in_rest:
-                url = pattern.get_url_string(request, obj=obj)
-                if url:
-                    allowed_methods = pattern.get_allowed_methods(request, obj)
+                urls = pattern.get_url_strings(request, objs)
+                objs_with_url = [obj for obj in objs if urls[obj.pk]]
+                for pk, allowed_methods in pattern.get_allowed_methods_for_objs(request, objs_with_url).items():
                     if allowed_methods:
-                        rest_links[pattern.name] = {
-                            'url': url,
+                        rest_links[pk][pattern.name] = {
+                            'url': urls[pk],
                             'methods': [method.upper() for method in allowed_methods]
                         }
         return rest_links
 
+    def get_batch_rest_extra_fields(self):
+        """
+        Returns extra fields which values can be generated for the whole page of objects at once. Value is
+        a method which gets request and list of objects and returns dict of values (key is object primary key).
+        """
+        return {
+            '_rest_links': self.get_rest_links_for_objs,
+        }
+
+    def _get_preloaded_rest_extra_fields(self, request):
+        if not hasattr(request, '_preloaded_rest_extra_fields'):
+            request._preloaded_rest_extra_fields = {}
+        return request._preloaded_rest_extra_fields.setdefault(self, {})
+
+    def preload_rest_extra_fields(self, request, objs, fields):
+        """
+        Generates values of the batch extra fields for the page of objects before serialization.
+        """
+        preloaded_rest_extra_fields = self._get_preloaded_rest_extra_fields(request)
+        for field_name, get_values in self.get_batch_rest_extra_fields().items():
+            if field_name in fields:
+                preloaded_rest_extra_fields[field_name] = get_values(request, objs)
+
+    def _get_batch_rest_extra_field_value(self, request, field_name, obj):
+        preloaded_values = self._get_preloaded_rest_extra_fields(request).get(field_name, {})
+        if obj.pk in preloaded_values:
+            return preloaded_values[obj.pk]
+        return self.get_batch_rest_extra_fields()[field_name](request, [obj])[obj.pk]
+
+    # Resource extra fields
+
+    def _rest_links(self, obj, request):
+        return self._get_batch_rest_extra_field_value(request, '_rest_links', obj)
+
     def _actions(self, obj, request):
         return self.get_list_actions(request, obj)
 
@@ -647,6 +760,44 @@ class DjangoRestCore(ModelRestCore, DjangoCore):
 
     rest_resource_class = DjangoCoreResource
     rest_paginator = DjangoOffsetBasedPaginator()
+    rest_auto_preload = None
+    rest_auto_defer = None
+    rest_search_fields = None
+    rest_fast_bulk_update = None
+
+    def __init__(self, site_name, menu_parent_groups):
+        super().__init__(site_name, menu_parent_groups)
+        if isinstance(self.rest_paginator, DjangoOffsetBasedPaginator):
+            self.rest_paginator.connect_count_cache_invalidation(self.model)
+
+    def is_rest_auto_preload_enabled(self, request):
+        return settings.REST_AUTO_PRELOAD if self.rest_auto_preload is None else self.rest_auto_preload
+
+    def is_rest_auto_defer_enabled(self, request):
+        return settings.REST_AUTO_DEFER if self.rest_auto_defer is None else self.rest_auto_defer
+
+    def is_rest_fast_bulk_update_enabled(self, request):
+        return settings.REST_FAST_BULK_UPDATE if self.rest_fast_bulk_update is None else self.rest_fast_bulk_update
+
+    def has_custom_save_model(self):
+        return not self._is_default_core_method('save_model')
+
+    def has_save_model_hooks(self):
+        return not (
+            self._is_default_core_method('pre_save_model') and self._is_default_core_method('post_save_model')
+        )
+
+    def get_rest_search_fields(self, request):
+        return () if self.rest_search_fields is None else self.rest_search_fields
+
+    def _is_valid_rest_field_name(self, field_name):
+        if any(hasattr(owner, field_name) for owner in (self.model, self, self.rest_resource_class)):
+            return True
+        try:
+            self.model._meta.get_field(field_name)
+            return True
+        except FieldDoesNotExist:
+            return False
 
     def get_rest_general_fields(self, request, obj=None):
         return list(
@@ -701,6 +852,10 @@ class ModelUiRestCore(UiRestCoreMixin, ModelRestCore, ModelUiCore):
 
     rest_obj_class_names = ()
 
+    rest_field_registry_dependencies = {
+        'extra_fields': ('get_list_fields', 'get_export_fields', 'get_fields', 'get_fieldsets'),
+    }
+
     def get_rest_extra_fields(self, request, obj=None):
         return (
             super().get_rest_extra_fields(request, obj) +
@@ -731,17 +886,28 @@ class ModelUiRestCore(UiRestCoreMixin, ModelRestCore, ModelUiCore):
     def get_rest_obj_class_names(self, request, obj):
         return list(self.rest_obj_class_names)
 
-    # Resource extra fields
-
-    def _web_links(self, obj, request):
-        web_links = {}
+    def get_web_links_for_objs(self, request, objs):
+        web_links = {obj.pk: {} for obj in objs}
         for pattern in self.web_link_patterns(request):
             if pattern.send_in_rest:
-                url = pattern.get_url_string(request, obj=obj)
-                if url and pattern.has_permission('get', request, obj=obj):
-                    web_links[pattern.name] = url
+                urls = pattern.get_url_strings(request, objs)
+                objs_with_url = [obj for obj in objs if urls[obj.pk]]
+                for pk, has_permission in pattern.has_permission_for_objs('get', request, objs_with_url).items():
+                    if has_permission:
+                        web_links[pk][pattern.name] = urls[pk]
         return web_links
 
+    def get_batch_rest_extra_fields(self):
+        return {
+            **super().get_batch_rest_extra_fields(),
+            '_web_links': self.get_web_links_for_objs,
+        }
+
+    # Resource extra fields
+
+    def _web_links(self, obj, request):
+        return self._get_batch_rest_extra_field_value(request, '_web_links', obj)
+
     def _class_names(self, obj, request):
         return self.get_rest_obj_class_names(request, obj)
 
@@ -779,3 +945,12 @@ class DjangoUiRestCore(DjangoRestCore, DjangoUiCore, ModelUiRestCore):
 
     def get_bulk_change_fields(self, request):
         return self.bulk_change_fields
+
+    def get_bulk_change_api_url(self, request):
+        return self.get_api_url(request)
+
+
+DEFAULT_CORE_CLASSES = (
+    Core, ModelCore, DjangoCore, UiCore, RestCore, UiRestCore, HomeUiCore, ModelUiCore, DjangoUiCore, ModelRestCore,
+    DjangoRestCore, ModelUiRestCore, DjangoUiRestCore
+)
@@ -1,4 +1,38 @@
+import hashlib
+import json
+
 from copy import deepcopy
+from uuid import uuid4
+
+import import_string
+
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.translation import get_language
+
+from is_core.config import settings
+
+
+MENU_CACHE_VERSION_KEY = 'is_core:menu_version'
+
+
+def get_menu_cache():
+    return caches[settings.MENU_CACHE_ALIAS]
+
+
+def invalidate_menu_cache():
+    """
+    All cached menus are invalidated with the change of the menu cache version (for example after permissions change).
+    """
+    get_menu_cache().set(MENU_CACHE_VERSION_KEY, uuid4().hex, None)
+
+
+def get_menu_cache_permissions_fingerprint(user):
+    if settings.MENU_CACHE_PERMISSIONS_FINGERPRINT_FUNCTION:
+        return import_string(settings.MENU_CACHE_PERMISSIONS_FINGERPRINT_FUNCTION)(user)
+    else:
+        # Menu items can depend on any user permission, by default menu is shared only with the same user
+        return user.pk if user is not None else None
 
 
 class MenuItem:
@@ -63,7 +97,54 @@ class MenuGenerator:
             else:
                 menu_item = self.get_menu_item(item, group)
                 if menu_item:
+                    menu_item.core_name = item
                     yield menu_item
 
+    def _get_menu_cache_key(self):
+        return 'is_core:menu:{}'.format(
+            hashlib.md5(json.dumps(
+                (
+                    '{}.{}'.format(self.__class__.__module__, self.__class__.__qualname__),
+                    self.site.name,
+                    get_language(),
+                    get_menu_cache_permissions_fingerprint(getattr(self.request, 'user', None)),
+                    get_menu_cache().get(MENU_CACHE_VERSION_KEY),
+                ),
+                cls=DjangoJSONEncoder
+            ).encode('utf-8')).hexdigest()
+        )
+
+    def _activate_menu_items(self, menu_items, active_group):
+        for menu_item in menu_items:
+            core = self.get_core(getattr(menu_item, 'core_name', None))
+            if core:
+                menu_item.active = core.is_active_menu_item(self.request, active_group)
+            if menu_item.submenu_items:
+                self._activate_menu_items(menu_item.submenu_items, active_group)
+
+    def get_cached_menu_items(self, items):
+        """
+        Menu items are computed once per site, language and user permissions fingerprint and stored in the cache for
+        MENU_CACHE_TIMEOUT seconds. Only active flags of the core menu items are set with every request.
+        """
+        menu_cache_timeout = settings.MENU_CACHE_TIMEOUT
+        if not menu_cache_timeout:
+            return list(self.get_menu_items(items))
+
+        cache = get_menu_cache()
+        cache_key = self._get_menu_cache_key()
+        menu_items = cache.get(cache_key)
+        if menu_items is None:
+            active_groups = self.active_groups
+            self.active_groups = None
+            try:
+                menu_items = list(self.get_menu_items(items))
+            finally:
+                self.active_groups = active_groups
+            cache.set(cache_key, menu_items, menu_cache_timeout)
+
+        self._activate_menu_items(menu_items, self.active_groups[0] if self.active_groups else None)
+        return menu_items
+
     def get_menu_structure(self):
         return self.site._registry.keys()
@@ -1,10 +1,18 @@
 import logging
+import re
 
 from collections import OrderedDict
+from contextlib import contextmanager
+from urllib.parse import quote
 
+from django.conf import settings as django_settings
 from django.conf.urls import url
-from django.urls import reverse, resolve
+from django.core.exceptions import ImproperlyConfigured
+from django.urls import reverse, resolve, get_script_prefix, get_urlconf, NoReverseMatch
+from django.utils.http import RFC3986_SUBDELIMS
+from django.utils.translation import get_language
 
+from is_core.config import settings
 from is_core.utils import get_new_class_name, PK_PATTERN, NUMBER_PK_PATTERN
 
 
@@ -12,6 +20,12 @@ logger = logging.getLogger('is-core')
 
 patterns = {}
 
+URL_GROUP_RE = re.compile(r'\(\?P<(\w+)>([^()]+)\)')
+# Only kwargs with these regexes are substituted to the compiled URL templates, other patterns use reverse
+SIMPLE_URL_GROUP_REGEXES = {r'[^/]+', r'\d+'}
+# Placeholder must match all simple URL group regexes
+URL_KWARG_PLACEHOLDER = '98765432109876543210'
+
 
 def reverse_ui_view(name, request):
     pattern = patterns.get(name)
@@ -57,6 +71,7 @@ class ViewPattern(Pattern):
         self.site_name = site_name
         self.core = core
         self.url_prefix = self.get_url_prefix()
+        self._url_templates = {}
 
     def get_url_prefix(self):
         if self.core:
@@ -66,31 +81,112 @@ class ViewPattern(Pattern):
     def pattern(self):
         return '%s:%s' % (self.site_name, self.name)
 
+    def _has_pk_in_url_pattern(self):
+        return PK_PATTERN in self.url_pattern or NUMBER_PK_PATTERN in self.url_pattern
+
     def _get_try_kwargs(self, request, obj):
-        if obj and (PK_PATTERN in self.url_pattern or NUMBER_PK_PATTERN in self.url_pattern):
+        if obj and self._has_pk_in_url_pattern():
             return {'pk': obj.pk}
         return {}
 
+    def _compile_url_template(self, kwarg_names):
+        """
+        Compiles URL of the pattern to the format string. Pattern URL is reversed with placeholders of the kwargs and
+        placeholders are replaced with the format fields. None is returned for the patterns which kwargs cannot be
+        simply substituted.
+        """
+        url_regex = self._get_url_regex()
+        url_groups = dict(URL_GROUP_RE.findall(url_regex))
+        if (set(url_groups) != set(kwarg_names) or url_regex.count('(') != len(url_groups)
+                or any(group_regex not in SIMPLE_URL_GROUP_REGEXES for group_regex in url_groups.values())):
+            return None
+
+        placeholders = {
+            name: '{}{:03d}'.format(URL_KWARG_PLACEHOLDER, i) for i, name in enumerate(sorted(kwarg_names))
+        }
+        try:
+            url_string = reverse(self.pattern, kwargs=placeholders)
+        except NoReverseMatch:
+            return None
+
+        url_format = url_string.replace('{', '{{').replace('}', '}}')
+        for name, placeholder in placeholders.items():
+            if url_format.count(placeholder) != 1:
+                return None
+            url_format = url_format.replace(placeholder, '{%s}' % name)
+        return url_format, {name: re.compile(group_regex) for name, group_regex in url_groups.items()}
+
+    def _get_url_template(self, kwarg_names):
+        # URL depends on the script prefix, active language (i18n patterns) and the current URL conf
+        key = (get_script_prefix(), get_language(), get_urlconf(), django_settings.ROOT_URLCONF, kwarg_names)
+        try:
+            return self._url_templates[key]
+        except KeyError:
+            url_template = self._url_templates[key] = self._compile_url_template(kwarg_names)
+            return url_template
+
+    def _format_url_template(self, kwargs):
+        if not settings.COMPILED_URL_TEMPLATES:
+            return None
+
+        url_template = self._get_url_template(frozenset(kwargs))
+        if url_template is None:
+            return None
+
+        url_format, group_regexes = url_template
+        url_kwargs = {}
+        for name, value in kwargs.items():
+            value = str(value)
+            if not group_regexes[name].fullmatch(value):
+                return None
+            url_kwargs[name] = quote(value, safe=RFC3986_SUBDELIMS + '/~:@')
+        return url_format.format_map(url_kwargs)
+
     def get_url_string(self, request, obj=None, view_kwargs=None):
         view_kwargs = {} if view_kwargs is None else view_kwargs
         try_kwargs = self._get_try_kwargs(request, obj)
         try_kwargs.update(view_kwargs)
-        return reverse(self.pattern, kwargs=try_kwargs)
+        url_string = self._format_url_template(try_kwargs)
+        if url_string is None:
+            return reverse(self.pattern, kwargs=try_kwargs)
+        elif settings.COMPILED_URL_TEMPLATES_VERIFY:
+            reversed_url_string = reverse(self.pattern, kwargs=try_kwargs)
+            if url_string != reversed_url_string:
+                raise ImproperlyConfigured(
+                    'URL template of pattern "{}" returned "{}" but reverse returned "{}"'.format(
+                        self.name, url_string, reversed_url_string
+                    )
+                )
+        return url_string
+
+    def get_url_strings(self, request, objs, view_kwargs=None):
+        """
+        Returns dict of URL strings of the pattern for all objects (key is object primary key).
+        """
+        view_kwargs = {} if view_kwargs is None else view_kwargs
+        objs = list(objs)
+        if not self._has_pk_in_url_pattern() or 'pk' in view_kwargs:
+            url_string = self.get_url_string(request, view_kwargs=view_kwargs) if objs else None
+            return {obj.pk: url_string for obj in objs}
+        return {obj.pk: self.get_url_string(request, obj=obj, view_kwargs=view_kwargs) for obj in objs}
 
-    def get_view_dispatch(self):
+    def get_view_dispatch(self, lazy=None):
         raise NotImplementedError
 
     def get_view(self, request, args=None, kwargs=None):
         raise NotImplementedError
 
-    def get_url(self):
+    def _get_url_regex(self):
         url_pattern = self.url_pattern
         if self.url_prefix:
             url_pattern = self.url_pattern
             if url_pattern.startswith('^'):
                 url_pattern = url_pattern[1:]
             url_pattern = '%s/%s' % (self.url_prefix, url_pattern)
-        return url('^%s$' % url_pattern, self.get_view_dispatch(), name=self.name)
+        return '^%s$' % url_pattern
+
+    def get_url(self):
+        return url(self._get_url_regex(), self.get_view_dispatch(), name=self.name)
 
     def _get_called_permission_kwargs(self, request, obj):
         kwargs = {}
@@ -98,11 +194,9 @@ class ViewPattern(Pattern):
             kwargs['obj'] = obj
         return kwargs
 
-    def _call_view_method_with_request(self, method_name, request, request_kwargs=None,
-                                       method_args=None, method_kwargs=None, obj=None):
+    @contextmanager
+    def _get_view_with_request(self, request, request_kwargs=None, obj=None):
         request_kwargs = request_kwargs if request_kwargs is not None else {}
-        method_args = method_args if method_args is not None else ()
-        method_kwargs = method_kwargs if method_kwargs is not None else {}
 
         bckp_request_kwargs = request.kwargs
 
@@ -111,11 +205,20 @@ class ViewPattern(Pattern):
             try_request_kwargs = self._get_try_kwargs(request, obj)
             try_request_kwargs.update(request_kwargs)
             request.kwargs = try_request_kwargs
-            view = self.get_view(request, None, try_request_kwargs)
-            result = getattr(view, method_name)(*method_args, **method_kwargs)
+            yield self.get_view(request, None, try_request_kwargs)
         finally:
             request.kwargs = bckp_request_kwargs
-        return result
+
+    def _call_view_method_with_request(self, method_name, request, request_kwargs=None,
+                                       method_args=None, method_kwargs=None, obj=None):
+        method_args = method_args if method_args is not None else ()
+        method_kwargs = method_kwargs if method_kwargs is not None else {}
+
+        with self._get_view_with_request(request, request_kwargs, obj) as view:
+            return getattr(view, method_name)(*method_args, **method_kwargs)
+
+    def _is_permission_obj_independent(self, view, name):
+        return hasattr(view, 'is_permission_obj_independent') and view.is_permission_obj_independent(name)
 
     def has_permission(self, name, request, obj=None, view_kwargs=None):
         method_kwargs = self._get_called_permission_kwargs(request, obj)
@@ -125,14 +228,68 @@ class ViewPattern(Pattern):
             method_args=(name,), method_kwargs=method_kwargs, obj=obj
         )
 
+    def has_permission_for_objs(self, name, request, objs, view_kwargs=None):
+        """
+        Returns dict of permission decisions for all objects (key is object primary key). If the permission is not
+        related with the object, it is evaluated only once with one view instance.
+        """
+        objs = list(objs)
+        if not objs:
+            return {}
+
+        with self._get_view_with_request(request, view_kwargs, objs[0]) as view:
+            if self._is_permission_obj_independent(view, name):
+                result = view.has_permission(name, **self._get_called_permission_kwargs(request, objs[0]))
+                return {obj.pk: result for obj in objs}
+
+        return {obj.pk: self.has_permission(name, request, obj=obj, view_kwargs=view_kwargs) for obj in objs}
+
+
+class LazyViewDispatch:
+    """
+    View dispatch function of the pattern which view class is created with the first dispatch (or the first access
+    to the dispatch function attributes, e.g. csrf_exempt).
+    """
+
+    def __init__(self, pattern):
+        self._view_dispatch = None
+        self.pattern = pattern
+        self.__module__ = pattern.__class__.__module__
+        self.__name__ = self.__qualname__ = '{}.{}'.format(pattern.__class__.__qualname__, pattern.name)
+
+    def _get_view_dispatch(self):
+        if self._view_dispatch is None:
+            self._view_dispatch = self.pattern.get_view_dispatch(lazy=False)
+        return self._view_dispatch
+
+    def __call__(self, *args, **kwargs):
+        return self._get_view_dispatch()(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._get_view_dispatch(), name)
+
 
 class UiPattern(ViewPattern):
 
     def __init__(self, name, site_name, url_pattern, view_class, core=None):
         super().__init__(name, site_name, url_pattern, core)
-        self.view_class = type(str(get_new_class_name(name, view_class)), (view_class,), {})
-        if core:
-            self.view_class.__init_core__(core, self)
+        self._base_view_class = view_class
+        self._view_class = None
+        if not settings.LAZY_PATTERNS:
+            self._init_view_class()
+
+    def _init_view_class(self):
+        if self._view_class is None:
+            self._view_class = type(
+                str(get_new_class_name(self.name, self._base_view_class)), (self._base_view_class,), {}
+            )
+            if self.core:
+                self._view_class.__init_core__(self.core, self)
+        return self._view_class
+
+    @property
+    def view_class(self):
+        return self._init_view_class()
 
     def get_view(self, request, args=None, kwargs=None):
         view = self.view_class()
@@ -143,21 +300,38 @@ class UiPattern(ViewPattern):
         view.request = request
         return view
 
-    def get_view_dispatch(self):
-        return self.view_class.as_view()
+    def get_view_dispatch(self, lazy=None):
+        lazy = settings.LAZY_PATTERNS and self._view_class is None if lazy is None else lazy
+        return LazyViewDispatch(self) if lazy else self.view_class.as_view()
 
 
 class RestPattern(ViewPattern):
 
     def __init__(self, name, site_name, url_pattern, resource_class, core=None, methods=None, clone_view_class=True):
         super(RestPattern, self).__init__(name, site_name, url_pattern, core)
-        if clone_view_class:
-            self.resource_class = type(str(get_new_class_name(name, resource_class)), (resource_class,), {})
-        else:
-            self.resource_class = resource_class
+        self._base_resource_class = resource_class
+        self._resource_class = None
+        self.clone_view_class = clone_view_class
         self.methods = methods
-        if core:
-            self.resource_class.__init_core__(core, self)
+        # Not cloned resource class can be shared with the serializers, therefore it must be initialized immediately
+        if not settings.LAZY_PATTERNS or not clone_view_class:
+            self._init_resource_class()
+
+    def _init_resource_class(self):
+        if self._resource_class is None:
+            if self.clone_view_class:
+                self._resource_class = type(
+                    str(get_new_class_name(self.name, self._base_resource_class)), (self._base_resource_class,), {}
+                )
+            else:
+                self._resource_class = self._base_resource_class
+            if self.core:
+                self._resource_class.__init_core__(self.core, self)
+        return self._resource_class
+
+    @property
+    def resource_class(self):
+        return self._init_resource_class()
 
     def get_url_prefix(self):
         url_prefix = super(RestPattern, self).get_url_prefix()
@@ -172,8 +346,9 @@ class RestPattern(ViewPattern):
             view.kwargs = kwargs
         return view
 
-    def get_view_dispatch(self):
-        return self.resource_class.as_view(allowed_methods=self.methods)
+    def get_view_dispatch(self, lazy=None):
+        lazy = settings.LAZY_PATTERNS and self._resource_class is None if lazy is None else lazy
+        return LazyViewDispatch(self) if lazy else self.resource_class.as_view(allowed_methods=self.methods)
 
     def get_allowed_methods(self, request, obj):
         return self._call_view_method_with_request(
@@ -182,6 +357,45 @@ class RestPattern(ViewPattern):
             obj=obj
         )
 
+    def get_allowed_methods_for_objs(self, request, objs):
+        """
+        Returns dict of allowed methods for all objects (key is object primary key). Methods which permissions are
+        not related with the object are checked only once, the other methods are checked for every object.
+        """
+        objs = list(objs)
+        if not objs:
+            return {}
+
+        with self._get_view_with_request(request, obj=objs[0]) as view:
+            tested_methods = view.get_allowed_methods()
+            if self.methods is not None:
+                tested_methods = tested_methods.intersection(self.methods)
+            tested_methods = list(tested_methods)
+            obj_independent_methods = {
+                method for method in tested_methods if self._is_permission_obj_independent(view, method)
+            }
+            obj_dependent_methods = set(tested_methods) - obj_independent_methods
+            allowed_obj_independent_methods = (
+                set(view.check_permissions_and_get_allowed_methods(
+                    restricted_methods=obj_independent_methods, obj=objs[0]
+                )) if obj_independent_methods else set()
+            )
+
+        allowed_methods = {}
+        for obj in objs:
+            allowed_obj_dependent_methods = set(
+                self._call_view_method_with_request(
+                    'check_permissions_and_get_allowed_methods', request,
+                    method_kwargs={'restricted_methods': obj_dependent_methods, 'obj': obj},
+                    obj=obj
+                )
+            ) if obj_dependent_methods else set()
+            allowed_methods[obj.pk] = [
+                method for method in tested_methods
+                if method in allowed_obj_independent_methods or method in allowed_obj_dependent_methods
+            ]
+        return allowed_methods
+
 
 class HiddenPatternMixin:
     send_in_rest = False
@@ -9,6 +9,7 @@ from pyston.filters.django_filters import (
     DateFieldFilter, ManyToManyFieldFilter, ForeignKeyFieldFilter, ForeignObjectRelFilter
 )
 
+from is_core.config import settings
 from is_core.forms.widgets import DateRangeFilterWidget, DateTimeRangeFilterWidget, RestrictedSelectWidget
 
 
@@ -22,11 +23,17 @@ class FilterChoiceIterator:
         self.choices = choices
         self.field = field
 
-    def __iter__(self):
-        yield ('', '')
-
+    def get_static_choices(self):
+        """
+        Returns choices which do not depend on the choices data (blank value and "None" value).
+        """
+        static_choices = [('', '')]
         if self.field and (self.field.null or self.field.blank):
-            yield ('__none__', NONE_LABEL)
+            static_choices.append(('__none__', NONE_LABEL))
+        return static_choices
+
+    def __iter__(self):
+        yield from self.get_static_choices()
 
         for k, v in self.choices:
             if k is not None and k != '':
@@ -83,15 +90,36 @@ class RelatedUIFilter(UIFilterMixin):
     Helper for all filters of related field.
     """
 
-    def _update_widget_choices(self, widget):
+    def _get_remote_url(self, request):
+        """
+        Returns REST API URL of the related model core which is used to search choices or None if choices should be
+        rendered inside the page. Remote choices are used only if the related core defines REST search fields and the
+        user can read its REST resource.
+        """
+        from is_core.site import get_model_core
+
+        if not settings.FOREIGN_KEY_REMOTE_SELECT or request is None:
+            return None
+
+        related_core = get_model_core(self.field.related_model)
+        api_pattern = getattr(related_core, 'rest_patterns', {}).get('api')
+        if (api_pattern and hasattr(related_core, 'get_rest_search_fields')
+                and related_core.get_rest_search_fields(request) and api_pattern.has_permission('get', request)):
+            return api_pattern.get_url_string(request)
+        else:
+            return None
+
+    def _update_widget_choices(self, widget, request=None):
         """
         Updates widget choices with special choice iterator that removes blank values and adds none value to clear
         filter data.
         :param widget: widget with choices
+        :param request: HTTP request used to decide if choices are loaded from related core REST resource
         :return: updated widget with filter choices
         """
 
         widget.choices = FilterChoiceIterator(widget.choices, self.field)
+        widget.remote_url = self._get_remote_url(request)
         return widget
 
     def get_operator(self, widget):
@@ -111,7 +139,7 @@ class UIForeignKeyFieldFilter(RelatedUIFilter, ForeignKeyFieldFilter):
         Field widget is replaced with "RestrictedSelectWidget" because we not want to use modified widgets for
         filtering.
         """
-        return self._update_widget_choices(self.field.formfield(widget=RestrictedSelectWidget).widget)
+        return self._update_widget_choices(self.field.formfield(widget=RestrictedSelectWidget).widget, request)
 
 
 class UIManyToManyFieldFilter(RelatedUIFilter, ManyToManyFieldFilter):
@@ -121,7 +149,7 @@ class UIManyToManyFieldFilter(RelatedUIFilter, ManyToManyFieldFilter):
         Field widget is replaced with "RestrictedSelectWidget" because "MultipleChoiceField" is not optional for
         filtering purposes.
         """
-        return self._update_widget_choices(self.field.formfield(widget=RestrictedSelectWidget).widget)
+        return self._update_widget_choices(self.field.formfield(widget=RestrictedSelectWidget).widget, request)
 
 
 class UIForeignObjectRelFilter(RelatedUIFilter, ForeignObjectRelFilter):
@@ -136,7 +164,8 @@ class UIForeignObjectRelFilter(RelatedUIFilter, ForeignObjectRelFilter):
         return self._update_widget_choices(
             forms.ModelChoiceField(
                 widget=RestrictedSelectWidget, queryset=self.field.related_model._default_manager.all()
-            ).widget
+            ).widget,
+            request
         )
 
 
@@ -1,18 +1,383 @@
+import hashlib
+import json
+
+from functools import reduce
+from operator import or_
+from uuid import uuid4
+
+import import_string
+
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet, ObjectDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import F, Model, Q
+from django.db.models.expressions import OrderBy
+from django.db.models.signals import post_delete, post_save
+from django.utils.encoding import force_text
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+from django.utils.translation import ugettext
+
+from pyston.exception import RestException
 from pyston.paginator import DjangoOffsetBasedPaginator as OriginDjangoOffsetBasedPaginator
 from pyston.paginator import DjangoCursorBasedPaginator as OriginDjangoCursorBasedPaginator
+from pyston.paginator import CursorBasedModelIterableIteratorHelper as OriginCursorBasedModelIterableIteratorHelper
+from pyston.response import HeadersResponse
+from pyston.utils import LOOKUP_SEP
+
+from is_core.config import settings
+
+
+COUNT_STRATEGY_EXACT = 'exact'
+COUNT_STRATEGY_CAPPED = 'capped'
+COUNT_STRATEGY_ESTIMATE = 'estimate'
+
+COUNT_STRATEGIES = (COUNT_STRATEGY_EXACT, COUNT_STRATEGY_CAPPED, COUNT_STRATEGY_ESTIMATE)
+
+CURSOR_NEXT = 'next'
+CURSOR_PREV = 'prev'
+
+
+def get_count_cache():
+    return caches[settings.REST_PAGINATOR_COUNT_CACHE_ALIAS]
+
+
+def get_count_cache_version_key(model):
+    return 'is_core:count_version:{}'.format(model._meta.label_lower)
+
+
+def invalidate_count_cache(sender, **kwargs):
+    """
+    Cached counts of the model are invalidated with the change of the model count cache version.
+    """
+    get_count_cache().set(get_count_cache_version_key(sender), uuid4().hex, None)
+
+
+def get_count_cache_models(model):
+    """
+    Returns the model and its related models which can be used in the filters or annotations of the counted queryset.
+    """
+    return {model} | {
+        field.related_model for field in model._meta.get_fields()
+        if field.is_relation and field.related_model is not None
+    }
+
+
+def get_count_cache_permissions_fingerprint(user):
+    if settings.REST_PAGINATOR_COUNT_CACHE_PERMISSIONS_FINGERPRINT_FUNCTION:
+        return import_string(settings.REST_PAGINATOR_COUNT_CACHE_PERMISSIONS_FINGERPRINT_FUNCTION)(user)
+    else:
+        # Queryset can depend on any user permission, by default count is shared only with the same user
+        return user.pk if user is not None else None
 
 
 class DjangoOffsetBasedPaginator(OriginDjangoOffsetBasedPaginator):
+    """
+    Offset based paginator which returns total count only if it was requested with the X-Request-Count header.
+    The total can be computed with several count strategies:
+     * exact - full count of the queryset
+     * capped - count limited with the max total value
+     * estimate - PostgreSQL planner estimate, capped count is used for small results or another database engines
+    The strategy which produced the total is returned in the X-Total-Strategy header.
+    Totals can be stored in the cache for count_cache_timeout seconds, the first page always computes a fresh total.
+    """
 
     type = 'offset-based-paginator'
 
-    def _get_total(self, qs, request):
-        if request._rest_context.get('request_count', False):
-            return super()._get_total(qs, request)
+    def __init__(self, *args, count_strategy=None, max_total=None, count_cache_timeout=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        assert count_strategy is None or count_strategy in COUNT_STRATEGIES, 'Invalid count strategy'
+        self.count_strategy = count_strategy
+        self.max_total = max_total
+        self.count_cache_timeout = count_cache_timeout
+
+    def _get_count_cache_timeout(self):
+        return (
+            settings.REST_PAGINATOR_COUNT_CACHE_TIMEOUT if self.count_cache_timeout is None
+            else self.count_cache_timeout
+        )
+
+    def connect_count_cache_invalidation(self, model):
+        """
+        Cached counts of the model are invalidated after every save or delete of the model or its related models.
+        Method is called with the core initialization to connect signals in every process.
+        """
+        if self._get_count_cache_timeout():
+            for count_cache_model in get_count_cache_models(model):
+                dispatch_uid = 'is_core_count_cache_{}'.format(count_cache_model._meta.label_lower)
+                post_save.connect(invalidate_count_cache, sender=count_cache_model, dispatch_uid=dispatch_uid)
+                post_delete.connect(invalidate_count_cache, sender=count_cache_model, dispatch_uid=dispatch_uid)
+
+    def disconnect_count_cache_invalidation(self, model):
+        for count_cache_model in get_count_cache_models(model):
+            dispatch_uid = 'is_core_count_cache_{}'.format(count_cache_model._meta.label_lower)
+            post_save.disconnect(sender=count_cache_model, dispatch_uid=dispatch_uid)
+            post_delete.disconnect(sender=count_cache_model, dispatch_uid=dispatch_uid)
+
+    def _get_count_strategy(self, qs, request):
+        return self.count_strategy or settings.REST_PAGINATOR_COUNT_STRATEGY
+
+    def _get_max_total(self, qs, request):
+        return settings.REST_PAGINATOR_MAX_TOTAL if self.max_total is None else self.max_total
+
+    def _get_exact_total(self, qs, request):
+        return qs.count(), COUNT_STRATEGY_EXACT
+
+    def _get_capped_total(self, qs, request):
+        max_total = self._get_max_total(qs, request)
+        # Count is computed from the subquery limited with the max total value
+        total = qs.order_by()[:max_total].count()
+        return total, COUNT_STRATEGY_CAPPED if total >= max_total else COUNT_STRATEGY_EXACT
+
+    def _is_unfiltered_queryset(self, qs):
+        query = qs.query
+        return not query.where and not query.distinct and query.low_mark == 0 and query.high_mark is None
+
+    def _get_table_estimate(self, qs):
+        connection = connections[qs.db]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [connection.ops.quote_name(qs.model._meta.db_table)]
+            )
+            row = cursor.fetchone()
+        # Table which was not analyzed yet has reltuples -1 (or 0 in the older PostgreSQL versions)
+        return row[0] if row and row[0] > 0 else None
+
+    def _get_planner_estimate(self, qs):
+        sql, params = qs.order_by().query.sql_with_params()
+        with connections[qs.db].cursor() as cursor:
+            cursor.execute('EXPLAIN (FORMAT JSON) {}'.format(sql), params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    def _get_estimated_total(self, qs, request):
+        if connections[qs.db].vendor != 'postgresql':
+            return self._get_capped_total(qs, request)
+
+        total = self._get_table_estimate(qs) if self._is_unfiltered_queryset(qs) else None
+        if total is None:
+            total = self._get_planner_estimate(qs)
+
+        if total < self._get_max_total(qs, request):
+            # Small results are counted, the count is cheap and estimate can be very inaccurate
+            return self._get_capped_total(qs, request)
         else:
+            return total, COUNT_STRATEGY_ESTIMATE
+
+    def _get_count_cache_key(self, qs, request, count_strategy):
+        try:
+            sql, params = qs.query.get_compiler(using=qs.db).as_sql()
+        except EmptyResultSet:
             return None
+        version_keys = sorted(get_count_cache_version_key(model) for model in get_count_cache_models(qs.model))
+        versions = get_count_cache().get_many(version_keys)
+        return 'is_core:count:{}'.format(
+            hashlib.sha256(
+                json.dumps(
+                    [
+                        qs.model._meta.label, sql, [force_text(param) for param in params], count_strategy,
+                        self._get_max_total(qs, request),
+                        get_count_cache_permissions_fingerprint(getattr(request, 'user', None)),
+                        [versions.get(version_key) for version_key in version_keys]
+                    ],
+                    cls=DjangoJSONEncoder
+                ).encode('utf-8')
+            ).hexdigest()
+        )
+
+    def _get_total_with_strategy(self, qs, request):
+        if not request._rest_context.get('request_count', False):
+            return None, None
+
+        count_cache_timeout = self._get_count_cache_timeout()
+        if not count_cache_timeout:
+            return self._compute_total_with_strategy(qs, request)
+
+        cache_key = self._get_count_cache_key(qs, request, self._get_count_strategy(qs, request))
+        if cache_key is None:
+            # Empty queryset has no SQL query, the result is known without database or cache access
+            return 0, COUNT_STRATEGY_EXACT
+
+        cache = get_count_cache()
+        # The first page is always counted, next pages use the cached value
+        cached_total = cache.get(cache_key) if self._get_offset(qs, request) else None
+        if cached_total is not None:
+            return tuple(cached_total)
+
+        total_with_strategy = self._compute_total_with_strategy(qs, request)
+        cache.set(cache_key, total_with_strategy, count_cache_timeout)
+        return total_with_strategy
+
+    def _compute_total_with_strategy(self, qs, request):
+        count_strategy = self._get_count_strategy(qs, request)
+        if count_strategy == COUNT_STRATEGY_CAPPED:
+            return self._get_capped_total(qs, request)
+        elif count_strategy == COUNT_STRATEGY_ESTIMATE:
+            return self._get_estimated_total(qs, request)
+        else:
+            return self._get_exact_total(qs, request)
+
+    def _get_total(self, qs, request):
+        return self._get_total_with_strategy(qs, request)[0]
+
+    def _get_headers(self, total, next_offset, prev_offset, total_strategy=None):
+        headers = super()._get_headers(total, next_offset, prev_offset)
+        if total_strategy is not None:
+            headers['X-Total-Strategy'] = total_strategy
+        return headers
+
+    def get_response(self, qs, request):
+        base = self._get_base(qs, request)
+        total, total_strategy = self._get_total_with_strategy(qs, request)
+        offset = self._get_offset(qs, request)
+        model = self._get_model(qs)
+        # To check next offset, one more object is get from queryset
+        iterable = self._get_list_from_queryset(qs, offset, offset + base + 1)
+        next_offset = self._get_next_offset(iterable, offset, base)
+        prev_offset = self._get_prev_offset(iterable, offset, base)
+        return HeadersResponse(
+            self.iterable_helper_class(iterable[:base], model),
+            self._get_headers(total, next_offset, prev_offset, total_strategy)
+        )
+
+
+class CursorBasedModelIterableIteratorHelper(OriginCursorBasedModelIterableIteratorHelper):
+
+    def __init__(self, iterable, model, next, prev=None):
+        super().__init__(iterable, model, next)
+        self.prev = prev
 
 
 class DjangoCursorBasedPaginator(OriginDjangoCursorBasedPaginator):
+    """
+    Keyset (seek) paginator. Queryset ordering (default ordering of the core or ordering selected with the X-Order
+    header) is extended with the primary key to be unique. The cursor contains ordering values of the boundary row
+    of the page, therefore every page is filtered with an index friendly condition instead of the OFFSET scan.
+    Null values are ordered as the lowest values (ascending nulls first, descending nulls last).
+    """
 
     type = 'cursor-based-paginator'
+
+    def _get_ordering(self, request, qs):
+        ordering = []
+        for order_lookup in list(qs.query.order_by) or list(qs.model._meta.ordering):
+            if isinstance(order_lookup, OrderBy) and isinstance(order_lookup.expression, F):
+                ordering.append((order_lookup.expression.name, order_lookup.descending))
+            elif isinstance(order_lookup, str) and order_lookup != '?':
+                ordering.append(
+                    (order_lookup[1:], True) if order_lookup.startswith('-') else (order_lookup, False)
+                )
+            else:
+                raise RestException(ugettext('Ordering is not supported by the cursor based paginator'))
+
+        pk_field_name = qs.model._meta.pk.name
+        if not any(field_name in {'pk', pk_field_name} for field_name, _ in ordering):
+            ordering.append(('pk', False))
+        return ordering
+
+    def _get_order_terms(self, ordering, reverse):
+        return [
+            F(field_name).desc(nulls_last=True) if descending != reverse else F(field_name).asc(nulls_first=True)
+            for field_name, descending in ordering
+        ]
+
+    def _get_field_seek_filter(self, field_name, descending, value):
+        if descending:
+            return (
+                Q(**{'{}__lt'.format(field_name): value}) | Q(**{'{}__isnull'.format(field_name): True})
+                if value is not None else None
+            )
+        else:
+            return (
+                Q(**{'{}__gt'.format(field_name): value}) if value is not None
+                else Q(**{'{}__isnull'.format(field_name): False})
+            )
+
+    def _get_page_filter_kwargs(self, values, ordering, reverse=False):
+        seek_filters = []
+        equal_filter = Q()
+        for (field_name, descending), value in zip(ordering, values):
+            field_seek_filter = self._get_field_seek_filter(field_name, descending != reverse, value)
+            if field_seek_filter is not None:
+                seek_filters.append(equal_filter & field_seek_filter)
+            equal_filter &= Q(**({'{}__isnull'.format(field_name): True} if value is None else {field_name: value}))
+        return reduce(or_, seek_filters) if seek_filters else Q(pk__in=())
+
+    def _get_row_value(self, qs, obj, field_name):
+        if field_name in qs.query.annotations:
+            return getattr(obj, field_name)
+
+        value = obj
+        for attr_name in field_name.split(LOOKUP_SEP):
+            try:
+                value = getattr(value, attr_name)
+            except ObjectDoesNotExist:
+                value = None
+            if value is None:
+                return None
+        return value.pk if isinstance(value, Model) else value
+
+    def _get_position_from_instance(self, qs, instance, ordering, direction):
+        values = [self._get_row_value(qs, instance, field_name) for field_name, _ in ordering]
+        return urlsafe_base64_encode(
+            json.dumps([direction, ordering, values], cls=DjangoJSONEncoder).encode('utf-8')
+        )
+
+    def _get_position_from_cursor(self, cursor, ordering):
+        try:
+            direction, cursor_ordering, values = json.loads(urlsafe_base64_decode(cursor))
+            if (direction in {CURSOR_NEXT, CURSOR_PREV}
+                    and [tuple(order) for order in cursor_ordering] == ordering
+                    and len(values) == len(ordering)):
+                return direction, values
+        except (ValueError, TypeError):
+            pass
+        raise RestException(ugettext('Cursor is invalid'))
+
+    def _get_paged_qs(self, qs, ordering, cursor, base):
+        direction, values = self._get_position_from_cursor(cursor, ordering) if cursor else (CURSOR_NEXT, None)
+        reverse = direction == CURSOR_PREV
+
+        paged_qs = qs.order_by(*self._get_order_terms(ordering, reverse))
+        if values is not None:
+            try:
+                paged_qs = paged_qs.filter(self._get_page_filter_kwargs(values, ordering, reverse))
+            except (ValidationError, ValueError, TypeError):
+                raise RestException(ugettext('Cursor is invalid'))
+
+        # To check next (or previous) page, one more object is get from queryset
+        results = list(paged_qs[:base + 1])
+        page = results[:base]
+        has_more = len(results) > len(page)
+        if reverse:
+            page.reverse()
+            has_prev, has_next = has_more, True
+        else:
+            has_prev, has_next = values is not None, has_more
+
+        return CursorBasedModelIterableIteratorHelper(
+            page, qs.model,
+            next=self._get_position_from_instance(qs, page[-1], ordering, CURSOR_NEXT) if page and has_next else None,
+            prev=self._get_position_from_instance(qs, page[0], ordering, CURSOR_PREV) if page and has_prev else None,
+        )
+
+    def get_response(self, qs, request):
+        base = self._get_base(request)
+        cursor = self._get_cursor(request)
+        ordering = self._get_ordering(request, qs)
+        cursor_based_model_iterable = self._get_paged_qs(qs, ordering, cursor, base)
+        return HeadersResponse(
+            cursor_based_model_iterable,
+            self.get_headers(cursor_based_model_iterable.next, cursor_based_model_iterable.prev)
+        )
+
+    def get_headers(self, next_cursor, prev_cursor=None):
+        return {
+            k: v for k, v in {
+                'X-Next-Cursor': next_cursor,
+                'X-Prev-Cursor': prev_cursor,
+            }.items() if v is not None
+        }
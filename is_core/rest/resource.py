@@ -1,4 +1,7 @@
-from functools import wraps
+import logging
+
+from functools import reduce, wraps
+from operator import or_
 
 from django.conf import settings as django_settings
 from django.http.response import Http404
@@ -6,6 +9,9 @@ from django.utils.safestring import mark_safe
 from django.utils.translation import ugettext
 from django.utils.encoding import force_text
 from django.urls import NoReverseMatch
+from django.contrib.admin.utils import lookup_needs_distinct
+from django.db.models import Model, Prefetch, Q
+from django.db.models.signals import post_save, pre_save
 
 from pyston.conf import settings as pyston_settings
 from pyston.forms import rest_modelform_factory
@@ -14,7 +20,11 @@ from pyston.exception import (RestException, MimerDataException, NotAllowedExcep
                               ConflictException, DataInvalidException, UnauthorizedException)
 from pyston.resource import BaseResource, DjangoResource
 from pyston.response import RestErrorResponse, RestErrorsResponse
+from pyston.utils import rfs
+from pyston.utils.helpers import ModelIterableIteratorHelper
 
+from chamber.models import SmartModel
+from chamber.models.signals import dispatcher_post_save, dispatcher_pre_save
 from chamber.shortcuts import get_object_or_none
 from chamber.utils import transaction
 
@@ -23,16 +33,21 @@ from is_core.auth.permissions import (
     CoreCreateAllowed, AllowAny, DEFAULT_PERMISSION
 )
 from is_core.auth.views import FieldPermissionViewMixin
+from is_core.config import settings
 from is_core.exceptions.response import (HttpBadRequestResponseException, HttpUnsupportedMediaTypeResponseException,
                                          HttpMethodNotAllowedResponseException, HttpDuplicateResponseException,
                                          HttpForbiddenResponseException)
-from is_core.forms.models import smartmodelform_factory
+from is_core.forms.models import smartmodelform_factory, get_cached_form_class, get_form_class_cache_key
 from is_core.patterns import RestPattern, patterns
-from is_core.utils import get_field_label_from_path, METHOD_OBJ_STR_NAME, LOOKUP_SEP
+from is_core.utils import get_field_label_from_path, get_field_from_model_or_none, METHOD_OBJ_STR_NAME, LOOKUP_SEP
+from is_core.utils.field_api import get_preload_lookups, get_only_fields
 
 from .filters import CoreDjangoFilterManager
 
 
+logger = logging.getLogger('is-core')
+
+
 class PermissionsResourceMixin:
 
     permission = IsAuthenticated()
@@ -82,6 +97,13 @@ class PermissionsResourceMixin:
             super().has_head_permission(**kwargs)
         )
 
+    def is_permission_obj_independent(self, name):
+        """
+        Returns True if the permission with the given name is not related with the object and can be evaluated only
+        once for more objects.
+        """
+        return self.permission._is_obj_independent(name, self.request, self)
+
     def _check_permission(self, name, *args, **kwargs):
         try:
             super()._check_permission(name, *args, **kwargs)
@@ -238,6 +260,12 @@ class EntryPointResource(CoreResource):
 
 class SmartFormDjangoResource(DjangoResource):
 
+    cache_form_class = True
+
+    def _is_form_class_cacheable(self):
+        # Overridden formfield_for_dbfield can generate the form fields by the request, form class cannot be shared
+        return self.cache_form_class and type(self).formfield_for_dbfield is DjangoResource.formfield_for_dbfield
+
     def _generate_form_class(self, inst, exclude=None):
         exclude = [] if exclude is None else exclude
         exclude = list(self._get_exclude(inst)) + exclude
@@ -245,18 +273,27 @@ class SmartFormDjangoResource(DjangoResource):
         fields = self._get_form_fields(inst)
         if hasattr(form_class, '_meta') and form_class._meta.exclude:
             exclude.extend(form_class._meta.exclude)
-        return rest_modelform_factory(
-            self.model,
-            form=form_class,
-            form_factory=smartmodelform_factory,
-            resource_typemapper=self.resource_typemapper,
-            auto_related_direct_fields=pyston_settings.AUTO_RELATED_DIRECT_FIELDS,
-            auto_related_reverse_fields=pyston_settings.AUTO_RELATED_REVERSE_FIELDS,
-            request=self.request,
-            exclude=exclude,
-            fields=fields,
-            formfield_callback=self.formfield_for_dbfield,
-            labels=self.get_field_labels()
+        labels = self.get_field_labels()
+        cache_key = get_form_class_cache_key(
+            self.model, form_class, self.resource_typemapper, pyston_settings.AUTO_RELATED_DIRECT_FIELDS,
+            pyston_settings.AUTO_RELATED_REVERSE_FIELDS, exclude, fields, labels, self.formfield_for_dbfield
+        ) if self._is_form_class_cacheable() else None
+        return get_cached_form_class(
+            cache_key,
+            lambda: rest_modelform_factory(
+                self.model,
+                form=form_class,
+                form_factory=smartmodelform_factory,
+                resource_typemapper=self.resource_typemapper,
+                auto_related_direct_fields=pyston_settings.AUTO_RELATED_DIRECT_FIELDS,
+                auto_related_reverse_fields=pyston_settings.AUTO_RELATED_REVERSE_FIELDS,
+                request=self.request,
+                exclude=exclude,
+                fields=fields,
+                formfield_callback=self.formfield_for_dbfield,
+                labels=labels
+            ),
+            self.request
         )
 
 
@@ -275,50 +312,84 @@ class ModelCoreResourceMixin(FieldPermissionViewMixin, CoreResourceMixin, Permis
     def _get_queryset(self):
         return self.core.get_queryset(self.request)
 
+    def _get_converted_serialized_data(self, result):
+        if isinstance(result, ModelIterableIteratorHelper) and isinstance(result.iterable, (list, tuple)):
+            requested_fieldset = self._get_requested_fieldset(result)
+            self.core.preload_rest_extra_fields(
+                self.request, result.iterable,
+                (rfs(self.get_default_fields()) if requested_fieldset is None else requested_fieldset).flat()
+            )
+        return super()._get_converted_serialized_data(result)
+
     def get_allowed_fields_rfs(self, obj=None):
         return super().get_allowed_fields_rfs().subtract(self._get_disallowed_fields_from_permissions(obj=obj))
 
     def get_fields(self, obj=None):
         fields = list(self.fields) if self.fields is not None else None
-        return self.core.get_rest_fields(self.request, obj=None) if fields is None else fields
+        return self.core.get_registered_rest_fields('fields', self.request, obj=None) if fields is None else fields
 
     def get_default_fields(self, obj=None):
         default_fields = list(self.default_fields) if self.default_fields is not None else None
-        return self.core.get_rest_default_fields(self.request, obj=None) if default_fields is None else default_fields
+        return (
+            self.core.get_registered_rest_fields('default_fields', self.request, obj=None) if default_fields is None
+            else default_fields
+        )
 
     def get_detailed_fields(self, obj=None):
         detailed_fields = list(self.detailed_fields) if self.detailed_fields is not None else self.get_fields(obj=obj)
-        return self.core.get_rest_detailed_fields(self.request, obj=obj) if detailed_fields is None else detailed_fields
+        return (
+            self.core.get_registered_rest_fields('detailed_fields', self.request, obj=obj) if detailed_fields is None
+            else detailed_fields
+        )
 
     def get_general_fields(self, obj=None):
         general_fields = list(self.general_fields) if self.general_fields is not None else self.get_fields(obj=obj)
-        return self.core.get_rest_general_fields(self.request, obj=obj) if general_fields is None else general_fields
+        return (
+            self.core.get_registered_rest_fields('general_fields', self.request, obj=obj) if general_fields is None
+            else general_fields
+        )
 
     def get_guest_fields(self, obj=None):
         guest_fields = list(self.guest_fields) if self.guest_fields is not None else None
-        return self.core.get_rest_guest_fields(self.request, obj=obj) if guest_fields is None else guest_fields
+        return (
+            self.core.get_registered_rest_fields('guest_fields', self.request, obj=obj) if guest_fields is None
+            else guest_fields
+        )
 
     def get_extra_fields(self, obj=None):
         extra_fields = list(self.extra_fields) if self.extra_fields is not None else None
-        return self.core.get_rest_extra_fields(self.request) if extra_fields is None else extra_fields
+        return (
+            self.core.get_registered_rest_fields('extra_fields', self.request) if extra_fields is None
+            else extra_fields
+        )
 
     def get_extra_filter_fields(self):
         extra_filter_fields = list(self.extra_filter_fields) if self.extra_filter_fields is not None else None
         return (
-            self.core.get_rest_extra_filter_fields(self.request) if extra_filter_fields is None else extra_filter_fields
+            self.core.get_registered_rest_fields('extra_filter_fields', self.request) if extra_filter_fields is None
+            else extra_filter_fields
         )
 
     def get_filter_fields(self):
         filter_fields = list(self.filter_fields) if self.filter_fields is not None else None
-        return self.core.get_rest_filter_fields(self.request) if filter_fields is None else filter_fields
+        return (
+            self.core.get_registered_rest_fields('filter_fields', self.request) if filter_fields is None
+            else filter_fields
+        )
 
     def get_extra_order_fields(self):
         extra_order_fields = list(self.extra_order_fields) if self.extra_order_fields is not None else None
-        return self.core.get_rest_extra_order_fields(self.request) if extra_order_fields is None else extra_order_fields
+        return (
+            self.core.get_registered_rest_fields('extra_order_fields', self.request) if extra_order_fields is None
+            else extra_order_fields
+        )
 
     def get_order_fields(self):
         order_fields = list(self.order_fields) if self.order_fields is not None else None
-        return self.core.get_rest_order_fields(self.request) if order_fields is None else order_fields
+        return (
+            self.core.get_registered_rest_fields('order_fields', self.request) if order_fields is None
+            else order_fields
+        )
 
     def get_field_labels(self):
         return (
@@ -349,8 +420,124 @@ class DjangoCoreResource(ModelCoreResourceMixin, SmartFormDjangoResource):
     abstract = True
     filter_manager = CoreDjangoFilterManager()
 
+    def _get_headers_queryset_context_mapping(self):
+        context_mapping = super()._get_headers_queryset_context_mapping()
+        context_mapping['search'] = ('HTTP_X_SEARCH', '_search')
+        return context_mapping
+
+    def _filter_queryset(self, qs):
+        return self._search_queryset(super()._filter_queryset(qs))
+
+    def _get_search_fields(self):
+        """
+        Returns the core REST search fields without the fields disallowed by the field permissions, objects cannot be
+        searched by values which are hidden for the user.
+        """
+        disallowed_fields = self._get_disallowed_fields_from_permissions()
+        return [
+            search_field for search_field in self.core.get_rest_search_fields(self.request) or ()
+            if search_field not in disallowed_fields and search_field.split(LOOKUP_SEP)[0] not in disallowed_fields
+        ]
+
+    def _search_queryset(self, qs):
+        """
+        Queryset is searched with the "_search" parameter. Every word of the searched text must be contained in some
+        of the allowed core REST search fields.
+        """
+        search = self.request._rest_context.get('search')
+        search_fields = self._get_search_fields()
+        if not search or not search_fields:
+            return qs
+
+        for term in search.split():
+            qs = qs.filter(reduce(or_, (
+                Q(**{'{}__icontains'.format(search_field): term}) for search_field in search_fields
+            )))
+        if any(lookup_needs_distinct(qs.model._meta, search_field) for search_field in search_fields):
+            qs = qs.distinct()
+        return qs
+
     def _preload_queryset(self, qs):
-        return self.core.preload_queryset(self.request, qs)
+        qs = self.core.preload_queryset(self.request, qs)
+        if self.core.is_rest_auto_preload_enabled(self.request):
+            qs = self._auto_preload_queryset(qs)
+        if self.core.is_rest_auto_defer_enabled(self.request):
+            qs = self._auto_defer_queryset(qs)
+        return qs
+
+    def _get_preload_fieldset(self):
+        requested_fieldset = self._get_requested_fieldset(None)
+        return (
+            rfs(requested_fieldset).intersection(self.get_allowed_fields_rfs()) if requested_fieldset
+            else self.get_general_fields_rfs()
+        )
+
+    def _auto_preload_queryset(self, qs):
+        """
+        Relations of the serialized fields are loaded with select_related (foreign keys and one to one relations)
+        or prefetch_related (many to many, reverse and generic relations) to avoid queries per row.
+        """
+        if qs._fields is not None:
+            return qs
+
+        select_related_lookups, prefetch_related_lookups = get_preload_lookups(
+            qs.model, self._get_preload_fieldset().flat()
+        )
+        if qs.query.select_related is True:
+            select_related_lookups = []
+        prefetched_lookups = {
+            lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup for lookup in qs._prefetch_related_lookups
+        }
+        prefetch_related_lookups = [
+            lookup for lookup in prefetch_related_lookups if lookup not in prefetched_lookups
+        ]
+
+        logger.debug(
+            'Queryset of model %s was automatically preloaded with select_related %s and prefetch_related %s',
+            qs.model._meta.label, select_related_lookups, prefetch_related_lookups
+        )
+        if select_related_lookups:
+            qs = qs.select_related(*select_related_lookups)
+        if prefetch_related_lookups:
+            qs = qs.prefetch_related(*prefetch_related_lookups)
+        return qs
+
+    def _get_preloaded_relation_fields(self, qs):
+        if qs.query.select_related is True:
+            select_related_lookups = [
+                field.name for field in qs.model._meta.concrete_fields if field.is_relation
+            ]
+        else:
+            select_related_lookups = list(qs.query.select_related or ())
+        prefetch_related_lookups = [
+            lookup.prefetch_through if isinstance(lookup, Prefetch) else lookup
+            for lookup in qs._prefetch_related_lookups
+        ]
+        return {lookup.split(LOOKUP_SEP, 1)[0] for lookup in select_related_lookups + prefetch_related_lookups}
+
+    def _auto_defer_queryset(self, qs):
+        """
+        Only model columns required by the serialized fields are loaded, other columns are deferred.
+        """
+        if qs._fields is not None or qs.query.deferred_loading != (frozenset(), True):
+            # Values querysets and querysets with the columns selected by the core are not changed
+            return qs
+
+        only_fields = get_only_fields(qs.model, self._get_preload_fieldset().flat())
+        if only_fields is None:
+            logger.debug('Queryset of model %s requires whole rows', qs.model._meta.label)
+            return qs
+
+        # Foreign keys of the preloaded relations cannot be deferred
+        only_fields = set(only_fields)
+        for field_name in self._get_preloaded_relation_fields(qs):
+            field = get_field_from_model_or_none(qs.model, field_name)
+            if field and field.concrete and not field.many_to_many:
+                only_fields.add(field.name)
+        only_fields = sorted(only_fields)
+
+        logger.debug('Queryset of model %s loads only columns %s', qs.model._meta.label, only_fields)
+        return qs.only(*only_fields)
 
     def _get_form_fields(self, obj=None):
         return self.core.get_rest_form_fields(self.request, obj)
@@ -369,12 +556,14 @@ class DjangoCoreResource(ModelCoreResourceMixin, SmartFormDjangoResource):
         return {'_request': self.request, '_user': self.request.user}
 
     def _pre_save_obj(self, obj, form, change):
+        self._invalidate_field_permissions_cache(obj)
         self.core.pre_save_model(self.request, obj, form, change)
 
     def _save_obj(self, obj, form, change):
         self.core.save_model(self.request, obj, form, change)
 
     def _post_save_obj(self, obj, form, change):
+        self._invalidate_field_permissions_cache(obj)
         self.core.post_save_model(self.request, obj, form, change)
 
     def _pre_delete_obj(self, obj):
@@ -402,10 +591,132 @@ class DjangoCoreResource(ModelCoreResourceMixin, SmartFormDjangoResource):
                 msg=ugettext('Only %s objects can be changed by one request').format(BULK_CHANGE_LIMIT),
                 code=413)
 
-        data = self.get_dict_data()
-        objects, errors = zip(*(self._update_obj(obj, data) for obj in qs))
-        compact_errors = tuple(err for err in errors if err)
-        return RestErrorsResponse(compact_errors) if len(compact_errors) > 0 else objects
+        objects, errors = self._update_bulk_queryset(qs, self.get_dict_data())
+        return RestErrorsResponse(errors) if errors else objects
+
+    def _update_bulk_queryset(self, qs, data):
+        """
+        Updates all objects of the queryset with the data. Returns updated objects and errors of the objects which
+        cannot be updated.
+        """
+        if self.core.is_rest_fast_bulk_update_enabled(self.request):
+            objects = self._fast_update_bulk(qs, data)
+            if objects is not None:
+                return objects, ()
+
+        results = [self._update_obj(obj, data) for obj in qs]
+        return tuple(obj for obj, _ in results), tuple(err for _, err in results if err)
+
+    def _get_fast_update_bulk_fields(self, data):
+        """
+        Returns model fields which values can be updated directly in the database or None if the data must be updated
+        object by object (relations, unique fields or nested data).
+        """
+        unique_field_names = {
+            field_name for unique_together in self.model._meta.unique_together for field_name in unique_together
+        } | {
+            field_name for constraint in self.model._meta.total_unique_constraints for field_name in constraint.fields
+        }
+        fields = []
+        for field_name, value in data.items():
+            field = get_field_from_model_or_none(self.model, field_name)
+            if (field is None or not field.concrete or field.many_to_many or field.primary_key or field.unique
+                    or field.name in unique_field_names or isinstance(value, (dict, list))):
+                return None
+            fields.append(field)
+        return fields or None
+
+    def _has_save_obj_hooks(self):
+        return (
+            type(self)._pre_save_obj is not DjangoCoreResource._pre_save_obj
+            or type(self)._post_save_obj is not DjangoCoreResource._post_save_obj
+            or self.core.has_save_model_hooks()
+        )
+
+    def _has_custom_save_obj(self):
+        return type(self)._save_obj is not DjangoCoreResource._save_obj or self.core.has_custom_save_model()
+
+    def _has_model_save_hooks(self):
+        """
+        Returns True if the model overrides its save methods or a save signal has a receiver for the model.
+        """
+        base_model = SmartModel if issubclass(self.model, SmartModel) else Model
+        return (
+            any(
+                getattr(self.model, method_name, None) is not getattr(base_model, method_name, None)
+                for method_name in ('save', '_pre_save', '_post_save')
+            )
+            or any(
+                signal.has_listeners(self.model)
+                for signal in (pre_save, post_save, dispatcher_pre_save, dispatcher_post_save)
+            )
+        )
+
+    def _get_objs_in_chunks(self, pks, chunk_size):
+        objs = []
+        for i in range(0, len(pks), chunk_size):
+            chunk_objs = self._get_queryset().in_bulk(pks[i:i + chunk_size])
+            objs += [chunk_objs[pk] for pk in pks[i:i + chunk_size] if pk in chunk_objs]
+        return objs
+
+    def _is_fast_update_bulk_allowed_for_obj(self, obj, fields):
+        excluded_field_names = (
+            self._get_readonly_fields_from_permissions(obj) | self._get_disallowed_fields_from_permissions(obj)
+        )
+        return not any(field.name in excluded_field_names for field in fields)
+
+    def _fast_update_bulk(self, qs, data):
+        """
+        Data are validated only once with the form of the first object and all objects are updated with
+        QuerySet.update in chunks. None is returned if the data cannot be updated this way (resource, core or model save
+        hooks, data invalid or fields readonly for some objects); these data are updated object by object to report
+        errors of every object.
+        """
+        fields = self._get_fast_update_bulk_fields(data)
+        if (fields is None or self._has_custom_save_obj() or self._has_save_obj_hooks()
+                or self._has_model_save_hooks()):
+            return None
+
+        pks = list(qs.values_list('pk', flat=True))
+        if not pks:
+            return None
+
+        obj = self._get_queryset().get(pk=pks[0])
+        if not self._is_fast_update_bulk_allowed_for_obj(obj, fields):
+            return None
+
+        form = self._get_form(inst=obj, data=data, initial=self._get_form_initial(obj), partial_update=True)
+        updated_fields = [field for field in fields if field.name in form.fields]
+        if not updated_fields or form.is_invalid():
+            return None
+
+        form.save(commit=False)
+        values = {field.attname: getattr(obj, field.attname) for field in updated_fields}
+        # QuerySet.update doesn't set the auto_now fields, their values are generated the same way as with model save
+        values.update({
+            field.attname: field.pre_save(obj, False)
+            for field in self.model._meta.concrete_fields if getattr(field, 'auto_now', False)
+        })
+        chunk_size = settings.REST_FAST_BULK_UPDATE_CHUNK_SIZE
+
+        if self.is_permission_obj_independent('update_obj') and self._is_field_permissions_obj_independent():
+            objs = None
+            self._check_permission('update_obj', obj=obj)
+        else:
+            objs = self._get_objs_in_chunks(pks, chunk_size)
+            if not all(self._is_fast_update_bulk_allowed_for_obj(obj, fields) for obj in objs):
+                return None
+            for obj in objs:
+                self._check_permission('update_obj', obj=obj)
+
+        for i in range(0, len(pks), chunk_size):
+            self.model._default_manager.filter(pk__in=pks[i:i + chunk_size]).update(**values)
+        if objs is None:
+            return self._get_objs_in_chunks(pks, chunk_size)
+        for obj in objs:
+            for attname, value in values.items():
+                setattr(obj, attname, value)
+        return objs
 
     def _update_obj(self, obj, data):
         try:
@@ -1,3 +1,8 @@
+import logging
+import time
+
+from collections import OrderedDict
+
 from django.conf.urls import url, include
 from django.core.exceptions import ImproperlyConfigured
 
@@ -8,7 +13,10 @@ from is_core.config import settings
 from .patterns import RestPattern
 from .rest.resource import EntryPointResource
 from .loading import get_cores as get_loaded_cores
+from .utils.field_api import clear_field_descriptors_cache
+
 
+logger = logging.getLogger('is-core')
 
 sites = {}
 registered_model_cores = {}
@@ -34,22 +42,46 @@ class ISSite:
     def __init__(self, name='IS'):
         self.name = name
         sites[name] = self
+        self.startup_timings = OrderedDict()
         self._registry = self._init_items()
 
+    def _add_startup_timing(self, core, name, start):
+        self.startup_timings.setdefault(core.menu_group, OrderedDict())[name] = time.perf_counter() - start
+
+    def get_startup_report(self):
+        """
+        Returns list of lines with the time (in milliseconds) spent with the initialization and URL patterns
+        construction of every core. The slowest cores are first.
+        """
+        return [
+            '{}: {}'.format(
+                menu_group,
+                ', '.join('{} {:.2f} ms'.format(name, duration * 1000) for name, duration in timings.items())
+            )
+            for menu_group, timings in sorted(
+                self.startup_timings.items(), key=lambda item: sum(item[1].values()), reverse=True
+            )
+        ]
+
     def _init_items(self):
         items = {}
 
         for core in get_loaded_cores():
+            start = time.perf_counter()
             generic_core = self.register(core(self.name, []))
+            if hasattr(generic_core, 'init_rest_field_registry'):
+                generic_core.init_rest_field_registry()
             if generic_core.menu_group in items:
                 raise ImproperlyConfigured('Duplicate cores with group: "%s"' % generic_core.menu_group)
             items[generic_core.menu_group] = generic_core
+            self._add_startup_timing(generic_core, 'init', start)
         return items
 
     def register(self, generic_core):
         if getattr(generic_core, 'register_model', False):
             registered_model_cores[generic_core.model] = generic_core
         registered_cores.append(generic_core)
+        clear_field_descriptors_cache()
         return generic_core
 
     @property
@@ -58,9 +90,11 @@ class ISSite:
 
     def _set_items_urls(self, items, urlpatterns):
         for item in items:
+            start = time.perf_counter()
             urls = item.get_urls()
             if urls:
                 urlpatterns += [url(r'^', include(urls))]
+            self._add_startup_timing(item, 'urls', start)
 
     def get_urls(self):
         urlpatterns = []
@@ -93,6 +127,10 @@ class ISSite:
         urlpatterns.append(pattern.get_url())
 
         self._set_items_urls(self._registry.values(), urlpatterns)
+        # Core REST resources are registered with URL patterns, field descriptors must be resolved again
+        clear_field_descriptors_cache()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Startup of IS site %s:\n%s', self.name, '\n'.join(self.get_startup_report()))
         return urlpatterns
 
 
@@ -0,0 +1,60 @@
+/*
+ * Remote select loads choices of the select box from the REST resource of the related core.
+ * The searched text is written to the input rendered before the select box.
+ */
+(function (document) {
+    'use strict';
+
+    var SEARCH_DELAY = 300;
+
+    function replaceChoices(select, objs) {
+        var selectedValue = select.value;
+        Array.prototype.slice.call(select.options).forEach(function (option) {
+            if (option.value !== '' && option.value !== '__none__' && option.value !== selectedValue) {
+                select.removeChild(option);
+            }
+        });
+        objs.forEach(function (obj) {
+            if (String(obj.id) !== selectedValue) {
+                var option = document.createElement('option');
+                option.value = obj.id;
+                option.textContent = obj._obj_name;
+                select.appendChild(option);
+            }
+        });
+    }
+
+    function loadChoices(select, search) {
+        var url = select.getAttribute('data-resource');
+        var request = new XMLHttpRequest();
+        request.open(
+            'GET',
+            url + (url.indexOf('?') === -1 ? '?' : '&') + select.getAttribute('data-token-name') + '=' +
+            encodeURIComponent(search)
+        );
+        request.setRequestHeader('Accept', 'application/json');
+        request.setRequestHeader('X-Fields', 'id,_obj_name');
+        request.setRequestHeader('X-Base', select.getAttribute('data-limit'));
+        request.onload = function () {
+            if (request.status === 200) {
+                replaceChoices(select, JSON.parse(request.responseText));
+            }
+        };
+        request.send();
+    }
+
+    document.addEventListener('input', function (event) {
+        var input = event.target;
+        var select = input.nextElementSibling;
+        if (!input.classList || !input.classList.contains('remote-select-search') || !select ||
+                !select.classList.contains('remote-select')) {
+            return;
+        }
+        clearTimeout(input.remoteSelectTimeout);
+        if (input.value.length >= Number(select.getAttribute('data-token-min-length'))) {
+            input.remoteSelectTimeout = setTimeout(function () {
+                loadChoices(select, input.value);
+            }, SEARCH_DELAY);
+        }
+    });
+})(document);
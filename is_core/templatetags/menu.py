@@ -21,7 +21,7 @@ def menu(context, site_name):
     active_menu_groups = context.get('active_menu_groups')
 
     menu_generator = import_string(settings.MENU_GENERATOR)(request, site, active_menu_groups)
-    menu_items = menu_generator.get_menu_items(menu_generator.get_menu_structure())
+    menu_items = menu_generator.get_cached_menu_items(menu_generator.get_menu_structure())
     context.update({'menu_items': menu_items, 'site_name': site_name})
     return context
 
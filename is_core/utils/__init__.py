@@ -10,7 +10,8 @@ from django.db.models import QuerySet
 from django.core.exceptions import FieldDoesNotExist
 from django.utils.translation import ugettext
 from django.utils.html import format_html, format_html_join
-from django.utils.formats import get_format, date_format
+from django.utils import dateformat
+from django.utils.formats import get_format
 from django.utils.timezone import template_localtime
 
 from chamber.utils import call_function_with_unknown_input
@@ -246,60 +247,110 @@ def display_for_value(value, request=None):
         list ==> values separated with ","
         dict ==> string formatted with HTML ul/li tags
     """
-    from is_core.forms.utils import ReadonlyValue
-    from is_core.site import registered_model_cores
-
-    if isinstance(value, ReadonlyValue):
-        value = value.value
-
-    if request and value.__class__ in registered_model_cores:
-        return render_model_object_with_link(request, value)
-    elif isinstance(value, (QuerySet, list, tuple, set, types.GeneratorType)):
-        return format_html(
-            '<ol class="field-list">{}</ol>',
-            format_html_join(
-                '\n',
-                '<li>{}</li>',
-                (
-                    (display_for_value(v, request),) for v in value
+    return ColumnRenderer(request).render_value(value)
+
+
+def display_for_values(values, request=None):
+    """
+    Converts list of humanized values of one column (see display_for_value).
+    """
+    return ColumnRenderer(request).render_values(values)
+
+
+def display_objects_data(objs, field_name, request, view=None):
+    """
+    Returns list of humanized values of model objects field. Field descriptors, formats and object URLs are resolved
+    only once for all objects.
+    """
+    from .field_api import get_field_values_from_path
+
+    return display_for_values(
+        get_field_values_from_path(objs, field_name, request, view, return_readonly_value=True), request=request
+    )
+
+
+class ColumnRenderer:
+    """
+    Renders humanized values of one column. Localized date formats and URLs of the related objects are resolved only
+    once for the whole column.
+    """
+
+    def __init__(self, request=None):
+        self.request = request
+        self._formats = {}
+        self._obj_urls = {}
+
+    def _get_format(self, format_name, default_format_name):
+        if format_name not in self._formats:
+            self._formats[format_name] = get_format(
+                default_format_name if get_format(format_name) == format_name else format_name
+            )
+        return self._formats[format_name]
+
+    def _get_obj_url(self, obj):
+        obj_key = (obj.__class__, obj.pk if obj.pk is not None else id(obj))
+        if obj_key not in self._obj_urls:
+            self._obj_urls[obj_key] = get_obj_url(self.request, obj)
+        return self._obj_urls[obj_key]
+
+    def _render_model_object(self, obj):
+        obj_url = self._get_obj_url(obj)
+        return format_html('<a href="{}">{}</a>', obj_url, str(obj)) if obj_url else str(obj)
+
+    def render_values(self, values):
+        return [self.render_value(value) for value in values]
+
+    def render_value(self, value):
+        from is_core.forms.utils import ReadonlyValue
+        from is_core.site import registered_model_cores
+
+        if isinstance(value, ReadonlyValue):
+            value = value.value
+
+        if self.request and value.__class__ in registered_model_cores:
+            return self._render_model_object(value)
+        elif isinstance(value, (QuerySet, list, tuple, set, types.GeneratorType)):
+            return format_html(
+                '<ol class="field-list">{}</ol>',
+                format_html_join(
+                    '\n',
+                    '<li>{}</li>',
+                    (
+                        (self.render_value(v),) for v in value
+                    )
                 )
             )
-        )
-    elif isinstance(value, dict):
-        return format_html(
-            '<ul class="field-dict">{}</ul>',
-            format_html_join(
-                '\n',
-                '{}{}',
-                (
+        elif isinstance(value, dict):
+            return format_html(
+                '<ul class="field-dict">{}</ul>',
+                format_html_join(
+                    '\n',
+                    '{}{}',
                     (
-                        format_html('<li>{}</li>', k),
                         (
-                            display_for_value(v, request) if isinstance(v, dict)
-                            else format_html(
-                                '<ul class="field-dict"><li>{}</li></ul>',
-                                display_for_value(v, request)
+                            format_html('<li>{}</li>', k),
+                            (
+                                self.render_value(v) if isinstance(v, dict)
+                                else format_html(
+                                    '<ul class="field-dict"><li>{}</li></ul>',
+                                    self.render_value(v)
+                                )
                             )
                         )
+                        for k, v in value.items()
                     )
-                    for k, v in value.items()
                 )
             )
-        )
-    elif isinstance(value, bool):
-        return ugettext('Yes') if value else ugettext('No')
-    elif isinstance(value, datetime.datetime):
-        return date_format(template_localtime(value), (
-             'DATETIME_FORMAT' if get_format('IS_CORE_VIEW_DATETIME_FORMAT') == 'IS_CORE_VIEW_DATETIME_FORMAT'
-             else 'IS_CORE_VIEW_DATETIME_FORMAT'
-         ))
-    elif isinstance(value, datetime.date):
-        return date_format(value, (
-            'DATE_FORMAT' if get_format('IS_CORE_VIEW_DATE_FORMAT') == 'IS_CORE_VIEW_DATE_FORMAT'
-            else 'IS_CORE_VIEW_DATE_FORMAT'
-        ))
-    else:
-        return admin_display_for_value(value, EMPTY_VALUE)
+        elif isinstance(value, bool):
+            return ugettext('Yes') if value else ugettext('No')
+        elif isinstance(value, datetime.datetime):
+            return dateformat.format(
+                template_localtime(value), self._get_format('IS_CORE_VIEW_DATETIME_FORMAT', 'DATETIME_FORMAT')
+            )
+        elif isinstance(value, datetime.date):
+            return dateformat.format(value, self._get_format('IS_CORE_VIEW_DATE_FORMAT', 'DATE_FORMAT'))
+        else:
+            return admin_display_for_value(value, EMPTY_VALUE)
 
 
 def get_url_from_model_core(request, obj):
@@ -32,3 +32,15 @@ def relation(to):
             func.related_model = to
         return func
     return decorator
+
+
+def depends_on(*field_paths):
+    """
+    Declares model field paths which are required to compute value of the model, resource or core method or property.
+    The framework preloads relations of the field paths and can load only required columns of the model. Use '__str__'
+    field path if the value depends on the model string representation.
+    """
+    def decorator(func):
+        (func.fget if isinstance(func, property) else func).depends_on = field_paths
+        return func
+    return decorator
@@ -1,3 +1,4 @@
+import copy
 import types
 
 from django.db.models import Model, QuerySet, Field
@@ -33,16 +34,40 @@ def pretty_name(value):
 
 registered_model_descriptors = {}
 
+# Descriptor class resolved for the concrete model class
+model_descriptors_cache = {}
+
+# Resolved field descriptors (unbound from the view instance) for the (model, field path, view class) key
+field_descriptors_cache = {}
+
+
+def clear_field_descriptors_cache():
+    """
+    Invalidates all cached field descriptors. The cache must be cleared every time when the descriptor resolution
+    can be changed (new model descriptor, resource or core is registered).
+    """
+    model_descriptors_cache.clear()
+    field_descriptors_cache.clear()
+
 
 def register_model_descriptor(model_class, descriptor_class):
     registered_model_descriptors[model_class] = descriptor_class
+    clear_field_descriptors_cache()
 
 
 def get_model_descriptor(model_class):
+    try:
+        return model_descriptors_cache[model_class]
+    except KeyError:
+        pass
+
+    model_descriptor = None
     for base_model_class, descriptor_class in registered_model_descriptors.items():
         if issubclass(model_class, base_model_class):
-            return descriptor_class
-    return None
+            model_descriptor = descriptor_class
+            break
+    model_descriptors_cache[model_class] = model_descriptor
+    return model_descriptor
 
 
 class FieldDescriptor:
@@ -55,11 +80,19 @@ class FieldDescriptor:
     def init_descriptor_or_none(cls, model, field_name, view):
         raise NotImplementedError
 
+    is_view_bound = False
+
     def __init__(self, model, field_name, model_field_or_method):
         self.model = model
         self.field_name = field_name
         self.model_field_or_method = model_field_or_method
 
+    def bind(self, view):
+        """
+        Returns descriptor bound to the view instance. Only view bound descriptors are copied.
+        """
+        return self
+
     def get_related_model(self):
         related_model = getattr(self.model_field_or_method, 'related_model', None)
         if related_model:
@@ -270,6 +303,8 @@ class ViewMethodDescriptor(BaseModelMethodDescriptor):
     Field descriptor which gets field data from core view method.
     """
 
+    is_view_bound = True
+
     @classmethod
     def init_descriptor_or_none(cls, model, field_name, view):
         if not view:
@@ -281,6 +316,11 @@ class ViewMethodDescriptor(BaseModelMethodDescriptor):
         super().__init__(model, field_name, method)
         self.view = view
 
+    def bind(self, view):
+        bound_descriptor = copy.copy(self)
+        bound_descriptor.view = view
+        return bound_descriptor
+
     def _get_method_kwargs(self, instance, request=None):
         return {
             'self': self.view,
@@ -303,6 +343,26 @@ def _get_field_descriptor(model, field_name, view=None):
     raise FieldDoesNotExist('Model ("{}") field with name "{}" was not found'.format(model, field_name))
 
 
+def _get_field_descriptors_from_path(model, field_path, view=None):
+    try:
+        if LOOKUP_SEP in field_path:
+            current_field_name, next_field_path = field_path.split(LOOKUP_SEP, 1)
+            field_descriptor = _get_field_descriptor(
+                model, current_field_name, view
+            )
+            return [field_descriptor] + get_field_descriptors_from_path(
+                field_descriptor.get_related_model(), next_field_path
+            )
+        else:
+            return [_get_field_descriptor(model, field_path, view)]
+    except (GetFieldDescriptorException, InvalidFunctionArguments) as ex:
+        raise GetFieldDescriptorException('Field path "{}" cannot be get from model "{}". Reason: {}'.format(
+            field_path,
+            model,
+            ex
+        ))
+
+
 def get_field_descriptors_from_path(model, field_path, view=None):
     """
     Helper returns list of field descriptors. Input field_path is consist of field names separated with "__".
@@ -321,24 +381,26 @@ def get_field_descriptors_from_path(model, field_path, view=None):
     :param field_path: field names separated with __.
     :param view: view instance.
     :return: list of FieldDescriptor or GetFieldDescriptorException is raised
+
+    Resolved descriptors are cached per model, field path and view class. View bound descriptors are stored unbound
+    and they are bound to the view instance with every call.
     """
+    cache_key = (model, field_path, None if view is None else type(view))
     try:
-        if LOOKUP_SEP in field_path:
-            current_field_name, next_field_path = field_path.split(LOOKUP_SEP, 1)
-            field_descriptor = _get_field_descriptor(
-                model, current_field_name, view
+        field_descriptors, is_view_bound = field_descriptors_cache[cache_key]
+    except KeyError:
+        field_descriptors = tuple(
+            field_descriptor.bind(None) for field_descriptor in _get_field_descriptors_from_path(
+                model, field_path, view
             )
-            return [field_descriptor] + get_field_descriptors_from_path(
-                field_descriptor.get_related_model(), next_field_path
-            )
-        else:
-            return [_get_field_descriptor(model, field_path, view)]
-    except (GetFieldDescriptorException, InvalidFunctionArguments) as ex:
-        raise GetFieldDescriptorException('Field path "{}" cannot be get from model "{}". Reason: {}'.format(
-            field_path,
-            model,
-            ex
-        ))
+        )
+        is_view_bound = any(field_descriptor.is_view_bound for field_descriptor in field_descriptors)
+        field_descriptors_cache[cache_key] = (field_descriptors, is_view_bound)
+
+    if is_view_bound:
+        return [field_descriptor.bind(view) for field_descriptor in field_descriptors]
+    else:
+        return list(field_descriptors)
 
 
 def get_field_value_from_path(instance, field_path, request=None, view=None, return_readonly_value=False):
@@ -354,6 +416,31 @@ def get_field_value_from_path(instance, field_path, request=None, view=None, ret
     field_descriptors = get_field_descriptors_from_path(
         instance.__class__, field_path, view
     )
+    return _get_field_value_from_descriptors(
+        instance, field_path, field_descriptors, request, return_readonly_value=return_readonly_value
+    )
+
+
+def get_field_values_from_path(instances, field_path, request=None, view=None, return_readonly_value=False):
+    """
+    Return list of values from model instances defined by field_path. Field descriptors are resolved only once per
+    model class.
+    """
+    field_descriptors_by_model = {}
+    values = []
+    for instance in instances:
+        model = instance.__class__
+        if model not in field_descriptors_by_model:
+            field_descriptors_by_model[model] = get_field_descriptors_from_path(model, field_path, view)
+        values.append(_get_field_value_from_descriptors(
+            instance, field_path, field_descriptors_by_model[model], request,
+            return_readonly_value=return_readonly_value
+        ))
+    return values
+
+
+def _get_field_value_from_descriptors(instance, field_path, field_descriptors, request=None,
+                                      return_readonly_value=False):
     field_descriptor = field_descriptors[0]
     try:
         if len(field_descriptors) > 1:
@@ -382,3 +469,175 @@ def get_field_value_from_path(instance, field_path, request=None, view=None, ret
             instance.__class__,
             ex
         ))
+
+
+def _get_field_descriptor_or_none(model, field_name, view=None):
+    try:
+        return get_field_descriptors_from_path(model, field_name, view)[0]
+    except GetFieldDescriptorException:
+        return None
+
+
+def _get_relation_field_or_none(field_descriptor, field_name):
+    field = field_descriptor.model_field_or_method
+    if not isinstance(field_descriptor, DjangoFieldDescriptor) or not field.is_relation:
+        return None
+    # Field path must contain relation accessor, not the foreign key attname or the reverse relation query name
+    accessor_name = field.get_accessor_name() if field.auto_created and not field.concrete else field.name
+    return field if accessor_name == field_name else None
+
+
+def _get_str_dependencies(model):
+    if model.__str__ is Model.__str__:
+        # Default model string contains only primary key
+        return ()
+    else:
+        return getattr(model.__str__, 'depends_on', None)
+
+
+def _get_method_dependencies(field_descriptor):
+    """
+    Returns field paths declared with the depends_on decorator of the method or property or None if the dependencies
+    are not known.
+    """
+    method = field_descriptor.model_field_or_method
+    return getattr(getattr(method, 'fget', method), 'depends_on', None)
+
+
+def _expand_dependencies(model, field_paths):
+    expanded_field_paths = []
+    for field_path in field_paths:
+        if field_path == '__str__':
+            str_field_paths = _get_str_dependencies(model)
+            if str_field_paths is None:
+                return None
+            expanded_field_paths += [
+                str_field_path for str_field_path in str_field_paths if str_field_path != '__str__'
+            ]
+        else:
+            expanded_field_paths.append(field_path)
+    return expanded_field_paths
+
+
+def _add_field_path_preload_lookups(model, field_path, select_related_lookups, prefetch_related_lookups, view=None,
+                                    path=(), is_prefetch=False, visited=frozenset()):
+    current_model = model
+    path = list(path)
+    select_related_lookup = None
+    for field_name in field_path.split(LOOKUP_SEP):
+        field_descriptor = _get_field_descriptor_or_none(current_model, field_name, None if path else view)
+        if field_descriptor is None:
+            break
+
+        field = _get_relation_field_or_none(field_descriptor, field_name)
+        if field is None:
+            # Relations of the method or property dependencies are preloaded too
+            dependencies = _expand_dependencies(current_model, _get_method_dependencies(field_descriptor) or ())
+            for dependency in dependencies or ():
+                if (current_model, dependency) not in visited:
+                    _add_field_path_preload_lookups(
+                        current_model, dependency, select_related_lookups, prefetch_related_lookups, path=path,
+                        is_prefetch=is_prefetch, visited=visited | {(current_model, dependency)}
+                    )
+            break
+
+        path.append(field_name)
+        if not is_prefetch and field.related_model is not None and (field.many_to_one or field.one_to_one):
+            select_related_lookup = LOOKUP_SEP.join(path)
+        else:
+            is_prefetch = True
+
+        if field.related_model is None:
+            # Generic foreign key can be only prefetched and its model is not known
+            break
+        current_model = field.related_model
+
+    if select_related_lookup:
+        select_related_lookups.add(select_related_lookup)
+    if is_prefetch and path:
+        prefetch_related_lookups.add(LOOKUP_SEP.join(path))
+
+
+def get_field_path_preload_lookups(model, field_path, view=None):
+    """
+    Returns sets of select_related and prefetch_related lookups which are required to get value of the field path
+    without additional queries. Foreign keys and one to one relations are selected with join until the first
+    many to many, reverse foreign key or generic relation. The rest of the path is prefetched. Relations of methods
+    and properties are taken from the depends_on decorator.
+    """
+    select_related_lookups, prefetch_related_lookups = set(), set()
+    _add_field_path_preload_lookups(model, field_path, select_related_lookups, prefetch_related_lookups, view=view)
+    return select_related_lookups, prefetch_related_lookups
+
+
+def get_preload_lookups(model, field_paths, view=None):
+    """
+    Returns sorted lists of select_related and prefetch_related lookups for the field paths.
+    """
+    select_related_lookups, prefetch_related_lookups = set(), set()
+    for field_path in field_paths:
+        _add_field_path_preload_lookups(model, field_path, select_related_lookups, prefetch_related_lookups, view=view)
+    return sorted(select_related_lookups), sorted(prefetch_related_lookups)
+
+
+def _get_dependencies_columns(model, field_paths, visited=frozenset()):
+    field_paths = None if field_paths is None else _expand_dependencies(model, field_paths)
+    if field_paths is None:
+        return None
+
+    columns = set()
+    for field_path in field_paths:
+        if (model, field_path) in visited:
+            continue
+        field_path_columns = _get_field_path_columns(model, field_path, visited=visited | {(model, field_path)})
+        if field_path_columns is None:
+            return None
+        columns |= field_path_columns
+    return columns
+
+
+def _get_field_path_columns(model, field_path, view=None, visited=frozenset()):
+    field_name = field_path.split(LOOKUP_SEP, 1)[0]
+    if field_name == 'pk':
+        return set()
+
+    field_descriptor = _get_field_descriptor_or_none(model, field_name, view)
+    if field_descriptor is None:
+        return None
+
+    field = field_descriptor.model_field_or_method
+    if isinstance(field_descriptor, DjangoFieldDescriptor):
+        if hasattr(field, 'ct_field') and hasattr(field, 'fk_field'):
+            # Generic foreign key
+            return {field.ct_field, field.fk_field}
+        elif field.concrete and not field.many_to_many:
+            return {field.name}
+        elif field.is_relation:
+            # Reverse and many to many relations are loaded with the primary key
+            return set()
+        else:
+            return None
+    else:
+        return _get_dependencies_columns(model, _get_method_dependencies(field_descriptor), visited)
+
+
+def get_field_path_columns(model, field_path, view=None):
+    """
+    Returns names of the model concrete fields which are required to get value of the field path or None if the whole
+    model row is required. Methods and properties must declare their dependencies with the depends_on decorator.
+    """
+    return _get_field_path_columns(model, field_path, view)
+
+
+def get_only_fields(model, field_paths, view=None):
+    """
+    Returns sorted list of the model concrete field names which are required to get values of the field paths or None
+    if the whole model row is required.
+    """
+    columns = set()
+    for field_path in field_paths:
+        field_path_columns = get_field_path_columns(model, field_path, view)
+        if field_path_columns is None:
+            return None
+        columns |= field_path_columns
+    return sorted(columns)